@@ -0,0 +1,165 @@
+"""
+Non-blocking logging (settings.LOGGING_CONFIG = 'backend.log_queue.configure_logging').
+LOGGING is applied with dictConfig as usual, then the handlers of the loggers listed under its
+'queue' key are moved behind a QueueHandler : request and judge threads only enqueue the record,
+and one QueueListener thread per logger formats it and writes the files. Forked children restart
+their own listeners; multiprocessing children flush them from their exit finalizers.
+"""
+import os
+import time
+import queue
+import atexit
+import random
+import threading
+import logging
+import logging.config
+import logging.handlers
+import multiprocessing.util
+
+DEFAULT_QUEUE_SIZE = 10000
+DROP_REPORT_INTERVAL = 60  # seconds between two "records dropped" warnings of one listener
+
+# [QueueHandler, QueueListener] pairs of this process
+_queues = []
+
+# Timed-out wait of DropReportingQueueListener.dequeue (None is the listener's stop sentinel)
+_NO_RECORD = object()
+
+
+class SamplingFilter(logging.Filter):
+    """ Keeps a `rate` (0..1) share of the records of the given levels, every record of the other levels """
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = {logging.getLevelName(level.upper()): rate for level, rate in (rates or {}).items()}
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        return rate is None or random.random() < rate
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    The listener runs in the same process, so the record is handed over as is : the %-formatting of
+    the message and the traceback happen in the listener thread, not in the logging thread.
+    A full queue drops the record instead of blocking the caller (counted, see DropReportingQueueListener).
+    """
+    def __init__(self, record_queue):
+        super().__init__(record_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def take_dropped(self):
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class DropReportingQueueListener(logging.handlers.QueueListener):
+    """
+    Writes a warning to its own handlers when records were dropped : every DROP_REPORT_INTERVAL seconds
+    (the listener wakes up for it even when no record arrives) and once more on stop().
+    """
+    def __init__(self, record_queue, queue_handler, logger_name, *handlers):
+        super().__init__(record_queue, *handlers, respect_handler_level=True)
+        self.queue_handler = queue_handler
+        self.logger_name = logger_name
+        self._next_report = time.monotonic() + DROP_REPORT_INTERVAL
+
+    def dequeue(self, block):
+        # Waits at most until the next report is due instead of blocking on an idle queue
+        while True:
+            try:
+                record = self.queue.get(block, max(0.0, self._next_report - time.monotonic()) if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                record = _NO_RECORD
+            if time.monotonic() >= self._next_report:
+                self._next_report = time.monotonic() + DROP_REPORT_INTERVAL
+                self._report_dropped()
+            if record is not _NO_RECORD:
+                return record
+
+    def stop(self):
+        super().stop()
+        self._report_dropped()
+
+    def _report_dropped(self):
+        dropped = self.queue_handler.take_dropped()
+        if dropped:
+            super().handle(logging.makeLogRecord({
+                'name': self.logger_name,
+                'levelno': logging.WARNING,
+                'levelname': logging.getLevelName(logging.WARNING),
+                'msg': "%s log record(s) dropped: logging queue full (maxsize %s)",
+                'args': (dropped, self.queue.maxsize),
+            }))
+
+
+def _start_listener(logger, options):
+    handlers = list(logger.handlers)
+    if not handlers:
+        return
+    record_queue = queue.Queue(options.get('maxsize', DEFAULT_QUEUE_SIZE))
+    queue_handler = LazyQueueHandler(record_queue)
+    if options.get('sampling'):
+        queue_handler.addFilter(SamplingFilter(options['sampling']))
+    listener = DropReportingQueueListener(record_queue, queue_handler, logger.name, *handlers)
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+    listener.start()
+    _queues.append([queue_handler, listener])
+
+
+def _restart_listeners():
+    # Threads do not survive fork (gunicorn --preload, celery prefork) : the child starts its own,
+    # on fresh queues since the parent's may have been locked at the time of the fork
+    for pair in _queues:
+        queue_handler, listener = pair
+        queue_handler.queue = queue.Queue(queue_handler.queue.maxsize)
+        queue_handler._dropped_lock = threading.Lock()
+        pair[1] = DropReportingQueueListener(queue_handler.queue, queue_handler, listener.logger_name, *listener.handlers)
+        pair[1].start()
+
+
+def _stop_listeners():
+    # Flush what is still queued before the process exits
+    for _, listener in _queues:
+        listener.stop()
+    _queues.clear()
+
+
+def _stop_listeners_at_process_exit(stop_listeners):
+    # multiprocessing children (the judge Pool workers) leave through os._exit, past atexit :
+    # their exit finalizers flush the restarted listeners instead
+    multiprocessing.util.Finalize(None, stop_listeners, exitpriority=0)
+
+
+def configure_logging(logging_settings):
+    logging_settings = dict(logging_settings)
+    options = logging_settings.pop('queue', None) or {}
+    logging.config.dictConfig(logging_settings)
+    if not options.get('enabled', True):
+        return
+
+    _stop_listeners()
+    for name in options.get('loggers', ()):
+        _start_listener(logging.getLogger(None if name == 'root' else name), options)
+
+
+atexit.register(_stop_listeners)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listeners)
+multiprocessing.util.register_after_fork(_stop_listeners, _stop_listeners_at_process_exit)
@@ -23,6 +23,25 @@ BASE_URL = os.environ.get("BASE_URL")
 TESTCASE_BASE_DIR = os.environ.get("TESTCASE_BASE_DIR")
 RUN_BASE_DIR = os.environ.get("RUN_BASE_DIR")
 
+# code judge worker pool (shared by every submission in a web / celery worker process)
+JUDGE_POOL_SIZE = int(os.environ.get("JUDGE_POOL_SIZE", 0)) or None    # None : psutil.cpu_count()
+JUDGE_POOL_MAX_TASKS_PER_CHILD = int(os.environ.get("JUDGE_POOL_MAX_TASKS_PER_CHILD", 500))
+JUDGE_POOL_HEALTH_CHECK_TIMEOUT = 60    # seconds without any finished testcase (longer than a testcase's real-time limit)
+JUDGE_POOL_HEALTH_CHECK_INTERVAL = 60   # seconds between two background health checks
+# stop judging a submission after its first non-accepted testcase (remaining testcases are SKIPPED)
+JUDGE_STOP_ON_FAILURE = os.environ.get("JUDGE_STOP_ON_FAILURE", "False") == "True"
+# compiled artifact cache keyed by compile command + source hashes (disabled when the directory is not set)
+COMPILE_CACHE_DIR = os.environ.get("COMPILE_CACHE_DIR")
+COMPILE_CACHE_MAX_SIZE = int(os.environ.get("COMPILE_CACHE_MAX_SIZE", 512 * 1024 * 1024))  # bytes
+# in-memory testcase manifests (parsed info.json) kept per process
+TESTCASE_MANIFEST_CACHE_SIZE = 256                  # problems
+JUDGE_OUTPUT_PREVIEW_SIZE = 64 * 1024               # bytes of stdout / answer kept per testcase result
+# recycled submission workspaces on a RAM filesystem, e.g. /dev/shm/judge (disabled when not set)
+JUDGE_RAM_WORKSPACE_DIR = os.environ.get("JUDGE_RAM_WORKSPACE_DIR")
+# bytes, disk fallback above : checked when a workspace is handed out only, keep headroom below the tmpfs size
+JUDGE_RAM_WORKSPACE_QUOTA = int(os.environ.get("JUDGE_RAM_WORKSPACE_QUOTA", 256 * 1024 * 1024))
+JUDGE_RAM_WORKSPACE_POOL_SIZE = int(os.environ.get("JUDGE_RAM_WORKSPACE_POOL_SIZE", 8))         # dirs per process
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
@@ -91,6 +110,16 @@ MIDDLEWARE = [
     'rest.middleware.DomainCheckMiddleware',
 ]
 
+# rest.middleware.DomainCheckMiddleware
+DOMAIN_CHECK_ALLOWED_DOMAINS = [
+    'cote.nossi.dev',
+    'api-mywuf.run.goorm.io',
+    'api-mywuf.run.goorm.site',
+]
+DOMAIN_CHECK_BYPASS_PATHS = [       # path prefixes served without the domain / user agent check
+    '/static/',
+]
+
 ROOT_URLCONF = 'backend.urls'
 
 # rest 앱에서 정의한 User 모델을 사용함
@@ -138,11 +167,19 @@ KAKAO_ADMIN_KEY = os.environ.get("SOCIAL_AUTH_KAKAO_ADMIN_KEY")
 SOCIAL_LOGIN_REDIRECT_URI = "https://cote.nossi.dev/account"
 
 # KAKAO URI
+KAKAO_AUTH_BASE_URL = os.environ.get("KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com")
+KAKAO_API_BASE_URL = os.environ.get("KAKAO_API_BASE_URL", "https://kapi.kakao.com")
 KAKAO_LOGIN_CALLBACK_URI = f"{BASE_URL}accounts/kakao/login/callback/"
 KAKAO_LOGIN_FINALIZE_URI = f"{BASE_URL}accounts/kakao/login/finalize/"
 KAKAO_LOGOUT_REDIRECT_URI = "https://cote.nossi.dev/account"
 # KAKAO_LOGOUT_REDIRECT_URI = f"{BASE_URL}accounts/kakao/logout/home-redirect/"
 
+# KAKAO HTTP client (rest/kakao_client.py)
+KAKAO_HTTP_TIMEOUT = (3.05, 10)     # (connect, read) seconds of every Kakao call
+KAKAO_HTTP_RETRIES = 2              # connection failures, and 502/503/504 answers to GETs
+KAKAO_HTTP_BACKOFF = 0.3            # seconds before the first retry, doubled after that
+KAKAO_HTTP_POOL_SIZE = 10           # keep-alive connections per host and process
+
 # Find ID value from the database (Use shell)
 SITE_ID = 3
 
@@ -168,6 +205,11 @@ REST_FRAMEWORK = {
     ],
 }
 
+# access token -> user resolution of SocialTokenAuthentication (rest/authentications.py)
+SOCIAL_TOKEN_CACHE_TTL = 60             # seconds in Redis (dropped on login / refresh / logout)
+SOCIAL_TOKEN_LOCAL_CACHE_TTL = 5        # seconds in each process
+SOCIAL_TOKEN_LOCAL_CACHE_SIZE = 1024    # tokens per process
+
 # SOCIALACCOUNT_ADAPTER
 SOCIALACCOUNT_ADAPTER = 'rest.adapters.CustomSocialAccountAdapter'
 
@@ -302,6 +344,13 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# judge progress events pushed over SSE (problems/tasks/<task_id>/events/)
+JUDGE_EVENTS_TTL = 600              # seconds an event list is kept for late subscribers
+JUDGE_EVENTS_STREAM_TIMEOUT = 120   # seconds without any event before the stream is closed
+JUDGE_EVENTS_MAX_STREAMS = 4        # open streams per web process (503 above, see rest/judge_events.py)
+# final result record of an async submit, served by problems/tasks/<task_id>/
+JUDGE_RESULT_CACHE_TTL = 60 * 60    # seconds
+
 ### Logger ###
 # Define the base directory for storing log files
 LOGGING_DIR = Path(BASE_DIR) / 'logs'
@@ -405,7 +454,15 @@ LOGGING = {
         'handlers': ['file_warning'],
         'level': 'WARNING',
     },
+    # backend.log_queue : the file handlers of these loggers are written by a background thread
+    'queue': {
+        'enabled': os.environ.get('LOGGING_QUEUE_ENABLED', 'true').lower() == 'true',
+        'loggers': ['django', 'django.request', 'django.db.backends', 'rest', 'root'],
+        'maxsize': 10000,                # records waiting per logger, newer ones are dropped beyond
+        'sampling': {'DEBUG': 0.1},      # share of the records kept per level (other levels: all)
+    },
 }
+LOGGING_CONFIG = 'backend.log_queue.configure_logging'
 
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
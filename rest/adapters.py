@@ -5,7 +5,7 @@ from django.contrib.auth import get_user_model
 from django.conf import settings
 from django.shortcuts import redirect
 from .models import Profile
-import requests
+from .kakao_client import get_kakao_client
 
 KAKAO_ADMIN_KEY = settings.KAKAO_ADMIN_KEY
 
@@ -73,16 +73,18 @@ class CustomSocialAccountAdapter(DefaultSocialAccountAdapter):
         if provider == 'kakao':
             # 카카오 연결끊기 로직
             if social_id is None:
-                response = requests.post(
-                    "https://kapi.kakao.com/v1/user/unlink",
+                kakao_client = get_kakao_client()
+                response = kakao_client.post(
+                    kakao_client.api_url("/v1/user/unlink"),
                     headers={"Authorization": f"Bearer {access_token}"},
                 )
                 if response.status_code != 200:
                     logger.info("disconnect kakao error")
             else:
                 headers = {"Authorization": f'KakaoAK {KAKAO_ADMIN_KEY}'}
-                logout_response = requests.post(
-                    'https://kapi.kakao.com/v1/user/logout',
+                kakao_client = get_kakao_client()
+                logout_response = kakao_client.post(
+                    kakao_client.api_url('/v1/user/logout'),
                     data={
                         'target_id_type': 'user_id',
                         'target_id': social_id
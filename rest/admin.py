@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Profile, Job, Like, Bookmark, Category, Problem, ProblemMeta, Language, InitCode, Editorial, Submission, SubmissionDetail, Solution, Comment
+from .models import User, Profile, Job, Like, Bookmark, Category, Problem, ProblemMeta, Language, InitCode, Editorial, Submission, SubmissionDetail, SubmissionTestcaseResult, UserSolveStatus, Solution, Comment
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -67,10 +67,21 @@ class SubmissionAdmin(admin.ModelAdmin):
     search_fields = ('user_id__username', 'problem_id__title')
     ordering = ('-submitted_at',)
 
+class SubmissionTestcaseResultInline(admin.TabularInline):
+    model = SubmissionTestcaseResult
+    extra = 0
+
 @admin.register(SubmissionDetail)
 class SubmissionDetailAdmin(admin.ModelAdmin):
-    list_display = ('submission_id', 'testcase_id', 'submission_result')
-    search_fields = ('submission_id__id', 'testcase_id')
+    list_display = ('submission_id',)
+    search_fields = ('submission_id__id', 'testcase_results__testcase_id')
+    inlines = (SubmissionTestcaseResultInline,)
+
+@admin.register(UserSolveStatus)
+class UserSolveStatusAdmin(admin.ModelAdmin):
+    list_display = ('user_id', 'problem_id', 'attempt_count', 'is_solved', 'first_solved_at')
+    list_filter = ('is_solved',)
+    search_fields = ('user_id__username', 'problem_id__title')
 
 @admin.register(Solution)
 class SolutionAdmin(admin.ModelAdmin):
@@ -4,4 +4,5 @@ from ..views.category_views import *
 urlpatterns = [
     path('', CategoryView.as_view(), name='category-list'),
     path('<int:category_id>/', CategoryView.as_view(), name='category-detail'),
+    path('<int:category_id>/problems/', CategoryProblemListView.as_view(), name='category-problem-list'),
 ]
@@ -5,6 +5,7 @@ from ..views.max_constraint_views import *
 urlpatterns = [
     path('', ProblemListView.as_view(), name='problem-list'),
     path('tasks/<str:task_id>/', code_judge_task_status, name='code-judge-task-status'),
+    path('tasks/<str:task_id>/events/', code_judge_task_events, name='code-judge-task-events'),
     path('<int:problem_id>/', ProblemDetailView.as_view(), name='problem-detail'),
     path('<int:problem_id>/code/', ProblemLangCodeView.as_view(), name='problem-lang-code'),
     path('<int:problem_id>/testcase/', ProblemTestcaseView.as_view(), name='problem-testcase'),
@@ -1,7 +1,121 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, namedtuple
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from allauth.socialaccount.models import SocialToken
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from .models import User, AccessTokenIndex
+from .utils import generate_social_token_cache_key, hash_access_token
+
+SOCIAL_TOKEN_CACHE_TTL = getattr(settings, "SOCIAL_TOKEN_CACHE_TTL", 60)                # seconds (Redis)
+SOCIAL_TOKEN_LOCAL_CACHE_TTL = getattr(settings, "SOCIAL_TOKEN_LOCAL_CACHE_TTL", 5)     # seconds (in-process)
+SOCIAL_TOKEN_LOCAL_CACHE_SIZE = getattr(settings, "SOCIAL_TOKEN_LOCAL_CACHE_SIZE", 1024)
+
+
+class ResolvedToken(namedtuple('ResolvedToken', ['token_id', 'account_id', 'user_id', 'expires_at'])):
+    """ What a request needs from its SocialToken, small enough to be cached """
+    __slots__ = ()
+
+    def is_expired(self):
+        return self.expires_at is not None and self.expires_at < timezone.now()
+
+
+class LocalTTLCache:
+    """ Bounded LRU with a per-entry TTL, shared by the threads of one process """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# cache key -> (ResolvedToken, User)
+_local_token_cache = LocalTTLCache(SOCIAL_TOKEN_LOCAL_CACHE_SIZE, SOCIAL_TOKEN_LOCAL_CACHE_TTL)
+
+
+def _resolve(token):
+    """ (ResolvedToken, User) of an access token, or (None, None) : in-process LRU -> Redis -> DB """
+    cache_key = generate_social_token_cache_key(token)
+    entry = _local_token_cache.get(cache_key)
+    if entry is not None:
+        resolved, user = entry
+        return resolved, copy.copy(user)  # Requests never share one mutable User instance
+
+    resolved = cache.get(cache_key)
+    if resolved is None:
+        # Equality probe on the indexed hash : the raw token never sits in a query predicate
+        row = (
+            AccessTokenIndex.objects.filter(token_hash=hash_access_token(token))
+            .values_list('social_token_id', 'social_token_id__account_id', 'user_id', 'expires_at')
+            .first()
+        )
+        if row is None:
+            return None, None
+        resolved = ResolvedToken(*row)
+        cache.set(cache_key, resolved, SOCIAL_TOKEN_CACHE_TTL)
+
+    user = User.objects.filter(pk=resolved.user_id).first()
+    if user is None:
+        return None, None
+    _local_token_cache.set(cache_key, (resolved, user))
+    return resolved, user
+
+
+def resolve_social_token(token):
+    """ Cached SocialToken lookup : ResolvedToken of an access token, or None when it is unknown """
+    return _resolve(token)[0]
+
+
+def invalidate_social_token(*tokens):
+    """
+    Drops cached lookups of tokens that were replaced or expired (called by the SocialToken signals,
+    see signals.py). Other processes keep their in-process entry for at most SOCIAL_TOKEN_LOCAL_CACHE_TTL seconds.
+    """
+    for token in tokens:
+        if token:
+            cache_key = generate_social_token_cache_key(token)
+            cache.delete(cache_key)
+            _local_token_cache.delete(cache_key)
+
+
+def get_request_token(request):
+    """
+    ResolvedToken of the request's bearer token, or None (no / malformed header, unknown token).
+    Reuses what SocialTokenAuthentication already resolved for this request.
+    """
+    if isinstance(getattr(request, 'auth', None), ResolvedToken):
+        return request.auth
+    auth_header = request.headers.get('Authorization')
+    if not auth_header or not auth_header.startswith('Bearer '):
+        return None
+    return resolve_social_token(auth_header.split(' ')[1])
+
 
 class SocialTokenAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -15,20 +129,17 @@ class SocialTokenAuthentication(BaseAuthentication):
                 raise AuthenticationFailed("Invalid token type")
 
             """
-            Bring the social token information in the database
+            Bring the social token information (cached, see _resolve)
             """
-            social_token = SocialToken.objects.get(token=token)
-            
-            if social_token.expires_at and social_token.expires_at < timezone.now():
-                raise AuthenticationFailed("Token has expired")
+            social_token, user = _resolve(token)
+            if social_token is None:
+                raise AuthenticationFailed("Invalid token")
 
-            # You can retrieve the user from the SocialToken's account
-            user = social_token.account.user
+            if social_token.is_expired():
+                raise AuthenticationFailed("Token has expired")
 
-            return (user, None)
-        
-        except SocialToken.DoesNotExist:
-            raise AuthenticationFailed("Invalid token")
+            # The resolved token rides along as request.auth, so views do not look it up again
+            return (user, social_token)
 
         except ValueError:
-            raise AuthenticationFailed("Invalid Authorization header format")
\ No newline at end of file
+            raise AuthenticationFailed("Invalid Authorization header format")
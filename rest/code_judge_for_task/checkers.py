@@ -0,0 +1,139 @@
+import Cjudger
+import os
+import math
+import shlex
+import itertools
+from .output_stream import RStripMD5, OUTPUT_CHUNK_SIZE
+
+CHECKER_EXACT = "exact"      # Answer without trailing whitespace must match the reference byte for byte
+CHECKER_TOKEN = "token"      # Whitespace separated tokens must match, whatever the spacing / line breaks
+CHECKER_FLOAT = "float"      # Like token, but numeric tokens may differ within an absolute / relative error
+CHECKER_SPECIAL = "special"  # A checker program shipped with the testcases decides
+
+SPECIAL_JUDGE_MAX_CPU_TIME = 10000
+SPECIAL_JUDGE_MAX_REAL_TIME = 20000
+SPECIAL_JUDGE_MAX_MEMORY = 512 * 1024 * 1024
+SPECIAL_JUDGE_WRONG_ANSWER_CODES = (1, 2)  # testlib convention: 1 = wrong answer, 2 = presentation error
+
+class CheckerError(Exception):
+    """ The checker itself could not reach a verdict (broken config, special judge crash, timeout...) """
+
+
+def read_chunks(path, chunk_size=OUTPUT_CHUNK_SIZE):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+def tokenize(chunks):
+    """ Whitespace separated tokens of a byte stream; a token cut between two chunks is joined back """
+    rest = b""
+    for chunk in chunks:
+        data = rest + chunk
+        tokens = data.split()
+        rest = tokens.pop() if tokens and not data[-1:].isspace() else b""
+        yield from tokens
+    if rest:
+        yield rest
+
+
+class ExactChecker:
+    def check(self, answer_chunks, testcase_info, run_result, testcase_dir, submission_dir):
+        output_hash = RStripMD5()
+        for chunk in answer_chunks:
+            output_hash.update(chunk)
+        run_result["output_md5"] = output_hash.hexdigest()
+        return run_result["output_md5"] == testcase_info["stripped_output_md5"]
+
+
+class TokenChecker:
+    def check(self, answer_chunks, testcase_info, run_result, testcase_dir, submission_dir):
+        expected_tokens = tokenize(read_chunks(testcase_info["output_path"]))
+        for user_token, expected_token in itertools.zip_longest(tokenize(answer_chunks), expected_tokens):
+            if user_token is None or expected_token is None or not self.match(user_token, expected_token):
+                return False
+        return True
+
+    def match(self, user_token, expected_token):
+        return user_token == expected_token
+
+
+class FloatChecker(TokenChecker):
+    def __init__(self, abs_error=1e-6, rel_error=1e-6):
+        self.abs_error = abs_error
+        self.rel_error = rel_error
+
+    def match(self, user_token, expected_token):
+        if user_token == expected_token:
+            return True
+        try:
+            user_value, expected_value = float(user_token), float(expected_token)
+        except ValueError:
+            return False
+        if not (math.isfinite(user_value) and math.isfinite(expected_value)):
+            return False
+        return abs(user_value - expected_value) <= max(self.abs_error, self.rel_error * abs(expected_value))
+
+
+class SpecialChecker:
+    """
+    Runs the problem's checker program as `command` with the testcase input, the user's answer
+    and the reference output. Exit code 0 accepts the answer, 1 or 2 rejects it, anything else is a checker failure.
+    """
+    def __init__(self, checker_name, command):
+        self.checker_name = checker_name
+        self.command = command
+
+    def check(self, answer_chunks, testcase_info, run_result, testcase_dir, submission_dir):
+        testcase_id = run_result["testcase"]
+        user_output_path = os.path.join(submission_dir, testcase_id + ".answer")
+        checker_out = os.path.join(submission_dir, testcase_id + ".checker")
+        with open(user_output_path, "wb") as f:
+            for chunk in answer_chunks:
+                f.write(chunk)
+
+        command = self.command.format(checker_path=os.path.join(testcase_dir, self.checker_name),
+                                      input_path=testcase_info["input_path"],
+                                      user_output_path=user_output_path,
+                                      answer_path=testcase_info["output_path"])
+        command = shlex.split(command)
+
+        result = Cjudger.run(max_cpu_time=SPECIAL_JUDGE_MAX_CPU_TIME,
+                             max_real_time=SPECIAL_JUDGE_MAX_REAL_TIME,
+                             max_memory=SPECIAL_JUDGE_MAX_MEMORY,
+                             max_stack=128 * 1024 * 1024,
+                             max_output_size=1024 * 1024,
+                             max_process_number=Cjudger.UNLIMITED,
+                             input_path="/dev/null",
+                             output_path=checker_out,
+                             error_path=checker_out,
+                             exe_path=command[0],
+                             args=command[1::],
+                             env=["PATH=" + os.environ.get("PATH", "")],
+                             seccomp_rule_name=None,
+                             uid=0,
+                             gid=0)
+
+        if result["result"] == Cjudger.RESULT_SUCCESS:
+            return True
+        if result["result"] == Cjudger.RESULT_RUNTIME_ERROR and result["signal"] == 0 \
+                and result["exit_code"] in SPECIAL_JUDGE_WRONG_ANSWER_CODES:
+            return False
+        raise CheckerError(f"Special judge failed (result: {result['result']}, exit_code: {result['exit_code']}, signal: {result['signal']})")
+
+
+def get_checker(checker_config):
+    """ Checker described by the "checker" entry of info.json (exact match when absent) """
+    checker_config = checker_config or {"type": CHECKER_EXACT}
+    checker_type = checker_config.get("type", CHECKER_EXACT)
+    if checker_type == CHECKER_EXACT:
+        return ExactChecker()
+    if checker_type == CHECKER_TOKEN:
+        return TokenChecker()
+    if checker_type == CHECKER_FLOAT:
+        return FloatChecker(abs_error=checker_config.get("abs_error", 1e-6), rel_error=checker_config.get("rel_error", 1e-6))
+    if checker_type == CHECKER_SPECIAL:
+        return SpecialChecker(checker_config["checker_name"], checker_config["command"])
+    raise Exception("Wrong test case config")
@@ -3,6 +3,19 @@ from django.conf import settings
 RUN_BASE_DIR = settings.RUN_BASE_DIR
 TESTCASE_BASE_DIR = settings.TESTCASE_BASE_DIR
 
+JUDGE_POOL_SIZE = getattr(settings, "JUDGE_POOL_SIZE", None)
+JUDGE_POOL_MAX_TASKS_PER_CHILD = getattr(settings, "JUDGE_POOL_MAX_TASKS_PER_CHILD", None)
+JUDGE_POOL_HEALTH_CHECK_TIMEOUT = getattr(settings, "JUDGE_POOL_HEALTH_CHECK_TIMEOUT", 60)
+JUDGE_POOL_HEALTH_CHECK_INTERVAL = getattr(settings, "JUDGE_POOL_HEALTH_CHECK_INTERVAL", 60)
+JUDGE_STOP_ON_FAILURE = getattr(settings, "JUDGE_STOP_ON_FAILURE", False)
+COMPILE_CACHE_DIR = getattr(settings, "COMPILE_CACHE_DIR", None)
+COMPILE_CACHE_MAX_SIZE = getattr(settings, "COMPILE_CACHE_MAX_SIZE", 512 * 1024 * 1024)
+TESTCASE_MANIFEST_CACHE_SIZE = getattr(settings, "TESTCASE_MANIFEST_CACHE_SIZE", 256)
+JUDGE_OUTPUT_PREVIEW_SIZE = getattr(settings, "JUDGE_OUTPUT_PREVIEW_SIZE", 64 * 1024)
+JUDGE_RAM_WORKSPACE_DIR = getattr(settings, "JUDGE_RAM_WORKSPACE_DIR", None)
+JUDGE_RAM_WORKSPACE_QUOTA = getattr(settings, "JUDGE_RAM_WORKSPACE_QUOTA", 256 * 1024 * 1024)
+JUDGE_RAM_WORKSPACE_POOL_SIZE = getattr(settings, "JUDGE_RAM_WORKSPACE_POOL_SIZE", 8)
+
 default_env = ["LANG=en_US.UTF-8", "LANGUAGE=en_US:en", "LC_ALL=en_US.UTF-8"]
 lang_config = {
     "c" : {
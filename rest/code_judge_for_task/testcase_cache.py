@@ -0,0 +1,81 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from .config import TESTCASE_MANIFEST_CACHE_SIZE
+
+class TestcaseManifest:
+    """
+    Parsed info.json of one testcase directory.
+    Every testcase entry carries its resolved input/output paths; the files themselves stay on disk,
+    since the sandbox reads the input from `input_path`.
+    """
+    def __init__(self, testcase_dir, info, signature):
+        self.testcase_dir = testcase_dir
+        self.info = info
+        self.signature = signature
+
+
+class TestcaseManifestCache:
+    """
+    Process-level LRU of testcase manifests.
+    An entry is reused while info.json keeps the same version, mtime and size, so testcase uploads
+    made by another process are picked up on the next judge without any explicit signal.
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._manifests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, testcase_dir):
+        testcase_dir = os.path.normpath(testcase_dir)
+        # A testcase directory is a symlink to its current version (see install_testcases) : the manifest
+        # is read from, and points into, that version, so a judge never mixes two uploads
+        version_dir = os.path.realpath(testcase_dir)
+        info_path = os.path.join(version_dir, "info.json")
+        try:
+            stat = os.stat(info_path)
+        except OSError:
+            raise Exception("Test case info not found")
+        signature = (version_dir, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            manifest = self._manifests.get(testcase_dir)
+            if manifest is not None and manifest.signature == signature:
+                self._manifests.move_to_end(testcase_dir)
+                return manifest
+
+        manifest = self._load(version_dir, info_path, signature)
+        with self._lock:
+            self._manifests[testcase_dir] = manifest
+            self._manifests.move_to_end(testcase_dir)
+            while len(self._manifests) > self.max_entries:
+                self._manifests.popitem(last=False)
+        return manifest
+
+    def invalidate(self, testcase_dir):
+        with self._lock:
+            self._manifests.pop(os.path.normpath(testcase_dir), None)
+
+    def _load(self, testcase_dir, info_path, signature):
+        try:
+            with open(info_path) as f:
+                info = json.load(f)
+        except IOError:
+            raise Exception("Test case info not found")
+        except ValueError:
+            raise Exception("Wrong test case config")
+
+        for testcase in info["testcases"].values():
+            testcase["input_path"] = os.path.join(testcase_dir, testcase["input_name"])
+            testcase["output_path"] = os.path.join(testcase_dir, testcase["output_name"])
+        return TestcaseManifest(testcase_dir, info, signature)
+
+
+_manifest_cache = TestcaseManifestCache(TESTCASE_MANIFEST_CACHE_SIZE)
+
+def get_testcase_manifest(testcase_dir):
+    return _manifest_cache.get(testcase_dir)
+
+def invalidate_testcase_manifest(testcase_dir):
+    _manifest_cache.invalidate(testcase_dir)
@@ -0,0 +1,103 @@
+import os
+import queue
+import shutil
+import threading
+import logging
+import psutil
+from .config import JUDGE_RAM_WORKSPACE_DIR, JUDGE_RAM_WORKSPACE_QUOTA, JUDGE_RAM_WORKSPACE_POOL_SIZE
+
+logger = logging.getLogger('rest')
+
+class WorkspacePool:
+    """
+    Pre-created submission directories on a RAM filesystem (tmpfs).
+    acquire() hands out an empty directory without any mkdir, and released directories are
+    emptied by a background thread before being handed out again. When every directory is
+    in use or the filesystem is over `quota` bytes, acquire() returns None and the caller
+    falls back to a disk workspace.
+
+    The quota is best effort : it is only checked when a directory is handed out, and nothing limits
+    what a submission then writes into it (the sandbox's max_output_size bounds each file, not the
+    directory). A submission that fills the filesystem fails with ENOSPC instead of falling back to
+    disk, so the tmpfs has to be sized for `quota` plus `size` submissions running at their limits
+    (compiler output, executables and every testcase output).
+    """
+    def __init__(self, base_dir, size, quota):
+        self.base_dir = base_dir
+        self.size = size
+        self.quota = quota
+        self._free = queue.Queue()
+        self._dirty = queue.Queue()
+        self._owner_pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            # Directories and the cleaner thread belong to one process (gunicorn / celery prefork)
+            if self._owner_pid == os.getpid():
+                return
+            self._owner_pid = os.getpid()
+            self._free = queue.Queue()
+            self._dirty = queue.Queue()
+            os.makedirs(self.base_dir, exist_ok=True)
+            if shutil.disk_usage(self.base_dir).total <= self.quota:
+                logger.warning("RAM workspace quota (%s bytes) is not below the size of %s: running submissions can fill it up",
+                               self.quota, self.base_dir)
+            self._remove_orphans()
+            for index in range(self.size):
+                work_dir = os.path.join(self.base_dir, f"{self._owner_pid}-{index}")
+                shutil.rmtree(work_dir, ignore_errors=True)
+                os.mkdir(work_dir)
+                self._free.put(work_dir)
+            threading.Thread(target=self._clean_forever, daemon=True).start()
+            logger.info("RAM workspace pool ready: %s dir(s) in %s (pid: %s)", self.size, self.base_dir, self._owner_pid)
+
+    def _remove_orphans(self):
+        """ Workspaces left behind by processes that are gone """
+        for entry in os.scandir(self.base_dir):
+            pid = entry.name.split("-", 1)[0]
+            if pid.isdigit() and not psutil.pid_exists(int(pid)):
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def acquire(self):
+        self._ensure_started()
+        if shutil.disk_usage(self.base_dir).used >= self.quota:
+            logger.info("RAM workspace quota exceeded, using a disk workspace")
+            return None
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            logger.info("RAM workspace pool exhausted, using a disk workspace")
+            return None
+
+    def release(self, work_dir):
+        self._dirty.put(work_dir)
+
+    def _clean_forever(self):
+        while True:
+            work_dir = self._dirty.get()
+            try:
+                for entry in os.scandir(work_dir):
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+            except OSError as e:
+                logger.warning("Failed to clean RAM workspace %s, recreating it: %s", work_dir, e)
+                shutil.rmtree(work_dir, ignore_errors=True)
+                os.makedirs(work_dir, exist_ok=True)
+            self._free.put(work_dir)
+
+
+_workspace_pool = None
+_workspace_pool_lock = threading.Lock()
+
+def get_workspace_pool():
+    """ Process-wide RAM workspace pool, or None when JUDGE_RAM_WORKSPACE_DIR is not configured """
+    global _workspace_pool
+    if not JUDGE_RAM_WORKSPACE_DIR:
+        return None
+    with _workspace_pool_lock:
+        if _workspace_pool is None:
+            _workspace_pool = WorkspacePool(JUDGE_RAM_WORKSPACE_DIR, JUDGE_RAM_WORKSPACE_POOL_SIZE, JUDGE_RAM_WORKSPACE_QUOTA)
+        return _workspace_pool
@@ -0,0 +1,129 @@
+"""
+Judge progress events of a Celery judge task.
+Every event is appended to a Redis list (replayed to late subscribers) and published on a
+channel of the same name, so the SSE endpoint can push verdicts as soon as they are produced.
+The "summary" event is always the last one of a task.
+
+An open stream holds a web worker thread and a Redis pubsub connection until the summary event
+(or JUDGE_EVENTS_STREAM_TIMEOUT seconds without events). Streams are therefore capped at
+JUDGE_EVENTS_MAX_STREAMS per process, and need threaded workers (gunicorn --worker-class gthread
+with more --threads than that cap) : with sync workers one watcher blocks a whole worker.
+"""
+import json
+import time
+import logging
+import threading
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework.renderers import BaseRenderer
+from .utils import generate_judge_events_cache_key
+
+logger = logging.getLogger('rest')
+
+JUDGE_EVENTS_TTL = getattr(settings, "JUDGE_EVENTS_TTL", 600)                        # seconds
+JUDGE_EVENTS_STREAM_TIMEOUT = getattr(settings, "JUDGE_EVENTS_STREAM_TIMEOUT", 120)  # seconds
+JUDGE_EVENTS_MAX_STREAMS = getattr(settings, "JUDGE_EVENTS_MAX_STREAMS", 4)         # open streams per process
+JUDGE_EVENTS_HEARTBEAT = 15                                                          # seconds
+
+_stream_slots = threading.BoundedSemaphore(JUDGE_EVENTS_MAX_STREAMS)
+
+EVENT_TESTCASE = "testcase"
+EVENT_SUMMARY = "summary"
+
+def publish_judge_event(task_id, event, data):
+    """ Best effort: a Redis failure is logged but never fails the judge task """
+    key = generate_judge_events_cache_key(task_id)
+    try:
+        redis_conn = get_redis_connection("default")
+        payload = json.dumps({'event': event, 'data': data}, default=str)
+        seq = redis_conn.rpush(key, payload)
+        redis_conn.expire(key, JUDGE_EVENTS_TTL)
+        redis_conn.publish(key, json.dumps({'seq': seq, 'event': event, 'data': data}, default=str))
+    except Exception as e:
+        logger.warning("Failed to publish judge event '%s' for task ID %s: %s", event, task_id, e)
+
+
+def _format_event(seq, event, data):
+    return f"id: {seq}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def stream_judge_events(task_id, last_seq=0):
+    """
+    Server-Sent Events of a judge task, starting after `last_seq` (Last-Event-ID on reconnect).
+    Stops after the summary event or when nothing happened for JUDGE_EVENTS_STREAM_TIMEOUT seconds.
+    """
+    key = generate_judge_events_cache_key(task_id)
+    redis_conn = get_redis_connection("default")
+    pubsub = redis_conn.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(key)  # Subscribe before the replay so no event falls in between
+    try:
+        # Replay what was published before this client connected
+        for index, payload in enumerate(redis_conn.lrange(key, last_seq, -1), start=last_seq + 1):
+            message = json.loads(payload)
+            last_seq = index
+            yield _format_event(index, message['event'], message['data'])
+            if message['event'] == EVENT_SUMMARY:
+                return
+
+        last_activity = last_heartbeat = time.monotonic()
+        while time.monotonic() - last_activity < JUDGE_EVENTS_STREAM_TIMEOUT:
+            message = pubsub.get_message(timeout=1.0)
+            if message is None:
+                if time.monotonic() - last_heartbeat >= JUDGE_EVENTS_HEARTBEAT:
+                    last_heartbeat = time.monotonic()
+                    yield ": keep-alive\n\n"
+                continue
+
+            message = json.loads(message['data'])
+            if message['seq'] <= last_seq:  # Already sent by the replay
+                continue
+            last_seq, last_activity = message['seq'], time.monotonic()
+            yield _format_event(message['seq'], message['event'], message['data'])
+            if message['event'] == EVENT_SUMMARY:
+                return
+        yield _format_event(last_seq + 1, EVENT_SUMMARY, {'status': 'TIMEOUT'})
+    finally:
+        pubsub.close()
+
+
+class JudgeEventStream:
+    """
+    stream_judge_events holding one of the JUDGE_EVENTS_MAX_STREAMS slots of this process.
+    Django calls close() once the response is done (or the client went away), which frees the slot,
+    even when the stream was never iterated.
+    """
+    def __init__(self, task_id, last_seq=0):
+        self._events = stream_judge_events(task_id, last_seq)
+        self._closed = False
+
+    @classmethod
+    def open(cls, task_id, last_seq=0):
+        """ A new stream, or None when every slot is taken """
+        if not _stream_slots.acquire(blocking=False):
+            return None
+        return cls(task_id, last_seq)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._events)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._events.close()
+        finally:
+            _stream_slots.release()
+
+
+class EventStreamRenderer(BaseRenderer):
+    """ Lets DRF views accept `Accept: text/event-stream` (EventSource clients) """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, default=str).encode(self.charset)
@@ -0,0 +1,80 @@
+"""
+Shared HTTP client of the Kakao OAuth / user APIs.
+One keep-alive connection pool per process, a timeout on every call, bounded retries with backoff
+(connection failures, and 5xx answers to GET requests only) and one latency log line per call.
+"""
+import os
+import time
+import logging
+import threading
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+logger = logging.getLogger('rest')
+
+KAKAO_AUTH_BASE_URL = getattr(settings, "KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com")
+KAKAO_API_BASE_URL = getattr(settings, "KAKAO_API_BASE_URL", "https://kapi.kakao.com")
+KAKAO_HTTP_TIMEOUT = getattr(settings, "KAKAO_HTTP_TIMEOUT", (3.05, 10))   # (connect, read) seconds
+KAKAO_HTTP_RETRIES = getattr(settings, "KAKAO_HTTP_RETRIES", 2)
+KAKAO_HTTP_BACKOFF = getattr(settings, "KAKAO_HTTP_BACKOFF", 0.3)          # seconds, doubled on every retry
+KAKAO_HTTP_POOL_SIZE = getattr(settings, "KAKAO_HTTP_POOL_SIZE", 10)
+
+
+class KakaoClient:
+    def __init__(self, auth_base_url=KAKAO_AUTH_BASE_URL, api_base_url=KAKAO_API_BASE_URL, timeout=KAKAO_HTTP_TIMEOUT,
+                 retries=KAKAO_HTTP_RETRIES, backoff=KAKAO_HTTP_BACKOFF, pool_size=KAKAO_HTTP_POOL_SIZE):
+        self.auth_base_url = auth_base_url.rstrip('/')
+        self.api_base_url = api_base_url.rstrip('/')
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET']),  # Token exchange, logout and unlink POSTs are not idempotent
+            raise_on_status=False,               # The last answer goes back to the view, which reports it
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def auth_url(self, path):
+        return f"{self.auth_base_url}{path}"
+
+    def api_url(self, path):
+        return f"{self.api_base_url}{path}"
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        target = urlsplit(url)._replace(query='').geturl()  # Query strings may carry codes and keys
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            logger.warning("Kakao %s %s failed after %.0f ms: %s", method, target, (time.monotonic() - started) * 1000, e)
+            raise
+        logger.info("Kakao %s %s -> %s in %.0f ms", method, target, response.status_code, (time.monotonic() - started) * 1000)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+_kakao_client = None
+_kakao_client_pid = None
+_kakao_client_lock = threading.Lock()
+
+def get_kakao_client():
+    """ Process-wide client (pooled connections are never shared with forked workers) """
+    global _kakao_client, _kakao_client_pid
+    with _kakao_client_lock:
+        if _kakao_client is None or _kakao_client_pid != os.getpid():
+            _kakao_client = KakaoClient()
+            _kakao_client_pid = os.getpid()
+        return _kakao_client
@@ -1,17 +1,43 @@
+from django.conf import settings
 from django.http import JsonResponse
-from urllib.parse import urlparse
+from functools import lru_cache
+
+DEFAULT_ALLOWED_DOMAINS = (
+    'cote.nossi.dev',
+    'api-mywuf.run.goorm.io',
+    'api-mywuf.run.goorm.site',
+)
+BLOCKED_USER_AGENTS = ('Postman', 'curl')
+
+def extract_domain(url):
+    """ netloc of an Origin / Referer, sliced out without parsing the path and query ('' when there is none) """
+    start = url.find('//')
+    if start < 0:
+        return ''  # e.g. Origin: null
+    start += 2
+    end = len(url)
+    for separator in '/?#':
+        index = url.find(separator, start)
+        if index != -1 and index < end:
+            end = index
+    return url[start:end]
+
+@lru_cache(maxsize=1024)
+def is_allowed_domain(domain, allowed_domains):
+    # Keyed on the domain, not on the full Referer URL : a few entries cover every page of a site
+    return domain.lower().rstrip('.') in allowed_domains
 
 class DomainCheckMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        # Loaded once per process : set membership instead of a list scan on every request
+        self.allowed_domains = frozenset(getattr(settings, 'DOMAIN_CHECK_ALLOWED_DOMAINS', DEFAULT_ALLOWED_DOMAINS))
+        self.bypass_paths = tuple(getattr(settings, 'DOMAIN_CHECK_BYPASS_PATHS', ()))
 
     def __call__(self, request):
-        # Define allowed domains
-        allowed_domains = [
-            'cote.nossi.dev',
-            'api-mywuf.run.goorm.io',
-            'api-mywuf.run.goorm.site',
-        ]
+        # Static files, health checks ... are not checked at all
+        if self.bypass_paths and request.path.startswith(self.bypass_paths):
+            return self.get_response(request)
 
         # Get Origin or Referer, or fallback to Host
         origin = request.META.get('HTTP_ORIGIN')
@@ -23,16 +49,14 @@ class DomainCheckMiddleware:
 
         # Check origin first, then referer, then host
         if origin:
-            parsed_url = urlparse(origin)
-            domain = parsed_url.netloc
+            domain = extract_domain(origin)
         elif referer:
-            parsed_url = urlparse(referer)
-            domain = parsed_url.netloc
+            domain = extract_domain(referer)
         elif host:
             domain = host
 
         # Ensure the domain is properly set
-        if domain and domain not in allowed_domains:
+        if domain and not is_allowed_domain(domain, self.allowed_domains):
             return JsonResponse({
                 'error': 'Forbidden Approach',
                 'detail': 'Requests from this domain are not allowed.'
@@ -40,11 +64,11 @@ class DomainCheckMiddleware:
 
         user_agent = request.META.get('HTTP_USER_AGENT')
 
-        if not user_agent or 'Postman' in user_agent or 'curl' in user_agent:
+        if not user_agent or any(agent in user_agent for agent in BLOCKED_USER_AGENTS):
             return JsonResponse({
                 'error': 'Forbidden Approach',
                 'detail': 'API testing tools are not allowed.'
             }, status=403)
 
         # Continue with the next middleware
-        return self.get_response(request)
\ No newline at end of file
+        return self.get_response(request)
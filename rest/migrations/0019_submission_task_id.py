@@ -0,0 +1,18 @@
+# Generated by Django 4.2.14 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest', '0018_alter_bookmark_unique_together_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='submission',
+            name='task_id',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True),
+        ),
+    ]
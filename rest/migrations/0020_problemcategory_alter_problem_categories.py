@@ -0,0 +1,66 @@
+# Generated by Django 4.2.14 on 2026-10-17 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def categories_to_relation(apps, schema_editor):
+    Problem = apps.get_model('rest', 'Problem')
+    Category = apps.get_model('rest', 'Category')
+    ProblemCategory = apps.get_model('rest', 'ProblemCategory')
+
+    links = []
+    for problem in Problem.objects.all():
+        names = [name.strip() for name in (problem.categories or '').split(',') if name.strip()]
+        for name in dict.fromkeys(names):  # Unique, in the original order
+            category, _ = Category.objects.get_or_create(category_name=name)
+            links.append(ProblemCategory(problem_id=problem, category_id=category))
+    ProblemCategory.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def relation_to_categories(apps, schema_editor):
+    Problem = apps.get_model('rest', 'Problem')
+    ProblemCategory = apps.get_model('rest', 'ProblemCategory')
+
+    for problem in Problem.objects.all():
+        names = ProblemCategory.objects.filter(problem_id=problem).order_by('id').values_list('category_id__category_name', flat=True)
+        problem.categories_text = ','.join(names)
+        problem.save(update_fields=['categories_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest', '0019_submission_task_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemCategory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rest.category')),
+                ('problem_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='rest.problem')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category_id', 'problem_id'], name='rest_proble_categor_d0f51a_idx')],
+                'unique_together': {('problem_id', 'category_id')},
+            },
+        ),
+        # Keep the comma separated text under another name while the relation is filled
+        migrations.RenameField(
+            model_name='problem',
+            old_name='categories',
+            new_name='categories_text',
+        ),
+        migrations.RunPython(categories_to_relation, relation_to_categories),
+        migrations.RemoveField(
+            model_name='problem',
+            name='categories_text',
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='categories',
+            field=models.ManyToManyField(blank=True, related_name='problems', through='rest.ProblemCategory', to='rest.category'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 4.2.14 on 2026-10-17 11:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _format_number(value):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def split_testcase_results(apps, schema_editor):
+    SubmissionDetail = apps.get_model('rest', 'SubmissionDetail')
+    SubmissionTestcaseResult = apps.get_model('rest', 'SubmissionTestcaseResult')
+
+    rows = []
+    for detail in SubmissionDetail.objects.all().iterator():
+        testcase_ids, submission_results, run_times, memories = [
+            value.split(',') if value else []
+            for value in (detail.testcase_id, detail.submission_result, detail.run_time, detail.memory)
+        ]
+        for order, testcase_id in enumerate(testcase_ids):
+            rows.append(SubmissionTestcaseResult(
+                submission_detail_id=detail,
+                order=order,
+                testcase_id=testcase_id,
+                submission_result=submission_results[order] if order < len(submission_results) else '',
+                run_time=_to_number(run_times[order]) if order < len(run_times) else 0,
+                memory=_to_number(memories[order]) if order < len(memories) else 0
+            ))
+        if len(rows) >= 1000:
+            SubmissionTestcaseResult.objects.bulk_create(rows)
+            rows = []
+    SubmissionTestcaseResult.objects.bulk_create(rows)
+
+
+def join_testcase_results(apps, schema_editor):
+    SubmissionDetail = apps.get_model('rest', 'SubmissionDetail')
+
+    for detail in SubmissionDetail.objects.prefetch_related('testcase_results').iterator(chunk_size=1000):
+        results = sorted(detail.testcase_results.all(), key=lambda result: result.order)
+        detail.testcase_id = ','.join(result.testcase_id for result in results)
+        detail.submission_result = ','.join(result.submission_result for result in results)
+        detail.run_time = ','.join(_format_number(result.run_time) for result in results)
+        detail.memory = ','.join(_format_number(result.memory) for result in results)
+        detail.save(update_fields=['testcase_id', 'submission_result', 'run_time', 'memory'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest', '0020_problemcategory_alter_problem_categories'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubmissionTestcaseResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.PositiveIntegerField(default=0)),
+                ('testcase_id', models.CharField(max_length=255)),
+                ('submission_result', models.CharField(max_length=50)),
+                ('run_time', models.FloatField(default=0)),
+                ('memory', models.FloatField(default=0)),
+                ('submission_detail_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='testcase_results', to='rest.submissiondetail')),
+            ],
+            options={
+                'ordering': ['order'],
+                'indexes': [models.Index(fields=['testcase_id', 'submission_result'], name='rest_submis_testcas_f96b16_idx')],
+                'unique_together': {('submission_detail_id', 'order')},
+            },
+        ),
+        migrations.RunPython(split_testcase_results, join_testcase_results),
+        migrations.RemoveField(
+            model_name='submissiondetail',
+            name='memory',
+        ),
+        migrations.RemoveField(
+            model_name='submissiondetail',
+            name='run_time',
+        ),
+        migrations.RemoveField(
+            model_name='submissiondetail',
+            name='submission_result',
+        ),
+        migrations.RemoveField(
+            model_name='submissiondetail',
+            name='testcase_id',
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.14 on 2026-10-17 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q
+import django.db.models.deletion
+
+
+def backfill_solve_status(apps, schema_editor):
+    Submission = apps.get_model('rest', 'Submission')
+    UserSolveStatus = apps.get_model('rest', 'UserSolveStatus')
+
+    rows = (
+        Submission.objects.values('user_id', 'problem_id')
+        .annotate(
+            attempt_count=Count('id'),
+            first_solved_at=Min('submitted_at', filter=Q(final_result='SOLVED')),
+            last_submitted_at=Max('submitted_at'),
+        )
+        .order_by()
+    )
+    UserSolveStatus.objects.bulk_create(
+        (
+            UserSolveStatus(
+                user_id_id=row['user_id'],
+                problem_id_id=row['problem_id'],
+                attempt_count=row['attempt_count'],
+                is_solved=row['first_solved_at'] is not None,
+                first_solved_at=row['first_solved_at'],
+                last_submitted_at=row['last_submitted_at'],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('rest', '0021_submissiontestcaseresult_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSolveStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('attempt_count', models.IntegerField(default=0)),
+                ('is_solved', models.BooleanField(default=False)),
+                ('first_solved_at', models.DateTimeField(blank=True, null=True)),
+                ('last_submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('problem_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solve_statuses', to='rest.problem')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solve_statuses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user_id', 'problem_id')},
+            },
+        ),
+        migrations.RunPython(backfill_solve_status, migrations.RunPython.noop),
+    ]
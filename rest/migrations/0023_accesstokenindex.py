@@ -0,0 +1,46 @@
+# Generated by Django 4.2.14 on 2026-10-17 13:00
+
+import hashlib
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def index_social_tokens(apps, schema_editor):
+    SocialToken = apps.get_model('socialaccount', 'SocialToken')
+    AccessTokenIndex = apps.get_model('rest', 'AccessTokenIndex')
+
+    rows = (
+        AccessTokenIndex(
+            token_hash=hashlib.sha256(social_token.token.encode('utf-8')).hexdigest(),
+            social_token_id_id=social_token.id,
+            user_id_id=social_token.account.user_id,
+            expires_at=social_token.expires_at,
+        )
+        for social_token in SocialToken.objects.select_related('account').exclude(token='').iterator()
+    )
+    # A token shared by two SocialToken rows keeps a single (first) index row
+    AccessTokenIndex.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('socialaccount', '0001_initial'),
+        ('rest', '0022_usersolvestatus'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessTokenIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token_hash', models.CharField(max_length=64, unique=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('social_token_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='access_token_index', to='socialaccount.socialtoken')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access_token_indexes', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(index_social_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.14 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest', '0023_accesstokenindex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['level', 'id'], name='rest_proble_level_5c6609_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['solve_number', 'id'], name='rest_proble_solve_n_a7f042_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['created_at', 'id'], name='rest_proble_created_b5a4c2_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.14 on 2026-10-17 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rest', '0024_problem_rest_proble_level_5c6609_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='problem',
+            index=models.Index(fields=['updated_at', 'id'], name='rest_proble_updated_bc70d3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['submitted_at', 'id'], name='rest_submis_submitt_03171c_idx'),
+        ),
+    ]
@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
-from django.core.cache import cache
-from django_redis import get_redis_connection
 from .managers import UserManager
 from .utils import *
 
@@ -49,6 +49,25 @@ class Profile(models.Model):
     job = models.ForeignKey('Job', on_delete=models.SET_NULL, null=True, blank=True)
     role = models.CharField(max_length=10, default="user")
 
+# Access Token Index (SHA-256 of a SocialToken's access token -> user, indexed for equality lookups)
+class AccessTokenIndex(models.Model):
+    token_hash = models.CharField(max_length=64, unique=True)
+    social_token_id = models.OneToOneField('socialaccount.SocialToken', on_delete=models.CASCADE, related_name='access_token_index')
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='access_token_indexes')
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    @classmethod
+    def index_token(cls, social_token):
+        """ Points the row of `social_token` at its current access token and expiry (called on every save, see signals.py) """
+        cls.objects.update_or_create(
+            social_token_id=social_token,
+            defaults={
+                'token_hash': hash_access_token(social_token.token),
+                'user_id_id': social_token.account.user_id,
+                'expires_at': social_token.expires_at,
+            }
+        )
+
 # Job
 class Job(models.Model):
     job_name = models.CharField(max_length=50, default='None')
@@ -76,10 +95,23 @@ class Category(models.Model):
     category_name = models.CharField(max_length=100, unique=True, db_index=True)
     description = models.TextField(null=True, blank=True)
 
+    def invalidate_cache(self, problem_ids):
+        # Problems are serialized with their category names
+        bump_cache_version(problem_list_cache_namespace(), *[problem_cache_namespace(problem_id) for problem_id in problem_ids])
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.invalidate_cache(self.problems.values_list('id', flat=True))
+
+    def delete(self, *args, **kwargs):
+        problem_ids = list(self.problems.values_list('id', flat=True))
+        super().delete(*args, **kwargs)
+        self.invalidate_cache(problem_ids)
+
 # Problem
 class Problem(models.Model):
     title = models.CharField(max_length=255, unique=True, default="No Title")
-    categories = models.TextField()
+    categories = models.ManyToManyField('Category', through='ProblemCategory', related_name='problems', blank=True)
     level = models.PositiveSmallIntegerField(default=1)  # Assuming level is 1-5
     attempt_number = models.BigIntegerField(default=0)
     solve_number = models.BigIntegerField(default=0)
@@ -89,32 +121,52 @@ class Problem(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=['-updated_at'])
+            models.Index(fields=['-updated_at']),
+            # Keyset columns of the list sorts (see ProblemCursorPagination)
+            models.Index(fields=['level', 'id']),
+            models.Index(fields=['solve_number', 'id']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
-    def invalidate_problem_list_cache(self):
-        # Invalidate cache for anonymous users
-        cache.delete(generate_problem_list_cache_key(None))
-
-        # Invalidate cache for all users stored in Redis
-        redis_conn = get_redis_connection("default")
-        cached_user_ids = redis_conn.smembers("cached_users")
-
-        for user_id in cached_user_ids:
-            cache.delete(generate_problem_list_cache_key(user_id))
+    def invalidate_cache(self, problem_id):
+        # Shared problem list + this problem's detail, bumped once the write has committed
+        bump_cache_version(problem_list_cache_namespace(), problem_cache_namespace(problem_id))
 
     def save(self, *args, **kwargs):
-        # Invalidate the cache for both the problem list and problem details before saving
-        self.invalidate_problem_list_cache()  # Invalidate problem list
-        cache.delete(generate_problem_cache_key(self.pk))  # Invalidate specific problem
         super().save(*args, **kwargs)
+        self.invalidate_cache(self.pk)
 
     def delete(self, *args, **kwargs):
-        # Invalidate the cache for both the problem list and problem details before deleting
-        self.invalidate_problem_list_cache()  # Invalidate problem list
-        cache.delete(generate_problem_cache_key(self.pk))  # Invalidate specific problem
+        problem_id = self.pk
         super().delete(*args, **kwargs)
+        self.invalidate_cache(problem_id)
+
+    @classmethod
+    def increment_counters(cls, problem_id, attempt_number=0, solve_number=0):
+        """
+        Bumps the attempt / solve counters with a single UPDATE. Unlike save(), this neither touches
+        updated_at nor invalidates the problem caches : cached lists show the new counters once they expire.
+        """
+        counters = {}
+        if attempt_number:
+            counters['attempt_number'] = F('attempt_number') + attempt_number
+        if solve_number:
+            counters['solve_number'] = F('solve_number') + solve_number
+        if counters:
+            cls.objects.filter(pk=problem_id).update(**counters)
+
+
+# Problem <-> Category
+class ProblemCategory(models.Model):
+    problem_id = models.ForeignKey(Problem, on_delete=models.CASCADE)
+    category_id = models.ForeignKey(Category, on_delete=models.CASCADE)
 
+    class Meta:
+        unique_together = ('problem_id', 'category_id',)
+        indexes = [
+            models.Index(fields=['category_id', 'problem_id'])  # Problems in a category
+        ]
 
 # Problem Meta
 class ProblemMeta(models.Model):
@@ -124,16 +176,13 @@ class ProblemMeta(models.Model):
     testcase = models.JSONField(null=True, blank=True)
 
     def save(self, *args, **kwargs):
-        # Invalidate the cache for the problem details before saving
-        cache.delete(generate_problem_meta_cache_key(self.problem_id.pk))  # Invalidate problem meta
-        cache.delete(generate_problem_cache_key(self.problem_id.pk))  # Invalidate specific problem
         super().save(*args, **kwargs)
+        bump_cache_version(problem_meta_cache_namespace(self.problem_id_id), problem_cache_namespace(self.problem_id_id))
 
     def delete(self, *args, **kwargs):
-        # Invalidate the cache for the problem details before deleting
-        cache.delete(generate_problem_meta_cache_key(self.problem_id.pk))  # Invalidate problem meta
-        cache.delete(generate_problem_cache_key(self.problem_id.pk))  # Invalidate specific problem
+        problem_id = self.problem_id_id
         super().delete(*args, **kwargs)
+        bump_cache_version(problem_meta_cache_namespace(problem_id), problem_cache_namespace(problem_id))
 
 # Code Judge Max Constraint
 class CodeJudgeMaxConstraint(models.Model):
@@ -179,19 +228,107 @@ class Submission(models.Model):
     passed_num = models.IntegerField(default=0)
     total_num = models.IntegerField(default=0)
     submitted_at = models.DateTimeField(auto_now_add=True)
+    task_id = models.CharField(max_length=255, unique=True, null=True, blank=True)  # Celery judge task (async submits only)
 
     class Meta:
         indexes = [
             models.Index(fields=['user_id', 'problem_id']),
-            models.Index(fields=['-submitted_at'])
+            models.Index(fields=['-submitted_at']),
+            # Keyset columns of the list sorts (see SubmissionCursorPagination)
+            models.Index(fields=['submitted_at', 'id']),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The user's solve status overlay of the problem list may change
+        bump_cache_version(solve_status_cache_namespace(self.user_id_id))
+
+    def delete(self, *args, **kwargs):
+        user_id = self.user_id_id
+        super().delete(*args, **kwargs)
+        bump_cache_version(solve_status_cache_namespace(user_id))
+
 class SubmissionDetail(models.Model):
     submission_id = models.OneToOneField(Submission, on_delete=models.CASCADE, primary_key=True, related_name='submission_detail')
-    testcase_id = models.TextField()
-    submission_result = models.TextField()
-    run_time = models.TextField()
-    memory = models.TextField()
+
+    def add_testcase_results(self, rows):
+        """ rows : (testcase_id, submission_result, run_time, memory) tuples in testcase order """
+        SubmissionTestcaseResult.objects.bulk_create([
+            SubmissionTestcaseResult(
+                submission_detail_id=self,
+                order=order,
+                testcase_id=testcase_id,
+                submission_result=submission_result,
+                run_time=run_time,
+                memory=memory
+            )
+            for order, (testcase_id, submission_result, run_time, memory) in enumerate(rows)
+        ])
+
+    def set_testcase_results(self, rows):
+        self.testcase_results.all().delete()
+        self.add_testcase_results(rows)
+
+# Submission Testcase Result (One row per testcase of a submission)
+class SubmissionTestcaseResult(models.Model):
+    submission_detail_id = models.ForeignKey(SubmissionDetail, on_delete=models.CASCADE, related_name='testcase_results')
+    order = models.PositiveIntegerField(default=0)
+    testcase_id = models.CharField(max_length=255)
+    submission_result = models.CharField(max_length=50)
+    run_time = models.FloatField(default=0)
+    memory = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['order']
+        unique_together = ('submission_detail_id', 'order',)
+        indexes = [
+            models.Index(fields=['testcase_id', 'submission_result'])
+        ]
+
+# User Solve Status (One row per user and problem, maintained on every judged submission)
+class UserSolveStatus(models.Model):
+    user_id = models.ForeignKey(User, on_delete=models.CASCADE, related_name='solve_statuses')
+    problem_id = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name='solve_statuses')
+    attempt_count = models.IntegerField(default=0)
+    is_solved = models.BooleanField(default=False)
+    first_solved_at = models.DateTimeField(null=True, blank=True)
+    last_submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('user_id', 'problem_id',)
+
+    @classmethod
+    def record_submission(cls, user, problem, is_solved):
+        """
+        Counts one judged submission of `user` for `problem` and returns (is_first_attempt, is_first_solve).
+        Both come from single-row atomic statements (unique insert, conditional UPDATE), so two
+        concurrent submissions can never both be counted as the first one.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            # Locking reads : under REPEATABLE READ, a plain read (get_or_create's retry) would not see a row
+            # inserted by a concurrent first submission after this transaction's snapshot, and fail the submit
+            solve_status = cls.objects.select_for_update().filter(user_id=user, problem_id=problem).first()
+            is_first_attempt = solve_status is None
+            if is_first_attempt:
+                try:
+                    with transaction.atomic():
+                        solve_status = cls.objects.create(user_id=user, problem_id=problem)
+                except IntegrityError:  # Lost the race for the first attempt
+                    solve_status = cls.objects.select_for_update().get(user_id=user, problem_id=problem)
+                    is_first_attempt = False
+        cls.objects.filter(pk=solve_status.pk).update(attempt_count=F('attempt_count') + 1, last_submitted_at=now)
+        is_first_solve = False
+        if is_solved:
+            is_first_solve = cls.objects.filter(pk=solve_status.pk, is_solved=False).update(is_solved=True, first_solved_at=now) == 1
+        return is_first_attempt, is_first_solve
+
+    @classmethod
+    def record_judged_submission(cls, user, problem, is_solved):
+        """ record_submission, plus the problem's attempt / solve counters when it is the user's first one """
+        is_first_attempt, is_first_solve = cls.record_submission(user, problem, is_solved)
+        Problem.increment_counters(problem.id, attempt_number=int(is_first_attempt), solve_number=int(is_first_solve))
+        return is_first_attempt, is_first_solve
 
 # Solution
 class Solution(models.Model):
@@ -0,0 +1,50 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+Pages are read with `WHERE <ordering field> < last seen value LIMIT n` on the indexed column,
+so the cost of a page does not depend on how deep it is in the table. Every ordering ends with `id`
+and is backed by a composite (field, id) index, so ties on the first field are read in index order.
+Pagination is opt-in : without any of the query parameters below, the views keep returning the full list.
+"""
+from rest_framework.pagination import CursorPagination
+from rest_framework.exceptions import ValidationError
+
+class SortableCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    sort_query_param = 'sort'
+    sort_options = {}           # sort name -> ordering (first field is the keyset column)
+    default_sort = None
+
+    def get_ordering(self, request, queryset, view):
+        sort = request.query_params.get(self.sort_query_param, self.default_sort)
+        if sort not in self.sort_options:
+            raise ValidationError(f"Invalid sort: it must be one of {', '.join(self.sort_options)}.")
+        return self.sort_options[sort]
+
+    @classmethod
+    def is_requested(cls, request, filter_params=()):
+        params = (cls.cursor_query_param, cls.page_size_query_param, cls.sort_query_param) + tuple(filter_params)
+        return any(param in request.query_params for param in params)
+
+
+class ProblemCursorPagination(SortableCursorPagination):
+    sort_options = {
+        'recent': ('-updated_at', '-id'),
+        'oldest': ('updated_at', 'id'),
+        'newest': ('-created_at', '-id'),
+        'level': ('level', 'id'),
+        '-level': ('-level', '-id'),
+        # solve_number keeps growing while a client pages through the list : a problem solved meanwhile
+        # can move to an earlier page (never shown) or be shown twice. Accepted for a popularity ranking.
+        'popular': ('-solve_number', '-id'),
+    }
+    default_sort = 'recent'
+
+
+class SubmissionCursorPagination(SortableCursorPagination):
+    sort_options = {
+        'recent': ('-submitted_at', '-id'),
+        'oldest': ('submitted_at', 'id'),
+    }
+    default_sort = 'recent'
@@ -1,5 +1,6 @@
 from .models import *
 from rest_framework import serializers
+from django.core.cache import cache
 from dj_rest_auth.registration.serializers import (
     RegisterSerializer as DefaultRegisterSerializer,
 )
@@ -46,10 +47,18 @@ class BookmarkSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 class CategorySerializer(serializers.ModelSerializer):
+    problem_count = serializers.SerializerMethodField()
+
     class Meta:
         model = Category
         fields = '__all__'
 
+    def get_problem_count(self, obj):
+        # Annotated by the list query (one GROUP BY), counted from the relation index otherwise
+        if hasattr(obj, 'problem_count'):
+            return obj.problem_count
+        return obj.problems.count()
+
 class ZipFileUploadSerializer(serializers.Serializer):
     testcase_zip = serializers.FileField()
 
@@ -80,6 +89,40 @@ class ProblemMetaSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+SOLVE_STATUS_UNSOLVED = '풀이 미완'
+SOLVE_STATUS_ATTEMPTED = '풀이 중'
+SOLVE_STATUS_SOLVED = '풀이 완료'
+
+def get_solve_status_map(user_id):
+    """ {problem_id: solve status} of every problem the user submitted to, from the user's UserSolveStatus rows """
+    if not user_id:
+        return {}
+    rows = UserSolveStatus.objects.filter(user_id=user_id).values_list('problem_id', 'is_solved')
+    return {
+        problem_id: SOLVE_STATUS_SOLVED if is_solved else SOLVE_STATUS_ATTEMPTED
+        for problem_id, is_solved in rows
+    }
+
+def get_cached_solve_status_map(user_id):
+    """ Solve status map of a user, cached until the user's next submission """
+    if not user_id:
+        return {}
+    cache_key = generate_solve_status_cache_key(user_id)
+    solve_status_map = cache.get(cache_key)
+    if solve_status_map is None:
+        solve_status_map = get_solve_status_map(user_id)
+        cache.set(cache_key, solve_status_map, timeout=jitter_timeout(600))
+    return solve_status_map
+
+def overlay_solve_status(catalog, solve_status_map):
+    """ Serialized problem list with the user's solve status merged in """
+    if not solve_status_map:
+        return catalog
+    return [
+        {**problem, 'solve_status': solve_status_map.get(problem['id'], SOLVE_STATUS_UNSOLVED)}
+        for problem in catalog
+    ]
+
 class ProblemSerializer(serializers.ModelSerializer):
     categories = serializers.ListField(
         child=serializers.CharField(),  # Ensure each item in the list is a string
@@ -93,40 +136,46 @@ class ProblemSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         categories_list = validated_data.pop('categories', [])
-        validated_data['categories'] = ','.join(categories_list)
-        return super().create(validated_data)
+        problem = super().create(validated_data)
+        self.set_categories(problem, categories_list)
+        return problem
 
     def update(self, instance, validated_data):
-        categories_list = validated_data.pop('categories', [])
-        validated_data['categories'] = ','.join(categories_list)
-        return super().update(instance, validated_data)
+        categories_list = validated_data.pop('categories', None)
+        problem = super().update(instance, validated_data)
+        if categories_list is not None:
+            self.set_categories(problem, categories_list)
+        return problem
+
+    @staticmethod
+    def set_categories(problem, categories_list):
+        # Unknown category names are created, as any name was accepted before
+        categories = [
+            Category.objects.get_or_create(category_name=name.strip())[0]
+            for name in dict.fromkeys(categories_list) if name.strip()
+        ]
+        problem.categories.set(categories)
+        problem.invalidate_cache(problem.pk)
 
     def get_solve_status(self, obj):
         user_id = self.context.get('user_id')
         
         if not user_id:
-            return '풀이 미완'
+            return SOLVE_STATUS_UNSOLVED
 
-        submissions = Submission.objects.filter(user_id=user_id, problem_id=obj.id)
+        # Computed once for the whole list (shared by every child of a many=True serializer)
+        solve_status_map = self.context.get('solve_status_map')
+        if solve_status_map is None:
+            solve_status_map = self.context['solve_status_map'] = get_solve_status_map(user_id)
 
-        if not submissions.exists():
-            return '풀이 미완'
-
-        solved_submission = submissions.filter(final_result='SOLVED')
-        if solved_submission.exists():
-            return '풀이 완료'
-
-        return '풀이 중'
+        return solve_status_map.get(obj.id, SOLVE_STATUS_UNSOLVED)
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
 
-        # Ensure categories are included
-        if hasattr(instance, 'categories'):
-            categories_string = instance.categories
-            representation['categories'] = categories_string.split(',') if categories_string else []
-        else:
-            representation['categories'] = []
+        # Ensure categories are included (as names, like before the relation was normalized)
+        # Sorted by name : the relation has no order, and the cached lists must not change between rebuilds
+        representation['categories'] = sorted(category.category_name for category in instance.categories.all())
         
         request_method = self.context.get('request').method if 'request' in self.context else None
         if request_method == 'GET':
@@ -169,7 +218,14 @@ class EditorialSerializer(serializers.ModelSerializer):
         model = Editorial
         fields = '__all__'
 
+TESTCASE_RESULT_FIELDS = ('testcase_id', 'submission_result', 'run_time', 'memory')
+
+def format_measure(value):
+    # 15.0 -> "15", 0.1 -> "0.1" : the strings the comma-joined columns used to hold
+    return str(int(value)) if float(value).is_integer() else str(value)
+
 class SubmissionDetailSerializer(serializers.ModelSerializer):
+    # The testcase results are exchanged as parallel lists and stored one row per testcase
     testcase_id = serializers.ListField(
         child=serializers.CharField(),  # Ensure each item in the list is a string
         write_only=True                 # This is to accept input as a list
@@ -179,79 +235,62 @@ class SubmissionDetailSerializer(serializers.ModelSerializer):
         write_only=True                 # This is to accept input as a list
     )
     run_time = serializers.ListField(
-        child=serializers.CharField(),  # Ensure each item in the list is a string
-        write_only=True                 # This is to accept input as a list
+        child=serializers.FloatField(),
+        write_only=True
     )
     memory = serializers.ListField(
-        child=serializers.CharField(),  # Ensure each item in the list is a string
-        write_only=True                 # This is to accept input as a list
+        child=serializers.FloatField(),
+        write_only=True
     )
 
     class Meta:
         model = SubmissionDetail
         fields = '__all__'
 
+    def validate(self, data):
+        lengths = {len(data[field]) for field in TESTCASE_RESULT_FIELDS if field in data}
+        if len(lengths) > 1:
+            raise serializers.ValidationError("testcase_id, submission_result, run_time and memory must have the same length.")
+        # A partial update completes the given lists with the stored rows, so it cannot change their number
+        if lengths and self.instance is not None and not all(field in data for field in TESTCASE_RESULT_FIELDS):
+            if lengths != {self.instance.testcase_results.count()}:
+                raise serializers.ValidationError("A partial update of the testcase results must keep the number of testcases.")
+        return data
+
+    @staticmethod
+    def pop_testcase_results(validated_data, instance=None):
+        """ Rows of the given lists, completed with the current rows of `instance` (partial update) """
+        columns = {field: validated_data.pop(field) for field in TESTCASE_RESULT_FIELDS if field in validated_data}
+        if not columns:
+            return None
+        if instance is not None and len(columns) < len(TESTCASE_RESULT_FIELDS):
+            current = list(instance.testcase_results.values_list(*TESTCASE_RESULT_FIELDS))
+            for index, field in enumerate(TESTCASE_RESULT_FIELDS):
+                if field not in columns:
+                    columns[field] = [row[index] for row in current]
+        return list(zip(*(columns[field] for field in TESTCASE_RESULT_FIELDS)))
+
     def create(self, validated_data):
-        # testcase_id
-        testcase_id_list = validated_data.pop('testcase_id', [])
-        validated_data['testcase_id'] = ','.join(testcase_id_list)
-        # submission_result
-        submission_result_list = validated_data.pop('submission_result', [])
-        validated_data['submission_result'] = ','.join(submission_result_list)
-        # run_time
-        run_time_list = validated_data.pop('run_time', [])
-        validated_data['run_time'] = ','.join(run_time_list)
-        # memory
-        memory_list = validated_data.pop('memory', [])
-        validated_data['memory'] = ','.join(memory_list)
-        return super().create(validated_data)
+        rows = self.pop_testcase_results(validated_data)
+        submission_detail = super().create(validated_data)
+        submission_detail.add_testcase_results(rows or [])
+        return submission_detail
 
     def update(self, instance, validated_data):
-        # testcase_id
-        testcase_id_list = validated_data.pop('testcase_id', [])
-        validated_data['testcase_id'] = ','.join(testcase_id_list)
-        # submission_result
-        submission_result_list = validated_data.pop('submission_result', [])
-        validated_data['submission_result'] = ','.join(submission_result_list)
-        # run_time
-        run_time_list = validated_data.pop('run_time', [])
-        validated_data['run_time'] = ','.join(run_time_list)
-        # memory
-        memory_list = validated_data.pop('memory_id', [])
-        validated_data['memory'] = ','.join(memory_list)
-        return super().update(instance, validated_data)
+        rows = self.pop_testcase_results(validated_data, instance)
+        instance = super().update(instance, validated_data)
+        if rows is not None:
+            instance.set_testcase_results(rows)
+        return instance
 
     def to_representation(self, instance):
-        # Convert comma-separated strings back to lists for the API response
+        # Rebuild the parallel lists of the API response from the testcase rows
         representation = super().to_representation(instance)
-        # testcase_id
-        if hasattr(instance, 'testcase_id'):
-            testcase_id_string = instance.testcase_id
-            representation['testcase_id'] = testcase_id_string.split(',') if testcase_id_string else []
-        else:
-            representation['testcase_id'] = []
-        
-        # submission_result
-        if hasattr(instance, 'submission_result'):
-            submission_result_string = instance.submission_result
-            representation['submission_result'] = submission_result_string.split(',') if submission_result_string else []
-        else:
-            representation['submission_result'] = []
-        
-        # run_time
-        if hasattr(instance, 'run_time'):
-            run_time_string = instance.run_time
-            representation['run_time'] = run_time_string.split(',') if run_time_string else []
-        else:
-            representation['run_time'] = []
-        
-        # memory
-        if hasattr(instance, 'memory'):
-            memory_string = instance.memory
-            representation['memory'] = memory_string.split(',') if memory_string else []
-        else:
-            representation['memory'] = []
-        
+        results = instance.testcase_results.all()
+        representation['testcase_id'] = [result.testcase_id for result in results]
+        representation['submission_result'] = [result.submission_result for result in results]
+        representation['run_time'] = [format_measure(result.run_time) for result in results]
+        representation['memory'] = [format_measure(result.memory) for result in results]
         return representation
 
 
@@ -0,0 +1,33 @@
+"""
+Keeps AccessTokenIndex and the cached token lookups in step with SocialToken, whichever code path
+saves it (auth views, allauth's own login flow, admin, shell). Queryset update() / bulk writes bypass
+these signals : re-index such rows with AccessTokenIndex.index_token.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from allauth.socialaccount.models import SocialToken
+from .models import AccessTokenIndex
+from .authentications import invalidate_social_token
+
+
+@receiver(pre_save, sender=SocialToken)
+def remember_previous_token(sender, instance, **kwargs):
+    # The replaced access token must stop resolving once the new one is saved
+    instance._previous_token = None
+    if instance.pk:
+        instance._previous_token = SocialToken.objects.filter(pk=instance.pk).values_list('token', flat=True).first()
+
+
+@receiver(post_save, sender=SocialToken)
+def index_social_token(sender, instance, **kwargs):
+    if instance.token:
+        AccessTokenIndex.index_token(instance)
+    else:
+        AccessTokenIndex.objects.filter(social_token_id=instance).delete()
+    invalidate_social_token(getattr(instance, '_previous_token', None), instance.token)
+
+
+@receiver(post_delete, sender=SocialToken)
+def forget_social_token(sender, instance, **kwargs):
+    # The index row goes with the SocialToken (on_delete=CASCADE), only the cached lookups are left
+    invalidate_social_token(instance.token)
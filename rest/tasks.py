@@ -1,9 +1,14 @@
 from celery import shared_task
 from .models import *
 from .serializers import *
-from django.db.models import F
-from .code_judge_for_task.Judger import SubmissionDriver, Compiler, Judger
+from django.db import transaction, IntegrityError
+from django.core.cache import cache
+from django.conf import settings
+from .utils import generate_judge_result_cache_key
+from .code_judge_for_task.Judger import SubmissionDriver, Compiler, Judger, RESULT_SKIPPED
+from .code_judge_for_task.build_cache import build_cache_stats
 from .code_judge_for_task.config import lang_config, RUN_BASE_DIR, TESTCASE_BASE_DIR
+from .judge_events import publish_judge_event, EVENT_TESTCASE, EVENT_SUMMARY
 import logging
 
 logger = logging.getLogger('rest')
@@ -16,8 +21,83 @@ SUBMISSION_RESULT = {
     3: "MEMORY_LIMIT_EXCEEDED",
     4: "RUNTIME_ERROR",
     5: "SYSTEM_ERROR",
+    6: "SKIPPED",
 }
 
+JUDGE_RESULT_CACHE_TTL = getattr(settings, "JUDGE_RESULT_CACHE_TTL", 60 * 60)  # seconds
+
+def store_judge_result(task_id, record):
+    """ Final, immutable result of a submit task, read by code_judge_task_status """
+    if task_id:
+        cache.set(generate_judge_result_cache_key(task_id), record, JUDGE_RESULT_CACHE_TTL)
+
+def finish_judge_task(task_id, record, summary):
+    """
+    Stores the final result, then closes the event stream with the summary event : an SSE client
+    never gets a verdict that code_judge_task_status cannot serve yet
+    """
+    store_judge_result(task_id, record)
+    publish_judge_event(task_id, EVENT_SUMMARY, summary)
+
+def submission_response_data(submission, submission_detail_response, judge_stats=None):
+    """ Result of a judged submission, as served by code_judge_task_status """
+    return {
+        'submission_id': submission.id,
+        'final_result': submission.final_result,
+        'solution': submission.submitted_code,
+        'passed_num': submission.passed_num,
+        'total_num': submission.total_num,
+        'avg_run_time': submission.avg_run_time,
+        'avg_memory': submission.avg_memory,
+        'submission_detail': submission_detail_response,
+        'submitted_at': submission.submitted_at,
+        'judge_stats': judge_stats,
+    }
+
+def stored_submission_response_data(submission):
+    """
+    submission_response_data rebuilt from the stored rows (re-delivered task, expired result record).
+    Program outputs and judge statistics are not persisted : user_out is empty and judge_stats None.
+    """
+    submission_detail_response = [
+        {
+            'testcase_id': row.testcase_id,
+            'result_info': {
+                'run_result': row.submission_result,
+                'is_solved': row.submission_result == SUBMISSION_RESULT[-2],
+                'run_time': row.run_time,
+                'memory': row.memory,
+                'user_out': "",
+            }
+        }
+        for row in SubmissionTestcaseResult.objects.filter(submission_detail_id=submission.id).order_by('order')
+    ]
+    return submission_response_data(submission, submission_detail_response)
+
+def _stored_submission_response(task_id, submission):
+    """ Response of a submission persisted by an earlier delivery of the same task """
+    logger.info("Submission for task ID %s already exists (ID: %s), skipping creation", task_id, submission.id)
+    response_data = stored_submission_response_data(submission)
+    finish_judge_task(task_id, {'status': 'SUCCESS', 'data': response_data}, {
+        'status': 'SUCCESS',
+        'submission_id': submission.id,
+        'final_result': submission.final_result,
+        'passed_num': submission.passed_num,
+        'total_num': submission.total_num,
+    })
+    return response_data
+
+def _testcase_event(result):
+    """ Per-testcase verdict pushed to the judge event stream """
+    result_code = -2 if result['result'] == 0 else result['result']
+    return {
+        'testcase': result['testcase'],
+        'run_result': SUBMISSION_RESULT.get(result_code, ""),
+        'is_solved': result.get('is_solved', False),
+        'run_time': result['cpu_time'],
+        'memory': result['memory'],
+    }
+
 @shared_task(bind=True)
 def do_judge_for_task(
     self,
@@ -28,10 +108,17 @@ def do_judge_for_task(
     max_cpu_time,
     max_real_time,
     max_memory,
+    stop_on_failure=False,
+    publish_summary=True,
     ):
+    """
+    Judges the code against every testcase and returns (results, compile_error_msg, judge_stats).
+    The summary event that closes the event stream is sent here for a run task. A submit task chains
+    create_submission_and_response_for_task, which sends it once the submission is stored (publish_summary=False).
+    """
     try:
-        logger.debug(f'Task {self.name} with ID {self.request.id} is running - Task Re-run Count : {self.request.retries}')
-        logger.info(f"Judgement process initiated for language: {language}, testcase_dir_name: {testcase_dir_name}")
+        logger.debug('Task %s with ID %s is running - Task Re-run Count : %s', self.name, self.request.id, self.request.retries)
+        logger.info("Judgement process initiated for language: %s, testcase_dir_name: %s", language, testcase_dir_name)
 
         language_config = lang_config[language]
 
@@ -46,7 +133,7 @@ def do_judge_for_task(
                 main_src_path = os.path.join(submission_dir, language_config["run"]["exe_name"])
                 user_src_path = os.path.join(submission_dir, language_config["run"]["solution_name"])
 
-            logger.debug(f"Main source path: {main_src_path}, User source path: {user_src_path}")
+            logger.debug("Main source path: %s, User source path: %s", main_src_path, user_src_path)
 
             # Prepare user and main code
             try:
@@ -56,9 +143,9 @@ def do_judge_for_task(
                     f.write(user_code)
                     if language == "js":
                         f.write(r"""module.exports = { solution };""")
-                logger.debug(f"User code and main code written to respective paths")
+                logger.debug("User code and main code written to respective paths")
             except IOError as io_error:
-                logger.error(f"Failed to write code files: {str(io_error)}", exc_info=True)
+                logger.error("Failed to write code files: %s", io_error, exc_info=True)
                 raise
 
             # Compile phase
@@ -71,14 +158,16 @@ def do_judge_for_task(
                 else:  # JS case
                     exe_path = main_src_path
 
-                logger.info(f"Compilation process completed. Executable path: {exe_path}")
+                logger.info("Compilation process completed. Executable path: %s", exe_path)
             except Exception as e:
-                logger.error(f"Compilation failed: {str(e)}", exc_info=True)
+                logger.error("Compilation failed: %s", e, exc_info=True)
                 raise
 
             if compile_error_msg or (language != "java" and not os.path.exists(exe_path)):
-                logger.warning(f"Compilation error or executable not found for language: {language}, error: {compile_error_msg}")
-                return None, compile_error_msg
+                logger.warning("Compilation error or executable not found for language: %s, error: %s", language, compile_error_msg)
+                if publish_summary:
+                    publish_judge_event(self.request.id, EVENT_SUMMARY, {'status': 'COMPILE_ERROR', 'err_msg': compile_error_msg})
+                return None, compile_error_msg, None
 
             # Code Judgement Execution
             judge_client = Judger(
@@ -90,21 +179,41 @@ def do_judge_for_task(
                 testcase_dir=testcase_dir,
                 submission_dir=submission_dir
             )
-            logger.info(f"Judgement client initialized for execution.")
-            results = judge_client.run()
+            logger.info("Judgement client initialized for execution.")
+            results = judge_client.run(
+                on_result=lambda result: publish_judge_event(self.request.id, EVENT_TESTCASE, _testcase_event(result)),
+                stop_on_failure=stop_on_failure,
+            )
 
-        logger.info(f"Judgement execution completed with results.")
-        return results, compile_error_msg
+        logger.info("Judgement execution completed with results. Schedule stats: %s, build cache: %s", judge_client.stats, build_cache_stats())
+        if publish_summary:
+            publish_judge_event(self.request.id, EVENT_SUMMARY, {
+                'status': 'SUCCESS',
+                'passed_num': sum(1 for result in results if result.get('is_solved')),
+                'total_num': len(results),
+                'judge_stats': judge_client.stats,
+            })
+        return results, compile_error_msg, judge_client.stats
 
     except Exception as e:
-        logger.error(f"Task failed: {str(e)}", exc_info=True)
+        logger.error("Task failed: %s", e, exc_info=True)
+        if self.request.retries >= 3:  # Last attempt: close the event stream
+            publish_judge_event(self.request.id, EVENT_SUMMARY, {'status': 'FAILURE', 'detail': str(e)})
         raise self.retry(exc=e, countdown=5, max_retries=3)  # Retry the task up to 3 times with a 5-second delay
 
 
 @shared_task
-def create_submission_and_response_for_task(**kwargs):
+def create_submission_and_response_for_task(judge_output=None, **kwargs):
+    """
+    Persists a judged submission. Chained after do_judge_for_task, whose (results, compile_error_msg, judge_stats)
+    arrives as `judge_output`. Runs once per `task_id`: a re-delivered task returns the stored submission.
+    """
+    task_id = kwargs.get('task_id')
     try:
-        logger.info(f"Creating submission record for user: {kwargs.get('user_id')} and problem: {kwargs.get('problem_id')}")
+        logger.info("Creating submission record for user: %s and problem: %s", kwargs.get('user_id'), kwargs.get('problem_id'))
+
+        if judge_output is not None:
+            kwargs['judge_result'], kwargs['compile_error_msg'], kwargs['judge_stats'] = judge_output
 
         # Parameters
         user = User.objects.get(id=kwargs.get('user_id'))
@@ -112,24 +221,25 @@ def create_submission_and_response_for_task(**kwargs):
         language = Language.objects.get(id=kwargs.get('language_id'))
         judge_result = kwargs.get('judge_result')
         compile_error_msg = kwargs.get('compile_error_msg')
+        judge_stats = kwargs.get('judge_stats')
         user_code = kwargs.get('user_code')
-        
-        """
-        Create Submission Record
-        """
-        submission = Submission.objects.create(
-            user_id=user,
-            problem_id=problem,
-            language_id=language,
-            submitted_code=user_code
-        )
-        submission_id = submission.id
-        logger.debug(f"Submission record created with ID: {submission_id}")
-        
-        testcase_ids = []
-        submission_results = []
-        run_times = []
-        memories = []
+
+        # Compile error : nothing to persist
+        if not judge_result:
+            logger.warning("Compile error during judgement execution for task ID %s: %s", task_id, compile_error_msg)
+            finish_judge_task(task_id, {
+                'status': 'SUCCESS',
+                'data': {'run_result': 'COMPILE_ERROR', 'err_msg': compile_error_msg},
+            }, {'status': 'COMPILE_ERROR', 'err_msg': compile_error_msg})
+            return None
+
+        # Already persisted by an earlier delivery of this task
+        if task_id:
+            existing = Submission.objects.filter(task_id=task_id).first()
+            if existing is not None:
+                return _stored_submission_response(task_id, existing)
+
+        testcase_rows = []                  # (testcase_id, result, run_time, memory) per testcase
         submission_detail_response = []     # Response Data
         passed_num = 0                      # Solved Problem Number
         total_num = len(judge_result)      # Total Problem Number
@@ -137,6 +247,7 @@ def create_submission_and_response_for_task(**kwargs):
         problem_is_solved = True
         avg_run_time = 0
         avg_memory = 0
+        judged_num = 0                      # Testcases actually judged (not SKIPPED)
 
         """
         Organize Submission & SubmissionDetail
@@ -147,7 +258,7 @@ def create_submission_and_response_for_task(**kwargs):
             testcase_result = SUBMISSION_RESULT.get(result['result'], "")
             testcase_id = result['testcase']
             if not testcase_result:
-                logger.error(f"[Organize Submission] Unexpected Submission result - {testcase_id} testcase result : {testcase_result}")
+                logger.error("[Organize Submission] Unexpected Submission result - %s testcase result : %s", testcase_id, testcase_result)
                 raise ValueError(f'[Organize Submission] Unexpected Submission result - {testcase_id} testcase result : {testcase_result}')
 
             submission_detail = {
@@ -161,6 +272,13 @@ def create_submission_and_response_for_task(**kwargs):
                 }
             }
 
+            # Skipped testcases (stop on failure) are reported but not judged
+            if result['result'] == RESULT_SKIPPED:
+                testcase_rows.append((testcase_id, testcase_result, result['cpu_time'], result['memory']))
+                submission_detail_response.append(submission_detail)
+                continue
+
+            judged_num += 1
             avg_run_time += result['cpu_time']
             avg_memory += result['memory']
 
@@ -173,107 +291,92 @@ def create_submission_and_response_for_task(**kwargs):
             if final_result < result['result']:
                 final_result = result['result']
 
-            # DB -> Append values to the lists
-            testcase_ids.append(testcase_id)
-            submission_results.append(testcase_result)
-            run_times.append(str(result['cpu_time']))
-            memories.append(str(result['memory']))
+            # DB -> One row per testcase
+            testcase_rows.append((testcase_id, testcase_result, result['cpu_time'], result['memory']))
 
             submission_detail_response.append(submission_detail)
 
         """
         Post-processing
         """
-        if len(judge_result):
-            avg_run_time //= len(judge_result)
-            avg_memory //= len(judge_result)
+        if judged_num:
+            avg_run_time //= judged_num
+            avg_memory //= judged_num
         else:
             avg_run_time = 0
             avg_memory = 0
 
-        testcase_ids = ','.join(testcase_ids)
-        submission_results = ','.join(submission_results)
-        run_times = ','.join(run_times)
-        memories = ','.join(memories)
-
-        """
-        Create SubmissionDetail Record
-        """
-        SubmissionDetail.objects.create(
-            submission_id=submission,
-            testcase_id=testcase_ids,
-            submission_result=submission_results,
-            run_time=run_times,
-            memory=memories
-        )
-        logger.debug(f"SubmissionDetail record created for submission ID: {submission_id}")
-
-        """
-        Update Submission Record
-        """
-        submission.passed_num = passed_num
-        submission.total_num = total_num
         submission_result = SUBMISSION_RESULT.get(final_result, "")
-        submission.avg_run_time = avg_run_time
-        submission.avg_memory = avg_memory
-
-        if submission_result:
-            submission.final_result = submission_result
-        else:
-            logger.error(f"[Update Submission Record] Unexpected Submission result -> {final_result}")
-            raise ValueError(f'[Update Submission Record] Unexpected Submission result -> {final_result}')
-        
-        submission.save()
-        logger.info(f"Submission record updated with final results for submission ID: {submission_id}")
-        
-        submissions_a = Submission.objects.filter(problem_id=problem, user_id=user).order_by('-submitted_at')
-        serializer = SubmissionSerializer(submissions_a, many=True, context={'exclude_submission_detail': True})
-        
-        if len(serializer.data) == 1:
-            problem.attempt_number = F('attempt_number') + 1
-        
-        # Problem Solved
-        if final_result == -2:
-            solved_num = 0
-            for i in serializer.data:
-                if i['final_result'] == "SOLVED":
-                    solved_num += 1
-            if solved_num == 1:
-                problem.solve_number = F('solve_number') + 1
-
-        problem.save()
-        logger.info(f"Problem record updated for problem ID: {problem.id}")
+        if not submission_result:
+            logger.error("[Create Submission Record] Unexpected Submission result -> %s", final_result)
+            raise ValueError(f'[Create Submission Record] Unexpected Submission result -> {final_result}')
 
         """
-        Compose response data with the code judgement execution result
+        Create Submission & SubmissionDetail Records
+        The submission is inserted complete, and every row of it is written in one transaction.
+        A concurrent delivery of the same task loses on the unique task_id and returns the stored submission.
         """
-        response_data = {
-            'submission_id': submission_id,
-            'final_result': submission_result,
-            'solution': user_code,
-            'passed_num': passed_num,
-            'total_num': total_num,
-            'avg_run_time': avg_run_time,
-            'avg_memory': avg_memory,
-            'submission_detail': submission_detail_response,
-            'submitted_at': submission.submitted_at,
-        }
+        try:
+            with transaction.atomic():
+                submission = Submission.objects.create(
+                    user_id=user,
+                    problem_id=problem,
+                    language_id=language,
+                    submitted_code=user_code,
+                    task_id=task_id,
+                    final_result=submission_result,
+                    passed_num=passed_num,
+                    total_num=total_num,
+                    avg_run_time=avg_run_time,
+                    avg_memory=avg_memory
+                )
+                submission_id = submission.id
+                submission_detail_record = SubmissionDetail.objects.create(submission_id=submission)
+                submission_detail_record.add_testcase_results(testcase_rows)
+
+                UserSolveStatus.record_judged_submission(user, problem, final_result == -2)
+
+                """
+                Compose response data with the code judgement execution result
+                """
+                response_data = submission_response_data(submission, submission_detail_response, judge_stats)
+                # Published only once the rows are committed (never for a rolled back submission)
+                transaction.on_commit(lambda: finish_judge_task(task_id, {'status': 'SUCCESS', 'data': response_data}, {
+                    'status': 'SUCCESS',
+                    'submission_id': submission_id,
+                    'final_result': submission_result,
+                    'passed_num': passed_num,
+                    'total_num': total_num,
+                    'judge_stats': judge_stats,
+                }))
+        except IntegrityError:
+            existing = Submission.objects.filter(task_id=task_id).first() if task_id else None
+            if existing is None:
+                raise
+            return _stored_submission_response(task_id, existing)
 
-        logger.info(f"Submission response data composed successfully for submission ID: {submission_id}")
+        logger.info("Submission record created with final results, ID: %s", submission_id)
         return response_data
 
     except User.DoesNotExist:
-        logger.error(f"User with ID {kwargs.get('user')} not found")
-        raise ValueError(f"User with ID {kwargs.get('user')} not found")
+        logger.error("User with ID %s not found", kwargs.get('user'))
+        detail = f"User with ID {kwargs.get('user')} not found"
+        finish_judge_task(task_id, {'status': 'FAILURE', 'detail': detail}, {'status': 'FAILURE', 'detail': detail})
+        raise ValueError(detail)
     
     except Problem.DoesNotExist:
-        logger.error(f"Problem with ID {kwargs.get('problem')} not found")
-        raise ValueError(f"Problem with ID {kwargs.get('problem')} not found")
+        logger.error("Problem with ID %s not found", kwargs.get('problem'))
+        detail = f"Problem with ID {kwargs.get('problem')} not found"
+        finish_judge_task(task_id, {'status': 'FAILURE', 'detail': detail}, {'status': 'FAILURE', 'detail': detail})
+        raise ValueError(detail)
 
     except Language.DoesNotExist:
-        logger.error(f"Language with ID {kwargs.get('language')} not found")
-        raise ValueError(f"Language with ID {kwargs.get('language')} not found")
+        logger.error("Language with ID %s not found", kwargs.get('language'))
+        detail = f"Language with ID {kwargs.get('language')} not found"
+        finish_judge_task(task_id, {'status': 'FAILURE', 'detail': detail}, {'status': 'FAILURE', 'detail': detail})
+        raise ValueError(detail)
 
     except Exception as e:
-        logger.error(f"Submission creation failed: {str(e)}", exc_info=True)
+        logger.error("Submission creation failed: %s", e, exc_info=True)
+        finish_judge_task(task_id, {'status': 'FAILURE', 'detail': f"Submission creation failed: {str(e)}"}, {'status': 'FAILURE', 'detail': str(e)})
         raise ValueError(f"Submission creation failed: {str(e)}")
\ No newline at end of file
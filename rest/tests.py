@@ -1,14 +1,55 @@
-from rest_framework.test import APITestCase
+import os
+import json
+import time
+import hashlib
+import zipfile
+import tempfile
+import threading
+import collections
+import requests
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from pathlib import Path
+from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, RequestFactory, override_settings
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.core.cache import cache
+from django.utils import timezone
+from datetime import timedelta
+from allauth.socialaccount.models import SocialApp, SocialAccount, SocialToken
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
-from .models import User, Problem, Language, Submission, SubmissionDetail
-from .serializers import SubmissionSerializer, SubmissionDetailSerializer
+from .models import User, Problem, Category, Language, Submission, SubmissionDetail, SubmissionTestcaseResult, UserSolveStatus, AccessTokenIndex
+from .authentications import SocialTokenAuthentication, resolve_social_token, _local_token_cache
+from .utils import generate_social_token_cache_key, hash_access_token, redact_access_token, generate_problem_cache_key, get_or_rebuild_cache, bump_cache_version, problem_cache_namespace
+from .serializers import SubmissionSerializer, SubmissionDetailSerializer, ProblemSerializer, get_solve_status_map, SOLVE_STATUS_SOLVED, SOLVE_STATUS_ATTEMPTED
+from .kakao_client import KakaoClient
+from .views.zip_extraction import install_testcases, remove_testcases, calculate_md5
+from .views.code_judge.checkers import ExactChecker, TokenChecker, FloatChecker, tokenize
+from .views.code_judge.output_stream import OutputStream, RStripMD5
+from .views.code_judge.build_cache import BuildCache
+from .views.code_judge import Judger as judger_module, pool as judge_pool_module
+from .views.code_judge.testcase_cache import TestcaseManifestCache
+from .judge_events import EVENT_TESTCASE, EVENT_SUMMARY
+from . import tasks, utils
+from .middleware import DomainCheckMiddleware, extract_domain, is_allowed_domain
+from django.http import HttpResponse
+from .views import problem_views
+from .views.category_views import CategoryView
 
 class SubmissionBasicViewTests(APITestCase):
     def setUp(self):
         # Create test users, problems, and languages
         self.user = User.objects.create_user(username='testuser', email='testuser@example.com', password='testpass')
-        self.problem = Problem.objects.create(title="Sample Problem", categories="Math, Addition", level=2)
+        self.problem = Problem.objects.create(title="Sample Problem", level=2)
+        self.problem.categories.set([
+            Category.objects.create(category_name="Math"),
+            Category.objects.create(category_name="Addition"),
+        ])
         self.language = Language.objects.create(language="python")
 
         # Create initial submission for GET method testing
@@ -21,13 +62,8 @@ class SubmissionBasicViewTests(APITestCase):
             passed_num=1,
             total_num=1
         )
-        self.submission_detail = SubmissionDetail.objects.create(
-            submission_id=self.submission,
-            testcase_id='1',
-            submission_result='SOLVED',
-            run_time='0.1',
-            memory='256'
-        )
+        self.submission_detail = SubmissionDetail.objects.create(submission_id=self.submission)
+        self.submission_detail.add_testcase_results([('1', 'SOLVED', 0.1, 256)])
 
         # URLs for testing
         self.url = reverse('submission-basic')
@@ -42,6 +78,41 @@ class SubmissionBasicViewTests(APITestCase):
         self.assertEqual(len(response.data['data']), 1)
         self.assertEqual(response.data['data'][0]['final_result'], 'SOLVED')
 
+    def test_get_submissions_paginated(self):
+        # Add a second submission so that a page_size of 1 leaves a next page
+        Submission.objects.create(
+            user_id=self.user,
+            problem_id=self.problem,
+            language_id=self.language,
+            final_result='WRONG',
+            submitted_code='print(1+2)',
+            passed_num=0,
+            total_num=1
+        )
+
+        # Send GET request for the first page (most recent first)
+        response = self.client.get(self.url, {'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertEqual(response.data['data'][0]['final_result'], 'WRONG')
+        self.assertIsNotNone(response.data['next'])
+
+        # Follow the cursor to the second (last) page
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertEqual(response.data['data'][0]['final_result'], 'SOLVED')
+        self.assertIsNone(response.data['next'])
+
+    def test_get_submissions_invalid_sort(self):
+        # Send GET request with an unknown sort option
+        response = self.client.get(self.url, {'sort': 'unknown'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
     def test_post_submission_success(self):
         # Prepare data for POST request
         post_data = {
@@ -68,6 +139,33 @@ class SubmissionBasicViewTests(APITestCase):
         self.assertIn('data', response.data)
         self.assertEqual(response.data['data']['final_result'], 'SOLVED')
         self.assertEqual(response.data['data']['submission_detail']['testcase_id'], ['1'])
+        self.assertEqual(response.data['data']['submission_detail']['run_time'], ['0.2'])
+        self.assertEqual(response.data['data']['submission_detail']['memory'], ['128'])
+        self.assertEqual(SubmissionTestcaseResult.objects.filter(submission_detail_id=response.data['data']['id']).count(), 1)
+
+    def test_post_submission_fail_testcase_results_length_mismatch(self):
+        post_data = {
+            'user_id': self.user.id,
+            'problem_id': self.problem.id,
+            'language_id': self.language.id,
+            'final_result': 'SOLVED',
+            'submitted_code': 'print(2+2)',
+            'passed_num': 1,
+            'total_num': 2,
+            'submission_detail': {
+                'testcase_id': ['1', '2'],
+                'submission_result': ['SOLVED'],
+                'run_time': ['0.2', '0.3'],
+                'memory': ['128', '128']
+            }
+        }
+
+        response = self.client.post(self.url, data=post_data, format='json')
+
+        # The submission created before the detail validation is deleted again
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+        self.assertEqual(Submission.objects.count(), 1)
 
     def test_post_submission_fail_user_does_not_exist(self):
         # Prepare data with a non-existent user_id
@@ -129,10 +227,980 @@ class SubmissionBasicViewTests(APITestCase):
         self.assertIn('error', response.data)
         self.assertIn('Language with id 9999 does not exist', response.data['detail'])
 
+    def test_record_submission_counts_first_attempt_and_first_solve_once(self):
+        # WRONG, SOLVED, SOLVED : only the first submission is a first attempt, only the second a first solve
+        self.assertEqual(UserSolveStatus.record_submission(self.user, self.problem, False), (True, False))
+        self.assertEqual(UserSolveStatus.record_submission(self.user, self.problem, True), (False, True))
+        self.assertEqual(UserSolveStatus.record_submission(self.user, self.problem, True), (False, False))
+
+        solve_status = UserSolveStatus.objects.get(user_id=self.user, problem_id=self.problem)
+        self.assertEqual(solve_status.attempt_count, 3)
+        self.assertTrue(solve_status.is_solved)
+        self.assertIsNotNone(solve_status.first_solved_at)
+
+    def test_record_judged_submission_counts_the_problem_once(self):
+        UserSolveStatus.record_judged_submission(self.user, self.problem, False)
+        UserSolveStatus.record_judged_submission(self.user, self.problem, True)
+        UserSolveStatus.record_judged_submission(self.user, self.problem, True)
+
+        self.problem.refresh_from_db()
+        self.assertEqual((self.problem.attempt_number, self.problem.solve_number), (1, 1))
+
+    def test_solve_status_map_comes_from_solve_status_rows(self):
+        other_problem = Problem.objects.create(title="Other Problem", level=1)
+        UserSolveStatus.record_submission(self.user, self.problem, True)
+        UserSolveStatus.record_submission(self.user, other_problem, False)
+
+        # One query on the user's UserSolveStatus rows, whatever the size of the submission history
+        with self.assertNumQueries(1):
+            solve_status_map = get_solve_status_map(self.user.id)
+        self.assertEqual(solve_status_map, {self.problem.id: SOLVE_STATUS_SOLVED, other_problem.id: SOLVE_STATUS_ATTEMPTED})
+
     def tearDown(self):
         # Clean up created data
         self.submission_detail.delete()
         self.submission.delete()
         self.language.delete()
         self.problem.delete()
-        self.user.delete()
\ No newline at end of file
+        self.user.delete()
+
+
+class ProblemListPaginationTests(APITestCase):
+    def setUp(self):
+        # Five problems tied on level 2 between a level 1 and a level 3 one
+        self.problems = [Problem.objects.create(title=f"Problem {index}", level=level) for index, level in enumerate([2, 3, 2, 2, 1, 2, 2])]
+        self.url = reverse('problem-list')
+
+    def test_level_sort_pages_across_ties(self):
+        expected = [problem.id for problem in sorted(self.problems, key=lambda problem: (problem.level, problem.id))]
+
+        seen = []
+        response = self.client.get(self.url, {'sort': 'level', 'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['data']), 2)
+            seen += [problem['id'] for problem in response.data['data']]
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+
+        # Every problem exactly once, in (level, id) order
+        self.assertEqual(seen, expected)
+
+
+class KakaoClientTests(SimpleTestCase):
+    """ KakaoClient against a local stub of the Kakao endpoints """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        hits = cls.hits = collections.Counter()
+
+        class StubKakaoHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def reply(self, status_code, body):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status_code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                hits[('GET', path)] += 1
+                if path == '/v2/user/me' and hits[('GET', path)] == 1:
+                    return self.reply(503, {'msg': 'temporarily unavailable'})
+                if path == '/slow':
+                    time.sleep(1)
+                return self.reply(200, {'id': 1, 'kakao_account': {'email': 'kakao@example.com'}})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                hits[('POST', urlsplit(self.path).path)] += 1
+                return self.reply(503, {'msg': 'temporarily unavailable'})
+
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubKakaoHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.kakao_client = KakaoClient(auth_base_url=base_url, api_base_url=base_url, timeout=0.3, retries=2, backoff=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_get_is_retried_on_server_error(self):
+        response = self.kakao_client.get(self.kakao_client.api_url('/v2/user/me'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['kakao_account']['email'], 'kakao@example.com')
+        self.assertEqual(self.hits[('GET', '/v2/user/me')], 2)
+
+    def test_post_is_not_retried(self):
+        response = self.kakao_client.post(self.kakao_client.auth_url('/oauth/token'), data={'grant_type': 'refresh_token'})
+
+        # The 503 is handed back to the caller after a single attempt
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.hits[('POST', '/oauth/token')], 1)
+
+    def test_slow_endpoint_is_bounded_by_the_timeout(self):
+        started = time.monotonic()
+        with self.assertRaises(requests.RequestException):
+            self.kakao_client.get(self.kakao_client.api_url('/slow'))
+        self.assertLess(time.monotonic() - started, 3)
+
+
+class CheckerTests(SimpleTestCase):
+    """ Answer checkers, fed with small chunks so that every token / marker boundary gets crossed """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def check(self, checker, answer, expected, chunk_size=3):
+        testcase_info = {
+            'output_path': self.write('1.out', expected),
+            'stripped_output_md5': hashlib.md5(expected.strip()).hexdigest(),
+        }
+        chunks = [answer[i:i + chunk_size] for i in range(0, len(answer), chunk_size)]
+        return checker.check(chunks, testcase_info, {'testcase': '1'}, self.tmp_dir.name, self.tmp_dir.name)
+
+    def test_tokenize_joins_tokens_cut_between_chunks(self):
+        self.assertEqual(list(tokenize([b'12', b'34 5', b'6\n', b'  7'])), [b'1234', b'56', b'7'])
+        self.assertEqual(list(tokenize([b'ab ', b' cd', b''])), [b'ab', b'cd'])
+        self.assertEqual(list(tokenize([b' \n', b'\t'])), [])
+
+    def test_exact_checker_ignores_trailing_whitespace_only(self):
+        self.assertTrue(self.check(ExactChecker(), b'1 2\n3  \n\n', b'1 2\n3\n'))
+        self.assertFalse(self.check(ExactChecker(), b'1  2\n3\n', b'1 2\n3\n'))
+
+    def test_token_checker_ignores_spacing(self):
+        self.assertTrue(self.check(TokenChecker(), b'1   2\n\n3', b'1 2 3\n'))
+        self.assertFalse(self.check(TokenChecker(), b'1 2', b'1 2 3\n'))
+        self.assertFalse(self.check(TokenChecker(), b'1 2 3 4', b'1 2 3\n'))
+        self.assertFalse(self.check(TokenChecker(), b'1 23', b'12 3\n'))
+
+    def test_float_checker_accepts_values_within_error(self):
+        checker = FloatChecker(abs_error=1e-3, rel_error=1e-3)
+        self.assertTrue(self.check(checker, b'3.1416 2000.9', b'3.14159 2000\n'))
+        self.assertFalse(self.check(checker, b'3.15 2000', b'3.14159 2000\n'))
+        self.assertFalse(self.check(checker, b'nan', b'0\n'))
+        self.assertTrue(self.check(checker, b'YES 1.0', b'YES 1\n'))
+        self.assertFalse(self.check(checker, b'NO 1.0', b'YES 1\n'))
+
+
+class OutputStreamTests(SimpleTestCase):
+    """ OutputStream + RStripMD5 must give the verdicts of the former whole-file read """
+    OUTPUTS = [
+        b'',
+        b'no marker at all\n',
+        b'[!return]:42',
+        b'debug line\n[!return]:1 2 3  \n\n',
+        b'stdout\n[!return]:  leading\n\n  inner  \n\t\n',
+        b'a[!retu[!return]:x [!return]:y\n',
+        b'[!return]:' + b' \n' * 10 + b'end' + b' ' * 10,
+    ]
+
+    @staticmethod
+    def legacy_md5(content):
+        # Answer hash of the judge before streaming : whole file decoded, cut at the marker, rstripped
+        content_str = content.decode('utf-8', errors='backslashreplace')
+        return_index = content_str.find("[!return]:")
+        content_relevant = content_str[return_index + len("[!return]:"):].rstrip() if return_index != -1 else ""
+        return hashlib.md5(content_relevant.encode('utf-8')).hexdigest(), content_str[:return_index]
+
+    def test_streamed_md5_matches_whole_file_md5(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, '1.out')
+            for content in self.OUTPUTS:
+                with open(path, 'wb') as f:
+                    f.write(content)
+                for chunk_size in (1, 2, 3, 7, 64 * 1024):
+                    with self.subTest(content=content, chunk_size=chunk_size):
+                        output = OutputStream(path, chunk_size=chunk_size)
+                        output_hash = RStripMD5()
+                        for chunk in output:
+                            output_hash.update(chunk)
+                        legacy_md5, legacy_stdout = self.legacy_md5(content)
+                        self.assertEqual(output_hash.hexdigest(), legacy_md5)
+                        if output.found_marker:
+                            self.assertEqual(output.stdout, legacy_stdout)
+
+    def test_previews_are_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, '1.out')
+            with open(path, 'wb') as f:
+                f.write(b'x' * 100 + b'[!return]:' + b'y' * 100)
+            output = OutputStream(path, preview_size=10, chunk_size=8)
+            self.assertEqual(b''.join(output), b'y' * 100)
+            self.assertEqual(output.stdout, 'x' * 10)
+            self.assertEqual(output.answer, 'y' * 10)
+
+
+class InstallTestcasesTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.extract_path = Path(self.tmp_dir.name) / 'sample_problem_submit'
+
+    def upload(self, files):
+        path = os.path.join(self.tmp_dir.name, 'upload.zip')
+        with zipfile.ZipFile(path, 'w') as zip_ref:
+            for name, content in files.items():
+                zip_ref.writestr(name, content)
+        with open(path, 'rb') as f:
+            return SimpleUploadedFile('testcase.zip', f.read())
+
+    def versions(self):
+        """ Hidden entries next to the testcase directory : version directories only, no staging leftovers """
+        return sorted(name for name in os.listdir(self.tmp_dir.name) if name.startswith('.'))
+
+    def test_replace_swaps_in_the_new_testcases(self):
+        install_testcases(self.upload({'1.in': '1', '1.out': '1', '2.in': '2', '2.out': '2'}), self.extract_path)
+        data = install_testcases(self.upload({'1.in': '3', '1.out': '9\n'}), self.extract_path, 'token', replace=True)
+
+        self.assertEqual(data['testcase_number'], 1)
+        self.assertEqual(sorted(os.listdir(self.extract_path)), ['1.in', '1.out', 'info.json'])
+        self.assertEqual(data['testcases']['1']['stripped_output_md5'], calculate_md5(self.extract_path / '1.out', strip=True))
+        self.assertEqual(len(self.versions()), 2)  # Current + the replaced one, still readable by running judges
+
+    def test_invalid_checker_leaves_current_testcases_untouched(self):
+        install_testcases(self.upload({'1.in': '1', '1.out': '1'}), self.extract_path)
+        with open(self.extract_path / 'info.json') as f:
+            info = json.load(f)
+
+        for checker_type, extra in (('special', {}), ('float', {'abs_error': 'x'}), ('unknown', {})):
+            with self.subTest(checker=checker_type), self.assertRaises(ValueError):
+                install_testcases(self.upload({'1.in': '2', '1.out': '2'}), self.extract_path, checker_type, replace=True, **extra)
+
+        with open(self.extract_path / 'info.json') as f:
+            self.assertEqual(json.load(f), info)
+        with open(self.extract_path / '1.out') as f:
+            self.assertEqual(f.read(), '1')
+        self.assertEqual(self.versions(), [os.readlink(self.extract_path)])  # Failed versions are removed
+
+    def test_swap_replaces_the_link_and_keeps_the_previous_version(self):
+        install_testcases(self.upload({'1.in': '1', '1.out': '1'}), self.extract_path)
+        first_version = self.extract_path.resolve()
+        install_testcases(self.upload({'1.in': '2', '1.out': '2'}), self.extract_path, replace=True)
+
+        # A judge that resolved the first version before the swap keeps reading it
+        self.assertTrue(self.extract_path.is_symlink())
+        self.assertNotEqual(self.extract_path.resolve(), first_version)
+        with open(first_version / '1.out') as f:
+            self.assertEqual(f.read(), '1')
+
+        install_testcases(self.upload({'1.in': '3', '1.out': '3'}), self.extract_path, replace=True)
+        self.assertFalse(first_version.exists())
+        self.assertEqual(len(self.versions()), 2)
+
+    def test_plain_directory_of_an_older_install_is_converted(self):
+        self.extract_path.mkdir()
+        (self.extract_path / '1.in').write_text('1')
+        (self.extract_path / '1.out').write_text('1')
+
+        data = install_testcases(self.upload({'2.in': '2', '2.out': '2'}), self.extract_path)
+
+        self.assertTrue(self.extract_path.is_symlink())
+        self.assertEqual(data['testcase_number'], 2)
+
+    def test_remove_testcases_removes_every_version(self):
+        install_testcases(self.upload({'1.in': '1', '1.out': '1'}), self.extract_path)
+        install_testcases(self.upload({'1.in': '2', '1.out': '2'}), self.extract_path, replace=True)
+
+        remove_testcases(self.extract_path)
+        self.assertFalse(os.path.lexists(self.extract_path))
+        self.assertEqual(self.versions(), [])
+
+
+class JudgeTaskEventTests(SimpleTestCase):
+    """ Events published by do_judge_for_task, with the sandbox replaced by stubs """
+    RESULTS = [
+        {'testcase': '1', 'result': 0, 'is_solved': True, 'cpu_time': 1, 'memory': 10},
+        {'testcase': '2', 'result': 0, 'is_solved': False, 'cpu_time': 2, 'memory': 20},
+    ]
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.exe_path = os.path.join(tmp_dir.name, 'main.py')
+        with open(self.exe_path, 'w') as f:
+            f.write('')
+
+        driver = mock.patch.object(tasks, 'SubmissionDriver')
+        self.addCleanup(driver.stop)
+        driver.start().return_value.__enter__.return_value = (tmp_dir.name, tmp_dir.name)
+        compiler = mock.patch.object(tasks, 'Compiler')
+        self.addCleanup(compiler.stop)
+        self.compile = compiler.start().return_value.compile
+        self.compile.return_value = (self.exe_path, '')
+        judger = mock.patch.object(tasks, 'Judger')
+        self.addCleanup(judger.stop)
+        self.judge_client = judger.start().return_value
+        self.judge_client.stats = {'testcase_num': 2}
+
+        def run(on_result=None, stop_on_failure=False):
+            for result in self.RESULTS:
+                on_result(dict(result))
+            return [dict(result) for result in self.RESULTS]
+        self.judge_client.run.side_effect = run
+
+        publish = mock.patch.object(tasks, 'publish_judge_event')
+        self.addCleanup(publish.stop)
+        self.publish = publish.start()
+
+    def judge(self, **kwargs):
+        return tasks.do_judge_for_task.apply(args=('python', 'main', 'solution', 'problem_run', 1000, 2000, 1024), kwargs=kwargs, task_id='task-1').get()
+
+    def events(self):
+        return [(call.args[1], call.args[2]) for call in self.publish.call_args_list]
+
+    def test_run_task_closes_the_stream_with_a_summary(self):
+        self.judge()
+
+        events = self.events()
+        self.assertEqual([event for event, _ in events], [EVENT_TESTCASE, EVENT_TESTCASE, EVENT_SUMMARY])
+        self.assertEqual(events[-1][1]['status'], 'SUCCESS')
+        self.assertEqual((events[-1][1]['passed_num'], events[-1][1]['total_num']), (1, 2))
+        self.assertTrue(all(call.args[0] == 'task-1' for call in self.publish.call_args_list))
+
+    def test_run_task_compile_error_closes_the_stream(self):
+        self.compile.return_value = ('', 'SyntaxError')
+
+        self.assertEqual(self.judge()[1], 'SyntaxError')
+        self.assertEqual(self.events(), [(EVENT_SUMMARY, {'status': 'COMPILE_ERROR', 'err_msg': 'SyntaxError'})])
+
+    def test_submit_task_leaves_the_summary_to_the_submission_task(self):
+        self.judge(publish_summary=False)
+        self.assertEqual([event for event, _ in self.events()], [EVENT_TESTCASE, EVENT_TESTCASE])
+
+        self.publish.reset_mock()
+        self.compile.return_value = ('', 'SyntaxError')
+        self.judge(publish_summary=False)
+        self.assertEqual(self.events(), [])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SocialTokenResolutionTests(TestCase):
+    """ Access token lookups : in-process LRU -> cache -> AccessTokenIndex, kept in step by the SocialToken signals """
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kakaouser', email='kakao@example.com', password='testpass')
+        app = SocialApp.objects.create(provider='kakao', name='kakao', client_id='client', secret='secret')
+        self.social_token = SocialToken.objects.create(
+            app=app,
+            account=SocialAccount.objects.create(user=self.user, provider='kakao', uid='1'),
+            token='access-1',
+            token_secret='refresh-1',
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+    def tearDown(self):
+        for token in ('access-1', 'access-2', 'unknown'):
+            _local_token_cache.delete(generate_social_token_cache_key(token))
+
+    def authenticate(self, token):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return SocialTokenAuthentication().authenticate(request)
+
+    def test_token_saved_outside_the_auth_views_is_indexed(self):
+        # Created through the ORM only (allauth, admin, shell ...) : the signal indexed it
+        self.assertTrue(AccessTokenIndex.objects.filter(social_token_id=self.social_token).exists())
+        user, resolved = self.authenticate('access-1')
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(resolved.token_id, self.social_token.pk)
+
+    def test_hit_is_served_by_the_caches(self):
+        resolve_social_token('access-1')
+
+        # In-process LRU : no query at all
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_social_token('access-1').user_id, self.user.pk)
+
+        # Shared cache : the User row only, no index lookup
+        _local_token_cache.delete(generate_social_token_cache_key('access-1'))
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_social_token('access-1').user_id, self.user.pk)
+
+    def test_miss(self):
+        self.assertIsNone(resolve_social_token('unknown'))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('unknown')
+
+    def test_refresh_replaces_the_cached_token(self):
+        resolve_social_token('access-1')  # Cached in both layers
+
+        self.social_token.token = 'access-2'
+        self.social_token.save()
+
+        self.assertIsNone(resolve_social_token('access-1'))
+        self.assertEqual(resolve_social_token('access-2').token_id, self.social_token.pk)
+
+    def test_logout_expires_the_cached_token(self):
+        self.assertFalse(resolve_social_token('access-1').is_expired())
+
+        self.social_token.expires_at = timezone.now() - timedelta(days=1)
+        self.social_token.save()
+
+        self.assertTrue(resolve_social_token('access-1').is_expired())
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('access-1')
+
+    def test_deleted_token_no_longer_resolves(self):
+        resolve_social_token('access-1')
+        self.social_token.delete()
+
+        self.assertIsNone(resolve_social_token('access-1'))
+        self.assertFalse(AccessTokenIndex.objects.exists())
+
+
+class RedactAccessTokenTests(SimpleTestCase):
+    def test_logs_a_hash_prefix_only(self):
+        redacted = redact_access_token('secret-access-token')
+        self.assertNotIn('secret', redacted)
+        self.assertTrue(hash_access_token('secret-access-token').startswith(redacted))
+        self.assertEqual(redact_access_token(''), '-')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class GetOrRebuildCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.rebuild = mock.Mock(return_value={'title': 'rebuilt'})
+
+    def test_miss_rebuilds_once_then_hits(self):
+        key = generate_problem_cache_key(1)
+        self.assertEqual(get_or_rebuild_cache(key, self.rebuild, 600), ({'title': 'rebuilt'}, False))
+        self.assertEqual(get_or_rebuild_cache(key, self.rebuild, 600), ({'title': 'rebuilt'}, True))
+        self.rebuild.assert_called_once()
+        self.assertIsNone(cache.get(f"lock_{key}"))
+
+    def test_concurrent_miss_serves_the_stale_value(self):
+        key = generate_problem_cache_key(1)
+        get_or_rebuild_cache(key, self.rebuild, 600)
+        cache.delete(key)  # Fresh copy expired, same generation
+        cache.add(f"lock_{key}", 1)  # Another request is rebuilding
+
+        self.assertEqual(get_or_rebuild_cache(key, mock.Mock(), 600), ({'title': 'rebuilt'}, True))
+
+    def test_invalidation_never_serves_the_previous_generation(self):
+        get_or_rebuild_cache(generate_problem_cache_key(1), mock.Mock(return_value={'title': 'old'}), 600)
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_cache_version(problem_cache_namespace(1))
+        key = generate_problem_cache_key(1)
+        cache.add(f"lock_{key}", 1)
+
+        # Nothing of this generation to serve : waits for the rebuild, then computes it itself
+        with mock.patch.object(utils, 'CACHE_REBUILD_WAIT', 0.1):
+            self.assertEqual(get_or_rebuild_cache(key, self.rebuild, 600), ({'title': 'rebuilt'}, False))
+
+    def test_concurrent_miss_waits_for_the_rebuild(self):
+        key = generate_problem_cache_key(1)
+        cache.add(f"lock_{key}", 1)
+        rebuilding = threading.Timer(0.1, cache.set, args=(key, {'title': 'concurrent'}))
+        rebuilding.start()
+        self.addCleanup(rebuilding.cancel)
+
+        self.assertEqual(get_or_rebuild_cache(key, self.rebuild, 600), ({'title': 'concurrent'}, True))
+        self.rebuild.assert_not_called()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SubmitTaskResultTests(TestCase):
+    """ create_submission_and_response_for_task and the result served by code_judge_task_status """
+    JUDGE_OUTPUT = (
+        [
+            {'testcase': '1', 'result': 0, 'is_solved': True, 'cpu_time': 10, 'memory': 100, 'output': '3'},
+            {'testcase': '2', 'result': -1, 'is_solved': False, 'cpu_time': 20, 'memory': 200, 'output': '4'},
+        ],
+        '',
+        {'testcase_num': 2},
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', email='testuser@example.com', password='testpass')
+        self.problem = Problem.objects.create(title="Sample Problem", level=2)
+        self.language = Language.objects.create(language="python")
+        publish = mock.patch.object(tasks, 'publish_judge_event')
+        self.addCleanup(publish.stop)
+        publish.start()
+
+    def create_submission(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return tasks.create_submission_and_response_for_task(
+                self.JUDGE_OUTPUT, user_id=self.user.id, problem_id=self.problem.id,
+                language_id=self.language.id, user_code='print(3)', task_id='task-1',
+            )
+
+    def task_status(self, state='SUCCESS'):
+        request = APIRequestFactory().post('/?submit_type=submit')
+        with mock.patch.object(problem_views, 'AsyncResult') as async_result:
+            async_result.return_value.state = state
+            return problem_views.code_judge_task_status(request, task_id='task-1')
+
+    def test_redelivered_task_returns_the_stored_submission(self):
+        first = self.create_submission()
+        second = self.create_submission()
+
+        self.assertEqual(Submission.objects.filter(task_id='task-1').count(), 1)
+        self.assertEqual(second['submission_id'], first['submission_id'])
+        self.assertEqual(second.keys(), first.keys())
+
+    def test_concurrent_delivery_loses_on_the_unique_task_id(self):
+        first = self.create_submission()
+        filter_submissions = Submission.objects.filter
+
+        # The concurrent delivery did not see the row yet : its insert raises IntegrityError
+        lookups = []
+        def filter_missing_once(*args, **kwargs):
+            lookups.append(kwargs)
+            return Submission.objects.none() if len(lookups) == 1 else filter_submissions(*args, **kwargs)
+
+        with mock.patch.object(Submission.objects, 'filter', side_effect=filter_missing_once):
+            second = self.create_submission()
+
+        self.assertEqual(len(lookups), 2)
+        self.assertEqual(Submission.objects.filter(task_id='task-1').count(), 1)
+        self.assertEqual(second['submission_id'], first['submission_id'])
+
+    def test_status_serves_the_stored_record(self):
+        data = self.create_submission()
+
+        response = self.task_status()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['submission_detail'], data['submission_detail'])
+
+    def test_status_rebuilds_an_expired_record_in_the_same_shape(self):
+        data = self.create_submission()
+        cache.clear()
+
+        rebuilt = self.task_status().data['data']
+        self.assertEqual(rebuilt.keys(), data.keys())
+        self.assertEqual(rebuilt['final_result'], 'WRONG')
+        self.assertEqual(
+            [(row['testcase_id'], row['result_info']['run_result'], row['result_info']['is_solved']) for row in rebuilt['submission_detail']],
+            [('1', 'SOLVED', True), ('2', 'WRONG', False)],
+        )
+        self.assertIsNone(rebuilt['judge_stats'])
+
+    def test_status_is_pending_until_the_submission_is_stored(self):
+        response = self.task_status()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'PENDING')
+
+
+class BuildCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        self.cache = BuildCache(os.path.join(self.root, 'cache'), max_size=2500)
+
+    def build(self, name, size=1000):
+        """ Output dir holding one compiled artifact of `size` bytes """
+        output_dir = os.path.join(self.root, name)
+        os.makedirs(output_dir)
+        with open(os.path.join(output_dir, 'Main'), 'wb') as f:
+            f.write(name.encode().ljust(size, b'\0'))
+        return output_dir
+
+    def test_miss_then_hit(self):
+        self.assertFalse(self.cache.get('key', os.path.join(self.root, 'first')))
+        self.cache.put('key', self.build('built'), ['Main'])
+
+        output_dir = os.path.join(self.root, 'second')
+        self.assertTrue(self.cache.get('key', output_dir))
+        with open(os.path.join(output_dir, 'Main'), 'rb') as f:
+            self.assertTrue(f.read().startswith(b'built'))
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1})
+
+    def test_key_changes_with_the_compiler_binary(self):
+        compiler = os.path.join(self.root, 'gcc')
+        source = os.path.join(self.root, 'main.c')
+        for path in (compiler, source):
+            with open(path, 'w') as f:
+                f.write('')
+        compile_config = {'compile_command': f'{compiler} {{src_path}} -o {{exe_path}}', 'src_name': 'main.c', 'exe_name': 'main'}
+
+        key = BuildCache.build_key(compile_config, source)
+        self.assertEqual(BuildCache.build_key(compile_config, source), key)
+        os.utime(compiler, ns=(0, 0))  # Compiler upgraded in place
+        self.assertNotEqual(BuildCache.build_key(compile_config, source), key)
+
+    def test_evicts_the_least_recently_used_entry(self):
+        self.cache.put('a', self.build('a'), ['Main'])
+        self.cache.put('b', self.build('b'), ['Main'])
+        os.utime(os.path.join(self.cache.cache_dir, 'a'), (1, 1))
+        os.utime(os.path.join(self.cache.cache_dir, 'b'), (2, 2))
+        self.assertTrue(self.cache.get('a', os.path.join(self.root, 'hit')))  # 'a' is used again, 'b' is now the oldest
+
+        self.cache.put('c', self.build('c'), ['Main'])  # Over max_size
+
+        self.assertEqual(sorted(os.listdir(self.cache.cache_dir)), ['a', 'c'])
+
+    def test_concurrent_insert_of_one_key(self):
+        output_dir = self.build('built')
+        barrier = threading.Barrier(8)
+
+        def put():
+            barrier.wait()
+            self.cache.put('key', output_dir, ['Main'])
+
+        threads = [threading.Thread(target=put) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # One published entry, no staging directory left behind
+        self.assertEqual(os.listdir(self.cache.cache_dir), ['key'])
+        self.assertEqual(os.listdir(os.path.join(self.cache.cache_dir, 'key')), ['Main'])
+
+
+@override_settings(DOMAIN_CHECK_ALLOWED_DOMAINS=['cote.nossi.dev'])
+class DomainCheckMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.middleware = DomainCheckMiddleware(lambda request: HttpResponse('ok'))
+        is_allowed_domain.cache_clear()
+
+    def request(self, **headers):
+        return self.middleware(RequestFactory().get('/api/problems/', HTTP_USER_AGENT='Mozilla/5.0', **headers))
+
+    def test_extract_domain(self):
+        self.assertEqual(extract_domain('https://cote.nossi.dev'), 'cote.nossi.dev')
+        self.assertEqual(extract_domain('https://cote.nossi.dev/problems/1?tab=2#top'), 'cote.nossi.dev')
+        self.assertEqual(extract_domain('http://localhost:3000?next=//evil.com'), 'localhost:3000')
+        self.assertEqual(extract_domain('null'), '')
+
+    def test_allowed_and_denied_origins(self):
+        self.assertEqual(self.request(HTTP_ORIGIN='https://cote.nossi.dev').status_code, 200)
+        self.assertEqual(self.request(HTTP_REFERER='https://cote.nossi.dev/problems/1').status_code, 200)
+        self.assertEqual(self.request(HTTP_ORIGIN='https://evil.com').status_code, 403)
+        self.assertEqual(self.request(HTTP_ORIGIN='https://cote.nossi.dev', HTTP_USER_AGENT='curl/8.0').status_code, 403)
+
+    def test_decision_is_cached_per_domain(self):
+        for problem_id in range(50):
+            self.request(HTTP_REFERER=f'https://cote.nossi.dev/problems/{problem_id}?tab=solution')
+        self.assertEqual(is_allowed_domain.cache_info().currsize, 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CategoryRelationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.problem = self.create_problem("Sample Problem", [' Math', 'Graph', 'DP', 'Math', ''])
+
+    def create_problem(self, title, categories):
+        serializer = ProblemSerializer(data={'title': title, 'level': 2, 'categories': categories})
+        serializer.is_valid(raise_exception=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            return serializer.save()
+
+    def test_names_are_linked_once_and_listed_by_name(self):
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(ProblemSerializer(self.problem).data['categories'], ['DP', 'Graph', 'Math'])
+
+        serializer = ProblemSerializer(self.problem, data={'categories': ['Tree', 'DP']}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertEqual(ProblemSerializer(Problem.objects.get(pk=self.problem.pk)).data['categories'], ['DP', 'Tree'])
+
+    def test_category_list_counts_problems(self):
+        self.create_problem("Other Problem", ['Math'])
+
+        response = CategoryView.as_view()(APIRequestFactory().get('/'))
+        counts = {category['category_name']: category['problem_count'] for category in response.data['data']}
+        self.assertEqual(counts, {'DP': 1, 'Graph': 1, 'Math': 2})
+
+    def test_category_detail(self):
+        category = Category.objects.get(category_name='Math')
+
+        response = CategoryView.as_view()(APIRequestFactory().get('/'), category_id=category.id)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['problem_count'], 1)
+        self.assertEqual(CategoryView.as_view()(APIRequestFactory().get('/'), category_id=9999).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_renaming_a_category_invalidates_the_cached_problem(self):
+        version = utils.get_cache_version(problem_cache_namespace(self.problem.id))
+        category = Category.objects.get(category_name='Graph')
+        category.category_name = 'Graphs'
+        with self.captureOnCommitCallbacks(execute=True):
+            category.save()
+        self.assertGreater(utils.get_cache_version(problem_cache_namespace(self.problem.id)), version)
+
+
+class CategoryMigrationTests(TransactionTestCase):
+    """ 0020 : comma separated Problem.categories -> Category rows linked through ProblemCategory """
+    before = [('rest', '0019_submission_task_id')]
+    after = [('rest', '0020_problemcategory_alter_problem_categories')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_categories_text_is_split_into_the_relation(self):
+        apps = self.migrate(self.before)
+        Problem = apps.get_model('rest', 'Problem')
+        Problem.objects.create(title="Sample Problem", categories=" Math, DP,Math,")
+        Problem.objects.create(title="No Category", categories="")
+
+        apps = self.migrate(self.after)
+        ProblemCategory = apps.get_model('rest', 'ProblemCategory')
+        names = list(
+            ProblemCategory.objects.filter(problem_id__title="Sample Problem")
+            .order_by('id').values_list('category_id__category_name', flat=True)
+        )
+        self.assertEqual(names, ['Math', 'DP'])
+        self.assertFalse(ProblemCategory.objects.filter(problem_id__title="No Category").exists())
+
+        # And back : the text is rebuilt in the original order
+        apps = self.migrate(self.before)
+        self.assertEqual(apps.get_model('rest', 'Problem').objects.get(title="Sample Problem").categories, "Math,DP")
+
+
+class StubJudgePool:
+    """ JudgePool.apply_async with every task on its own thread instead of a worker process """
+    processes = 2
+
+    def __init__(self):
+        self.submitted = []
+
+    def apply_async(self, func, args=(), callback=None, error_callback=None):
+        self.submitted.append(args[1])
+
+        def work():
+            try:
+                result = func(*args)
+            except Exception as e:
+                error_callback(e)
+            else:
+                callback(result)
+        threading.Thread(target=work).start()
+
+
+class JudgerRunTests(SimpleTestCase):
+    """ Judger.run scheduling against a stub pool (no sandbox, no worker processes) """
+    TESTCASE_IDS = ['1', '2', '3', '10']
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.pool = StubJudgePool()
+        for name, value in (('get_judge_pool', lambda: self.pool),
+                            ('get_testcase_manifest', lambda testcase_dir: mock.Mock(testcase_dir=testcase_dir, info={
+                                'testcases': {testcase_id: {'input_path': f'{testcase_id}.in'} for testcase_id in self.TESTCASE_IDS},
+                            }))):
+            patcher = mock.patch.object(judger_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.kill_in_flight = judger_module.Judger._kill_in_flight
+        kill = mock.patch.object(judger_module.Judger, '_kill_in_flight')
+        self.kill = kill.start()
+        self.addCleanup(kill.stop)
+
+        self.judger = judger_module.Judger(
+            run_config={}, exe_path='main', max_cpu_time=1000, max_real_time=1000, max_memory=256 * 1024 * 1024,
+            testcase_dir=tmp_dir.name, submission_dir=tmp_dir.name,
+        )
+
+    def verdict(self, testcase_id, result=None):
+        result = judger_module.Cjudger.RESULT_SUCCESS if result is None else result
+        return {'testcase': testcase_id, 'result': result, 'cpu_time': 1, 'real_time': 1, 'memory': 1, 'is_solved': True}
+
+    def test_worker_error_waits_for_the_killed_testcases(self):
+        killed = threading.Event()
+        finished = []
+
+        def judge_one(testcase_id):
+            if testcase_id == '1':
+                raise RuntimeError("worker died")
+            killed.wait(5)  # Still running until _kill_in_flight
+            finished.append(testcase_id)
+            return self.verdict(testcase_id)
+        self.judger.judge_one = judge_one
+        self.kill.side_effect = killed.set
+
+        with self.assertRaises(RuntimeError):
+            self.judger.run()
+        # Nothing of this submission is left running once run() gives the workspace back
+        self.kill.assert_called_once()
+        self.assertEqual(finished, ['2'])
+        self.assertEqual(self.pool.submitted, ['1', '2'])
+
+    def test_results_come_back_in_testcase_order(self):
+        running, max_running = [0], [0]
+        lock = threading.Lock()
+
+        def judge_one(testcase_id):
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            time.sleep({'1': 0.05, '2': 0.01}.get(testcase_id, 0))  # '1' finishes after '2' and '3'
+            with lock:
+                running[0] -= 1
+            return self.verdict(testcase_id)
+        self.judger.judge_one = judge_one
+        streamed = []
+
+        results = self.judger.run(on_result=lambda result: streamed.append(result['testcase']))
+
+        self.assertEqual([result['testcase'] for result in results], ['1', '2', '3', '10'])  # Natural order, not '10' < '2'
+        self.assertEqual(sorted(streamed), sorted(self.TESTCASE_IDS))
+        self.assertLessEqual(max_running[0], self.pool.processes)
+        self.assertEqual(self.judger.stats['testcase_num'], 4)
+        self.kill.assert_not_called()
+
+    def test_stop_on_failure_skips_the_remaining_testcases(self):
+        killed = threading.Event()
+        self.kill.side_effect = killed.set
+
+        def judge_one(testcase_id):
+            if testcase_id == '2':
+                return self.verdict(testcase_id, judger_module.Cjudger.RESULT_WRONG_ANSWER)
+            if testcase_id != '1':
+                killed.wait(5)  # Killed with the submission
+            return self.verdict(testcase_id)
+        self.judger.judge_one = judge_one
+
+        results = self.judger.run(stop_on_failure=True)
+
+        self.assertEqual([result['result'] for result in results], [
+            judger_module.Cjudger.RESULT_SUCCESS, judger_module.Cjudger.RESULT_WRONG_ANSWER,
+            judger_module.RESULT_SKIPPED, judger_module.RESULT_SKIPPED,
+        ])
+        self.kill.assert_called_once()
+        self.assertNotIn('10', self.pool.submitted)
+        self.assertEqual(self.judger.stats['skipped_num'], 2)
+
+    def test_kill_in_flight_matches_whole_path_components(self):
+        def process(*cmdline):
+            child = mock.Mock()
+            child.cmdline.return_value = list(cmdline)
+            return child
+        submission_dir = self.judger.submission_dir
+        own = process('main', os.path.join(submission_dir, '1.out'))
+        sibling = process('main', submission_dir + '0' + os.sep + '1.out')  # .../1234-1 vs .../1234-10
+        gone = process()
+        gone.cmdline.side_effect = judger_module.psutil.NoSuchProcess(1)
+
+        with mock.patch.object(judger_module.psutil, 'Process') as current_process:
+            current_process.return_value.children.return_value = [own, sibling, gone]
+            self.kill_in_flight(self.judger)
+
+        own.kill.assert_called_once()
+        sibling.kill.assert_not_called()
+        gone.kill.assert_not_called()
+
+
+class JudgePoolTests(SimpleTestCase):
+    """ JudgePool bookkeeping, with multiprocessing.Pool replaced by mocks """
+    def setUp(self):
+        pool_class = mock.patch.object(judge_pool_module, 'Pool', side_effect=lambda **kwargs: mock.Mock())
+        self.pool_class = pool_class.start()
+        self.addCleanup(pool_class.stop)
+        self.judge_pool = judge_pool_module.JudgePool(processes=2, health_check_timeout=1, health_check_interval=60)
+
+    def test_busy_pool_is_healthy_while_tasks_complete(self):
+        self.judge_pool.apply_async(print)
+        self.assertTrue(self.judge_pool.health_check())
+        self.assertEqual(self.pool_class.call_count, 1)
+
+    def test_stalled_busy_pool_is_recycled(self):
+        self.judge_pool.apply_async(print)
+        old_pool = self.judge_pool.pool
+        self.judge_pool._last_progress -= 10  # No task answered for 10 s
+
+        self.assertFalse(self.judge_pool.health_check())
+        self.assertIsNot(self.judge_pool.pool, old_pool)
+        old_pool.close.assert_called_once()
+
+    def test_idle_pool_must_answer_a_ping(self):
+        self.judge_pool.pool.apply_async.return_value.get.return_value = 1234
+        self.assertTrue(self.judge_pool.health_check())
+
+        old_pool = self.judge_pool.pool
+        old_pool.apply_async.return_value.get.side_effect = judge_pool_module.TimeoutError
+        self.assertFalse(self.judge_pool.health_check())
+        self.assertIsNot(self.judge_pool.pool, old_pool)
+
+    def test_late_callback_of_a_replaced_pool_is_ignored(self):
+        callback = mock.Mock()
+        self.judge_pool.apply_async(print, callback=callback)
+        late_callback = self.judge_pool.pool.apply_async.call_args.kwargs['callback']
+        self.judge_pool.recycle()
+
+        late_callback('result')
+        callback.assert_called_once_with('result')
+        self.assertEqual(self.judge_pool._pending, 0)  # The new pool's count is untouched
+
+    def test_health_check_runs_in_the_background_once_due(self):
+        with mock.patch.object(self.judge_pool, 'health_check') as health_check:
+            self.judge_pool.check_health_if_due()  # Checked less than health_check_interval ago
+            health_check.assert_not_called()
+
+            self.judge_pool._last_health_check -= 60
+            with mock.patch.object(judge_pool_module.threading, 'Thread') as thread:
+                self.judge_pool.check_health_if_due()
+                self.judge_pool.check_health_if_due()  # Already running
+            thread.assert_called_once()
+            thread.call_args.kwargs['target']()
+            health_check.assert_called_once()
+
+
+class TestcaseManifestCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.root = tmp_dir.name
+        self.cache = TestcaseManifestCache(max_entries=2)
+
+    def write_info(self, name, testcase_ids):
+        testcase_dir = os.path.join(self.root, name)
+        os.makedirs(testcase_dir, exist_ok=True)
+        with open(os.path.join(testcase_dir, 'info.json'), 'w') as f:
+            json.dump({'testcases': {
+                testcase_id: {'input_name': f'{testcase_id}.in', 'output_name': f'{testcase_id}.out'}
+                for testcase_id in testcase_ids
+            }}, f)
+        return testcase_dir
+
+    def test_manifest_is_reused_until_info_json_changes(self):
+        testcase_dir = self.write_info('problem', ['1'])
+        manifest = self.cache.get(testcase_dir)
+        self.assertIs(self.cache.get(testcase_dir + os.sep), manifest)
+        self.assertEqual(manifest.info['testcases']['1']['input_path'], os.path.join(os.path.realpath(testcase_dir), '1.in'))
+
+        self.write_info('problem', ['1', '2'])  # Uploaded by another process
+        self.assertEqual(sorted(self.cache.get(testcase_dir).info['testcases']), ['1', '2'])
+
+    def test_invalidate_drops_the_entry(self):
+        testcase_dir = self.write_info('problem', ['1'])
+        manifest = self.cache.get(testcase_dir)
+        self.cache.invalidate(testcase_dir)
+        self.assertIsNot(self.cache.get(testcase_dir), manifest)
+
+    def test_least_recently_used_manifest_is_evicted(self):
+        first, second, third = (self.write_info(name, ['1']) for name in ('a', 'b', 'c'))
+        manifest = self.cache.get(first)
+        self.cache.get(second)
+        self.cache.get(first)   # 'b' is now the least recently used
+        self.cache.get(third)
+
+        self.assertIs(self.cache.get(first), manifest)
+        self.assertEqual(len(self.cache._manifests), 2)
+        self.assertNotIn(os.path.normpath(second), self.cache._manifests)
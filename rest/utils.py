@@ -1,15 +1,115 @@
+import time
+import random
 import hashlib
+from django.core.cache import cache
+from django.db import transaction
 
-def generate_problem_list_cache_key(user_id):
-    return f"problem_list_user_{user_id}" if user_id else "problem_list_anonymous"
+# Versioned cache keys : every key embeds the generation of its namespace.
+# Invalidation bumps the generation once the DB write has committed, so readers
+# switch to fresh keys and the old entries simply age out with their TTL.
+def _cache_version_key(namespace):
+    return f"cache_version_{namespace}"
 
-def generate_problem_cache_key(problem_id):
+def get_cache_version(namespace):
+    # A (re)created counter starts from the clock, never below a generation that was already used
+    return cache.get_or_set(_cache_version_key(namespace), lambda: time.time_ns() // 1000000, timeout=None)
+
+def bump_cache_version(*namespaces):
+    def bump():
+        for namespace in namespaces:
+            try:
+                cache.incr(_cache_version_key(namespace))
+            except ValueError:  # Counter evicted : the next read recreates it from the clock
+                pass
+    transaction.on_commit(bump)
+
+def problem_list_cache_namespace():
+    return "problem_list"
+
+def problem_cache_namespace(problem_id):
     return f"problem_{problem_id}"
 
-def generate_problem_meta_cache_key(problem_id):
+def problem_meta_cache_namespace(problem_id):
     return f"problem_meta_{problem_id}"
 
+def solve_status_cache_namespace(user_id):
+    return f"solve_status_user_{user_id}"
+
+CACHE_REBUILD_LOCK_TIMEOUT = 30    # seconds a rebuild may hold the lock
+CACHE_STALE_TIMEOUT_FACTOR = 6     # the last good value outlives its fresh key
+CACHE_REBUILD_WAIT = 2.0           # seconds to wait for another rebuild when there is no stale value
+CACHE_REBUILD_POLL_INTERVAL = 0.05
+
+def jitter_timeout(timeout, jitter=0.1):
+    # Keys cached at the same moment do not all expire at the same moment
+    return max(1, int(timeout * random.uniform(1 - jitter, 1 + jitter)))
+
+def get_or_rebuild_cache(key, rebuild, timeout):
+    """
+    Single-flight cache read of a versioned `key`. Returns (value, cached).
+    On a miss, only the caller that takes the rebuild lock runs `rebuild()`; the others serve the
+    last good value of the same generation meanwhile, or wait briefly for the rebuild when there is none.
+    The stale copy is keyed on `key` itself, so an invalidation (a new generation) never serves it.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value, True
+
+    lock_key = f"lock_{key}"
+    stale_key = f"stale_{key}"
+    locked = cache.add(lock_key, 1, CACHE_REBUILD_LOCK_TIMEOUT)
+    if not locked:
+        value = cache.get(stale_key)
+        if value is not None:
+            return value, True
+        deadline = time.monotonic() + CACHE_REBUILD_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(CACHE_REBUILD_POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                return value, True
+        # The rebuild is taking too long : compute it here rather than fail the request
+
+    try:
+        value = rebuild()
+        if value is not None:
+            cache.set(key, value, jitter_timeout(timeout))
+            cache.set(stale_key, value, timeout * CACHE_STALE_TIMEOUT_FACTOR)
+        return value, False
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+def generate_problem_list_cache_key():
+    return f"problem_list_v{get_cache_version(problem_list_cache_namespace())}"
+
+def generate_solve_status_cache_key(user_id):
+    return f"solve_status_user_{user_id}_v{get_cache_version(solve_status_cache_namespace(user_id))}"
+
+def generate_problem_cache_key(problem_id):
+    return f"problem_{problem_id}_v{get_cache_version(problem_cache_namespace(problem_id))}"
+
+def generate_problem_meta_cache_key(problem_id):
+    return f"problem_meta_{problem_id}_v{get_cache_version(problem_meta_cache_namespace(problem_id))}"
+
 def generate_submission_cache_key(user_id, problem_id, language_id, user_code):
     # Use a hash of the user code to generate a unique cache key
     code_hash = hashlib.sha256(user_code.encode('utf-8')).hexdigest()
-    return f"user_{user_id}_problem_{problem_id}_language_{language_id}_code_{code_hash}"
\ No newline at end of file
+    return f"user_{user_id}_problem_{problem_id}_language_{language_id}_code_{code_hash}"
+
+def hash_access_token(token):
+    # Fixed-length stand-in of an access token for cache keys and AccessTokenIndex lookups
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def redact_access_token(token):
+    # Log-safe stand-in of an access token : enough of its hash to correlate lines, never the token itself
+    return hash_access_token(token)[:8] if token else '-'
+
+def generate_social_token_cache_key(token):
+    return f"social_token_{hash_access_token(token)}"
+
+def generate_judge_events_cache_key(task_id):
+    return f"judge_events_{task_id}"
+
+def generate_judge_result_cache_key(task_id):
+    return f"judge_result_{task_id}"
@@ -14,6 +14,9 @@ from rest_framework.views import APIView
 from rest_framework import status
 from ..models import *
 from ..serializers import *
+from ..authentications import get_request_token, invalidate_social_token
+from ..utils import redact_access_token
+from ..kakao_client import get_kakao_client, KAKAO_AUTH_BASE_URL
 from allauth.socialaccount import signals
 from allauth.socialaccount.providers.kakao import views as kakao_view
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
@@ -48,7 +51,7 @@ class KakaoLogoutView(LogoutView):
     
 @api_view(['GET'])
 def kakao_login(request):
-    return redirect(f"https://kauth.kakao.com/oauth/authorize?client_id={settings.KAKAO_REST_API_KEY}&redirect_uri={settings.SOCIAL_LOGIN_REDIRECT_URI}&response_type=code")
+    return redirect(f"{KAKAO_AUTH_BASE_URL}/oauth/authorize?client_id={settings.KAKAO_REST_API_KEY}&redirect_uri={settings.SOCIAL_LOGIN_REDIRECT_URI}&response_type=code")
 
 
 @api_view(['GET', 'POST'])
@@ -62,8 +65,15 @@ def kakao_callback(request):
     Access Token Request
     """
     try:
-        token_req = requests.get(
-            f"https://kauth.kakao.com/oauth/token?grant_type=authorization_code&client_id={settings.KAKAO_REST_API_KEY}&redirect_uri={settings.SOCIAL_LOGIN_REDIRECT_URI}&code={code}")
+        kakao_client = get_kakao_client()
+        token_req = kakao_client.get(
+            kakao_client.auth_url("/oauth/token"),
+            params={
+                'grant_type': 'authorization_code',
+                'client_id': settings.KAKAO_REST_API_KEY,
+                'redirect_uri': settings.SOCIAL_LOGIN_REDIRECT_URI,
+                'code': code,
+            })
         token_req_json = token_req.json()
         access_token = token_req_json.get("access_token", "")
         error = token_req_json.get("error")
@@ -83,7 +93,7 @@ def kakao_callback(request):
             'rt_expires_in': timezone.now() + timedelta(seconds=token_req_json.get("refresh_token_expires_in", 0)),
         }
 
-        logger.debug(f"Token information retrieved: {token_info}")
+        logger.debug("Token information retrieved: access token %s, expires at %s", redact_access_token(access_token), token_info['at_expires_in'])
 
     except requests.RequestException as e:
         logger.error(f"Request to Kakao for token failed: {str(e)}", exc_info=True)
@@ -104,8 +114,9 @@ def kakao_callback(request):
 
     ### Kakao Profile Retrieval
     try:
-        profile_request = requests.get(
-            "https://kapi.kakao.com/v2/user/me",
+        kakao_client = get_kakao_client()
+        profile_request = kakao_client.get(
+            kakao_client.api_url("/v2/user/me"),
             headers={"Authorization": f"Bearer {access_token}"}
         )
 
@@ -144,7 +155,7 @@ def kakao_callback(request):
         logger.info(f"User found and authenticated: {user.id}")
 
         data = {'access_token': access_token, 'code': code}
-        accept = requests.post(
+        accept = get_kakao_client().post(
             f"{settings.KAKAO_LOGIN_FINALIZE_URI}", data=data)
         accept_status = accept.status_code
         if accept_status != 200:
@@ -215,7 +226,7 @@ def kakao_callback(request):
     except User.DoesNotExist:
         logger.info(f"User does not exist, proceeding with registration: {email}")
         data = {'access_token': access_token, 'code': code}
-        accept = requests.post(
+        accept = get_kakao_client().post(
             f"{settings.KAKAO_LOGIN_FINALIZE_URI}", data=data)
         accept_status = accept.status_code
         if accept_status != 200:
@@ -324,7 +335,8 @@ def kakao_refresh_token(request):
             status=status.HTTP_400_BAD_REQUEST)
 
         # Set up the request to the Kakao API
-        kakao_token_uri = "https://kauth.kakao.com/oauth/token"
+        kakao_client = get_kakao_client()
+        kakao_token_uri = kakao_client.auth_url("/oauth/token")
         request_data = {
             'grant_type': 'refresh_token',
             'client_id': settings.KAKAO_REST_API_KEY,
@@ -337,12 +349,12 @@ def kakao_refresh_token(request):
 
         # Send the request to the Kakao API to get new tokens
         try:
-            token_res = requests.post(
+            token_res = kakao_client.post(
                 kakao_token_uri,
                 data=request_data,
                 headers=token_headers
             )
-            logger.debug(f"Kakao API response status: {token_res.status_code}")
+            logger.debug("Kakao API response status: %s", token_res.status_code)
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to make request to Kakao API: {str(e)}", exc_info=True)
@@ -353,7 +365,7 @@ def kakao_refresh_token(request):
 
         # Check if the response is successful
         if token_res.status_code not in [200, 201]:
-            logger.error(f"Failed to refresh token, response from Kakao: {token_res.text}")
+            logger.error("Failed to refresh token, Kakao responded with status %s", token_res.status_code)
             return Response({
                 "error": "Kakao Refresh Token POST Fail",
                 "detail": f"Failed to refresh token: {token_res.text}"}, 
@@ -448,7 +460,7 @@ def kakao_refresh_token(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def kakao_direct_logout(request):
-    return redirect(f'https://kauth.kakao.com/oauth/logout?client_id={settings.KAKAO_REST_API_KEY}&logout_redirect_uri={settings.KAKAO_LOGOUT_REDIRECT_URI}')
+    return redirect(f'{KAKAO_AUTH_BASE_URL}/oauth/logout?client_id={settings.KAKAO_REST_API_KEY}&logout_redirect_uri={settings.KAKAO_LOGOUT_REDIRECT_URI}')
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -468,14 +480,15 @@ def kakao_logout(request):
             }, status=status.HTTP_401_UNAUTHORIZED)
 
         access_token = auth_header.split(' ')[1]
-        logger.debug(f"Access token extracted: {access_token}")
+        logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
         """
         Validate the Access Token
         """
-        kakao_verify_url = 'https://kapi.kakao.com/v1/user/access_token_info'
+        kakao_client = get_kakao_client()
+        kakao_verify_url = kakao_client.api_url('/v1/user/access_token_info')
         headers = {'Authorization': f'Bearer {access_token}'}
-        verify_response = requests.get(kakao_verify_url, headers=headers)
+        verify_response = kakao_client.get(kakao_verify_url, headers=headers)
 
         if verify_response.status_code != 200:
             logger.warning("Invalid or expired access token provided")
@@ -495,8 +508,8 @@ def kakao_logout(request):
         
         headers = {"Authorization": f'KakaoAK {settings.KAKAO_ADMIN_KEY}'}
         try:
-            response = requests.post(
-                'https://kapi.kakao.com/v1/user/logout',
+            response = kakao_client.post(
+                kakao_client.api_url('/v1/user/logout'),
                 data={
                     'target_id_type': 'user_id',
                     'target_id': kakao_uid
@@ -513,7 +526,7 @@ def kakao_logout(request):
             }, status=status.HTTP_502_BAD_GATEWAY)
 
         if response.status_code != 200:  # (Mostly) Bad Request 400
-            logger.error(f"Kakao API responded with an error: {response.json()}")
+            logger.error("Kakao API responded with an error: status %s", response.status_code)
             return Response({
                 'error': "Kakao Logout GET Fail",
                 'detail': response.json()
@@ -521,8 +534,11 @@ def kakao_logout(request):
             )
 
         try:
-            social_token = SocialToken.objects.get(token=access_token)
-            logger.debug(f"SocialToken found for user, proceeding to expire token: {social_token.account.user.id}")
+            resolved_token = get_request_token(request)
+            if resolved_token is None:
+                raise SocialToken.DoesNotExist
+            social_token = SocialToken.objects.select_related('account').get(pk=resolved_token.token_id)
+            logger.debug(f"SocialToken found for user, proceeding to expire token: {social_token.account.user_id}")
         except SocialToken.DoesNotExist:
             logger.warning("SocialToken does not exist or already expired")
             return Response({
@@ -587,8 +603,9 @@ def kakao_logout_home_redirect(request):
         # Kakao Logout - Access Token
         headers = {"Authorization": f'Bearer {access_token}'}
         try:
-            logout_response = requests.post(
-                'https://kapi.kakao.com/v1/user/logout',
+            kakao_client = get_kakao_client()
+            logout_response = kakao_client.post(
+                kakao_client.api_url('/v1/user/logout'),
                 headers=headers
             )
         except requests.exceptions.RequestException as e:
@@ -643,14 +660,15 @@ def kakao_unlink(request):
             }, status=status.HTTP_401_UNAUTHORIZED)
 
         access_token = auth_header.split(' ')[1]
-        logger.debug(f"Access token extracted: {access_token}")
+        logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
         """
         Validate the Access Token
         """
-        kakao_verify_url = 'https://kapi.kakao.com/v1/user/access_token_info'
+        kakao_client = get_kakao_client()
+        kakao_verify_url = kakao_client.api_url('/v1/user/access_token_info')
         headers = {'Authorization': f'Bearer {access_token}'}
-        verify_response = requests.get(kakao_verify_url, headers=headers)
+        verify_response = kakao_client.get(kakao_verify_url, headers=headers)
 
         if verify_response.status_code != 200:
             logger.warning("Invalid or expired access token provided")
@@ -689,8 +707,8 @@ def kakao_unlink(request):
         """
         headers = {"Authorization": f'Bearer {access_token}'}
         try:
-            response = requests.post(
-                'https://kapi.kakao.com/v1/user/unlink',
+            response = kakao_client.post(
+                kakao_client.api_url('/v1/user/unlink'),
                 headers=headers
             )
             logger.debug(f"Unlink request sent to Kakao API for user ID: {kakao_uid}")
@@ -703,7 +721,7 @@ def kakao_unlink(request):
             }, status=status.HTTP_502_BAD_GATEWAY)
 
         if response.status_code != 200:  # (Mostly) Bad Request 400
-            logger.error(f"Kakao API responded with an error: {response.json()}")
+            logger.error("Kakao API responded with an error: status %s", response.status_code)
             return Response({
                 'error': "Kakao Unlink GET Fail",
                 'detail': response.json()
@@ -718,6 +736,7 @@ def kakao_unlink(request):
         try:
             if user:
                 user.delete()
+                invalidate_social_token(access_token)
                 logger.info(f"User and associated SocialAccount deleted successfully for user ID: {kakao_uid}")
                 return Response({
                     "message": "User and SocialAccount deletion success",
@@ -771,21 +790,19 @@ def kakao_show_verified(request):
             }, status=status.HTTP_401_UNAUTHORIZED)
 
         access_token = auth_header.split(' ')[1]
-        logger.debug(f"Access token extracted: {access_token}")
+        logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
-        try:
-            social_token = SocialToken.objects.get(token=access_token)
-            logger.debug(f"SocialToken found for access token: {access_token}")
-        except SocialToken.DoesNotExist:
-            logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
+        social_token = get_request_token(request)
+        if social_token is None:
+            logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
             return Response({
                 'error': 'Kakao Show Verified GET Fail',
                 'detail': 'Invalid Token or token does not exist'
             }, status=status.HTTP_404_NOT_FOUND)
 
         # Check authenticated user (Access Token Expiration)
-        if social_token.expires_at and social_token.expires_at < timezone.now():
-            logger.warning(f"Access token has expired for token: {access_token}")
+        if social_token.is_expired():
+            logger.warning("Access token has expired for token: %s", redact_access_token(access_token))
             return Response({
                 'error': 'Kakao Show Verified GET Fail',
                 'detail': 'Invalid Token or token does not exist'
@@ -2,8 +2,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from ..models import Category
-from ..serializers import CategorySerializer
+from ..serializers import CategorySerializer, ProblemSerializer
 from django.db import IntegrityError
+from django.db.models import Count
 import logging
 
 logger = logging.getLogger('rest')
@@ -41,7 +42,7 @@ class CategoryView(APIView):
                 )
             else:
                 # Retrieve all categories
-                categories = Category.objects.all().order_by('category_name')
+                categories = Category.objects.annotate(problem_count=Count('problems')).order_by('category_name')
                 category_serializer = CategorySerializer(categories, many=True)
                 logger.info(f'All categories retrieved successfully. Count: {len(categories)}')
                 return Response({
@@ -195,4 +196,33 @@ class CategoryView(APIView):
             return Response({
                 'error': 'Category DELETE Fail',
                 'detail': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class CategoryProblemListView(APIView):
+    # Problems in a category, read through the (category_id, problem_id) index of the relation
+    def get(self, request, category_id):
+        try:
+            category = Category.objects.filter(id=category_id).first()
+            if category is None:
+                logger.info(f'GET request failed: Category with ID {category_id} not found.')
+                return Response({
+                    'error': 'Category Problem List GET Fail',
+                    'detail': 'Category not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            problems = category.problems.all().order_by('-updated_at').prefetch_related('categories')
+            problem_serializer = ProblemSerializer(problems, many=True, context={'request': request})
+            logger.info(f'Problems of category ID {category_id} retrieved successfully. Count: {len(problem_serializer.data)}')
+            return Response({
+                'message': f'Category Problem List Retrieval Success - {len(problem_serializer.data)} problem(s) found',
+                'data': problem_serializer.data},
+                status=status.HTTP_200_OK
+            )
+
+        except Exception as e:
+            logger.error(f'GET request failed: {str(e)}')
+            return Response({
+                'error': 'Category Problem List GET Fail',
+                'detail': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
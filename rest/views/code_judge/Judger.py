@@ -4,15 +4,29 @@ import os
 import shutil
 import shlex
 import psutil
-import json
-import hashlib
-from multiprocessing import Pool
-from .config import TESTCASE_BASE_DIR
+import queue
+import time
+import logging
+from .config import TESTCASE_BASE_DIR, JUDGE_OUTPUT_PREVIEW_SIZE
+from .pool import get_judge_pool
+from .build_cache import get_build_cache, list_files
+from .testcase_cache import get_testcase_manifest
+from .workspace import get_workspace_pool
+from .output_stream import OutputStream
+from .checkers import get_checker, CheckerError
+
+logger = logging.getLogger('rest')
+
+RESULT_SKIPPED = 6      # Not judged: cancelled by stop_on_failure after an earlier testcase failed
+LEGACY_BATCH_SIZE = 6   # Batch size of the former barrier scheduler (used for the wall-clock savings report)
+KILL_DRAIN_GRACE = 5    # seconds, on top of the real time limit, for killed testcases to come back from the pool
 
 class SubmissionDriver:
     def __init__(self, base_workspace, testcase_name):
         self.submission_id = uuid.uuid4().hex
         self.work_dir = os.path.join(base_workspace, self.submission_id)
+        self.workspace_pool = get_workspace_pool()
+        self.pooled = False
         test_dir = os.path.join(TESTCASE_BASE_DIR, testcase_name)
         if os.path.exists(test_dir):
             self.test_dir = test_dir
@@ -21,6 +35,12 @@ class SubmissionDriver:
         pass
 
     def __enter__(self):
+        # RAM workspace when one is free and under quota, otherwise a fresh directory on disk
+        if self.workspace_pool is not None:
+            pooled_dir = self.workspace_pool.acquire()
+            if pooled_dir is not None:
+                self.work_dir, self.pooled = pooled_dir, True
+                return self.work_dir, self.test_dir
         try:
             os.mkdir(self.work_dir)
             #os.chown(self.work_dir, COMPILER_UID, RUN_GID) #유저 보안 설정 추후
@@ -30,6 +50,9 @@ class SubmissionDriver:
         return self.work_dir, self.test_dir
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.pooled:
+            self.workspace_pool.release(self.work_dir)  # Emptied in the background
+            return
         try:
             shutil.rmtree(self.work_dir)
             pass
@@ -43,6 +66,15 @@ class Compiler:
         
         compiler_out = os.path.join(output_dir, "compiler.out") #컴파일 결과
 
+        # Identical main + user code was already compiled -> reuse the artifacts
+        build_cache = get_build_cache()
+        if build_cache is not None:
+            solution_path = os.path.join(output_dir, compile_config["solution_name"])
+            build_key = build_cache.build_key(compile_config, src_path, solution_path)
+            if build_cache.get(build_key, output_dir):
+                return exe_path, ""
+            sources = list_files(output_dir)
+
         compile_command = compile_command.format(src_path=src_path, exe_dir=output_dir, exe_path=exe_path)
         command = shlex.split(compile_command)
 
@@ -78,6 +110,8 @@ class Compiler:
                     return "", error_msg
         else:
             #os.remove(compiler_out)
+            if build_cache is not None:
+                build_cache.put(build_key, output_dir, list_files(output_dir) - sources - {"compiler.out"})
             return exe_path, error_msg
 
 class Judger:
@@ -92,21 +126,20 @@ class Judger:
         self.testcase_dir = testcase_dir
         self.submission_dir = submission_dir
 
-        self.pool = Pool(processes=psutil.cpu_count())
+        self.stats = {}
         self.testcase_info = self.load_test_info()
+        self.checker = get_checker(self.testcase_info.get("checker"))
     
     def load_test_info(self):
-        try:
-            with open(os.path.join(self.testcase_dir, "info.json")) as f:
-                return json.load(f)
-        except IOError:
-            raise Exception("Test case info not found")
-        except ValueError:
-            raise Exception("Wrong test case config")
+        # Parsed once per process and reused until info.json changes (see testcase_cache).
+        # Judged against the resolved version directory : an upload meanwhile does not change the testcases mid-run
+        manifest = get_testcase_manifest(self.testcase_dir)
+        self.testcase_dir = manifest.testcase_dir
+        return manifest.info
 
     def judge_one(self, testcase_id): #테스트케이스 하나 채점
         testcase_info = self.testcase_info["testcases"][testcase_id]
-        input_path = os.path.join(self.testcase_dir, testcase_info["input_name"])
+        input_path = testcase_info["input_path"]
 
         user_output_path = os.path.join(self.submission_dir, testcase_id + ".out")
         error_msg_path = os.path.join(self.submission_dir, "compiler.out")
@@ -143,25 +176,19 @@ class Judger:
             if not os.path.exists(user_output_path):
                 run_result["result"] = Cjudger.RESULT_WRONG_ANSWER
             else:
-                #정답 체크
-                with open(user_output_path, "rb") as f:
-                    content = f.read()
-
-                content_str = content.decode('utf-8', errors='backslashreplace')
-                return_index = content_str.find("[!return]:")
-
-                if return_index != -1:
-                    content_relevant = content_str[return_index + len("[!return]:"):].rstrip()
-                else:
-                    content_relevant = ""
-                
-                run_result["stdout"] = content_str[:return_index]
-                
-                output_md5 = hashlib.md5(content_relevant.encode('utf-8')).hexdigest()
-                run_result["output"] = content_relevant.strip()
-                result = (output_md5 == self.testcase_info["testcases"][testcase_id]["stripped_output_md5"])
-
-                run_result["output_md5"], is_solved, run_result['is_solved'] = output_md5, result, result
+                #정답 체크 (청크 단위로 읽어 출력 크기와 무관하게 메모리 사용량 유지)
+                output = OutputStream(user_output_path)
+                try:
+                    result = self.checker.check(output, testcase_info, run_result, self.testcase_dir, self.submission_dir)
+                except CheckerError as e:
+                    run_result["result"] = Cjudger.RESULT_SYSTEM_ERROR
+                    run_result["output"] = str(e)
+                    return run_result
+
+                run_result["stdout"] = output.stdout
+                run_result["output"] = output.answer
+
+                is_solved, run_result['is_solved'] = result, result
 
                 if not is_solved:
                     run_result["result"] = Cjudger.RESULT_WRONG_ANSWER
@@ -177,48 +204,136 @@ class Judger:
         """ compiler error message for {js, python} is stored """
         try:
             with open(error_msg_path, "rb") as f:
-                run_result["output"] = f.read().decode("utf-8", errors="backslashreplace")
+                run_result["output"] = f.read(JUDGE_OUTPUT_PREVIEW_SIZE).decode("utf-8", errors="backslashreplace")
         except Exception:
             pass
         #print(f"Error Run Result : {run_result}")
         return run_result
 
-    def run(self, batch_size=6):  # batch_size로 테스트 케이스를 나누어 채점
-        result = []
-
-        #tmp_result = []
-        #for testcase_id, _ in self.testcase_info["testcases"].items():
-        #    tmp_result.append(self.judge_one(testcase_id))
-        #    print("suc")
-            
-        #for item in tmp_result:
-        #    result.append(item.get())
-        #return result
-        # Get all test cases as a list
-        testcases = list(self.testcase_info["testcases"].items())
-
-
-        # Process in batches
-        for i in range(0, len(testcases), batch_size):
-            batch = testcases[i:i + batch_size]
-            tmp_result = []
-
-            with Pool(processes=psutil.cpu_count()) as pool:
-                for testcase_id, _ in batch:
-                    tmp_result.append(pool.apply_async(_run, (self, testcase_id)))
-
-                pool.close()
-                pool.join()
-
-                for item in tmp_result:
-                    result.append(item.get())
+    def run(self, on_result=None, stop_on_failure=False):
+        """
+        Judge every testcase through the shared pool.
+        Testcases are streamed into the pool as soon as a slot frees up (no batch barrier),
+        and the results are returned in testcase order.
+        With `stop_on_failure`, the first non-accepted verdict stops the scheduling, kills the
+        in-flight testcases of this submission and marks every remaining testcase as skipped.
+        """
+        testcase_ids = sorted(self.testcase_info["testcases"].keys(), key=_testcase_order)
+        judge_pool = get_judge_pool()
+        slots = judge_pool.processes  # Keep at most one testcase per worker in flight for this submission
+        done = queue.Queue()
+        results = {}
+        in_flight = 0
+        next_index = 0
+        failed = False
+        started_at = time.monotonic()
 
+        try:
+            while (next_index < len(testcase_ids) and not failed) or in_flight:
+                while next_index < len(testcase_ids) and in_flight < slots and not failed:
+                    self._submit(judge_pool, testcase_ids[next_index], done)
+                    next_index += 1
+                    in_flight += 1
+
+                testcase_id, run_result, error = done.get()
+                in_flight -= 1
+                if error is not None:
+                    raise error
+                if failed:  # Killed (or raced with the kill) after the first failure
+                    run_result = _skipped_result(testcase_id)
+                elif stop_on_failure and run_result["result"] != Cjudger.RESULT_SUCCESS:
+                    failed = True
+                    self._kill_in_flight()
+                results[testcase_id] = run_result
+                if on_result is not None:
+                    on_result(run_result)
+        except BaseException:
+            # The other testcases of this submission must not outlive the call : their workers would
+            # keep writing into a workspace the caller releases (and hands to the next submission)
+            if in_flight:
+                self._kill_in_flight()
+                self._drain(done, in_flight)
+            raise
+
+        for testcase_id in testcase_ids[next_index:]:  # Never scheduled
+            results[testcase_id] = _skipped_result(testcase_id)
+            if on_result is not None:
+                on_result(results[testcase_id])
+
+        result = [results[testcase_id] for testcase_id in testcase_ids]
+        self.stats = self._schedule_stats(result, time.monotonic() - started_at)
         return result
 
-    def __getstate__(self):
-        self_dict = self.__dict__.copy()
-        del self_dict["pool"]
-        return self_dict
+    def _kill_in_flight(self):
+        """ Kill the sandboxed programs of this submission still running under the pool workers """
+        # Whole path components only : pooled workspaces such as .../1234-1 and .../1234-10 share a prefix
+        submission_dir = os.path.abspath(self.submission_dir)
+        prefix = submission_dir + os.sep
+        for process in psutil.Process().children(recursive=True):
+            try:
+                if any(arg == submission_dir or arg.startswith(prefix) for arg in process.cmdline()):
+                    process.kill()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+    def _drain(self, done, in_flight):
+        """ Waits for the killed testcases to come back from the pool, at most their real time limit plus a grace period """
+        deadline = time.monotonic() + self.max_real_time / 1000 + KILL_DRAIN_GRACE
+        while in_flight:
+            try:
+                done.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                logger.warning("%s testcase(s) of %s still running in the judge pool after the kill", in_flight, self.submission_dir)
+                return
+            in_flight -= 1
+
+    def _submit(self, judge_pool, testcase_id, done):
+        args = (_run, (self, testcase_id))
+        kwargs = {
+            'callback': lambda run_result: done.put((testcase_id, run_result, None)),
+            'error_callback': lambda error: done.put((testcase_id, None, error)),
+        }
+        try:
+            judge_pool.apply_async(*args, **kwargs)
+        except ValueError:  # Pool not running -> replace it and retry once
+            judge_pool.recycle()
+            judge_pool.apply_async(*args, **kwargs)
+
+    def _schedule_stats(self, result, wall_time):
+        """
+        Wall-clock report of one submission.
+        `batched_time` estimates the old fixed-batch scheduler, where every batch waited for its slowest testcase.
+        """
+        real_times = [run_result.get("real_time", 0) for run_result in result if run_result["result"] != RESULT_SKIPPED] or [0]
+        batched_time = sum(max(real_times[i:i + LEGACY_BATCH_SIZE]) for i in range(0, len(real_times), LEGACY_BATCH_SIZE))
+        wall_time = int(wall_time * 1000)
+        return {
+            'testcase_num': len(result),
+            'skipped_num': sum(1 for run_result in result if run_result["result"] == RESULT_SKIPPED),
+            'wall_time': wall_time,
+            'serial_time': sum(real_times),
+            'batched_time': batched_time,
+            'saved_time': max(batched_time - wall_time, 0),
+        }
+
+def _skipped_result(testcase_id):
+    return {
+        "testcase": testcase_id,
+        "result": RESULT_SKIPPED,
+        "cpu_time": 0,
+        "real_time": 0,
+        "memory": 0,
+        "signal": 0,
+        "exit_code": 0,
+        "error": 0,
+        "output_md5": None,
+        "output": None,
+        "stdout": "",
+        "is_solved": False,
+    }
+
+def _testcase_order(testcase_id):
+    return (0, int(testcase_id), "") if testcase_id.isdigit() else (1, 0, testcase_id)
 
 def _run(instance, testcase_id):
     return instance.judge_one(testcase_id)
\ No newline at end of file
@@ -0,0 +1,168 @@
+import os
+import uuid
+import shlex
+import shutil
+import hashlib
+import threading
+import logging
+from .config import COMPILE_CACHE_DIR, COMPILE_CACHE_MAX_SIZE
+
+logger = logging.getLogger('rest')
+
+EVICT_SCAN_INTERVAL = 50  # Stores between two full scans of the cache directory while under the size cap
+
+class BuildCache:
+    """
+    Content-addressed cache of compiled artifacts on local disk.
+    An entry is a directory named after the build key, holding every file the compiler produced.
+    The directory mtime is refreshed on each hit, and the least recently used entries are
+    evicted once the cache grows past `max_size` bytes. The cache size is estimated from the
+    stored artifacts : the directory is only scanned when the estimate goes over `max_size`,
+    or every EVICT_SCAN_INTERVAL stores to pick up what the other processes stored.
+    """
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._estimated_size = None  # Unknown until the first scan
+        self._puts_since_scan = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def compiler_version(compile_command):
+        """ Resolved path, size and mtime of the compiler binary : an upgraded compiler gets new keys """
+        compiler_path = os.path.realpath(shlex.split(compile_command)[0])
+        try:
+            stat = os.stat(compiler_path)
+        except OSError:  # The compilation reports the missing compiler
+            return compiler_path
+        return f"{compiler_path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @classmethod
+    def build_key(cls, compile_config, *src_paths):
+        """ Key = compiler command and version + file names + hashes of every source file (main and user code) """
+        key = hashlib.sha256()
+        compile_command = compile_config["compile_command"]
+        for part in (compile_command, cls.compiler_version(compile_command), compile_config["src_name"], compile_config["exe_name"]):
+            key.update(part.encode("utf-8") + b"\0")
+        for src_path in src_paths:
+            with open(src_path, "rb") as f:
+                key.update(hashlib.sha256(f.read()).digest())
+        return key.hexdigest()
+
+    def get(self, key, output_dir):
+        """ Copy the cached artifacts into output_dir. Returns True on a hit """
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            shutil.copytree(entry_dir, output_dir, dirs_exist_ok=True)
+            os.utime(entry_dir)
+        except OSError:  # Missing entry, or evicted while being copied
+            self._count(hit=False)
+            return False
+        self._count(hit=True)
+        return True
+
+    def put(self, key, output_dir, artifacts):
+        """ Store the artifacts (paths relative to output_dir) produced by a successful compilation """
+        entry_dir = os.path.join(self.cache_dir, key)
+        if os.path.exists(entry_dir):
+            return
+        tmp_dir = os.path.join(self.cache_dir, f".tmp-{uuid.uuid4().hex}")
+        size = 0
+        try:
+            for artifact in artifacts:
+                target = os.path.join(tmp_dir, artifact)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(output_dir, artifact), target)
+                size += os.path.getsize(target)
+            os.makedirs(tmp_dir, exist_ok=True)
+            os.rename(tmp_dir, entry_dir)  # Atomic publish; fails if another worker stored it first
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._puts_since_scan += 1
+            if self._estimated_size is not None:
+                self._estimated_size += size
+            if self._estimated_size is not None and self._estimated_size <= self.max_size \
+                    and self._puts_since_scan < EVICT_SCAN_INTERVAL:
+                return
+            self._puts_since_scan = 0
+
+        # The compilation already succeeded : a failed eviction must not fail it
+        try:
+            total_size = self._evict()
+        except Exception as e:
+            logger.warning("Build cache eviction failed: %r", e)
+            return
+        with self._lock:
+            self._estimated_size = total_size
+
+    def stats(self):
+        """ Hit / miss counters of this process, logged next to the judge schedule stats """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses}
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        logger.debug("Build cache %s", 'hit' if hit else 'miss')
+
+    def _evict(self):
+        """ Drops the least recently used entries until the cache fits in max_size. Returns the remaining size """
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            # Other processes store and evict entries concurrently : one that vanishes mid-scan is skipped
+            try:
+                if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                    continue
+                size = sum(
+                    os.path.getsize(os.path.join(root, name))
+                    for root, _, names in os.walk(entry.path) for name in names
+                )
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except OSError:
+                continue
+            total_size += size
+
+        for _, size, path in sorted(entries):  # Oldest access first
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+        return total_size
+
+
+def list_files(directory):
+    """ Every file below `directory`, relative to it """
+    return {
+        os.path.relpath(os.path.join(root, name), directory)
+        for root, _, names in os.walk(directory) for name in names
+    }
+
+
+_build_cache = None
+_build_cache_lock = threading.Lock()
+
+def get_build_cache():
+    """ Process-wide build cache, or None when COMPILE_CACHE_DIR is not configured """
+    global _build_cache
+    if not COMPILE_CACHE_DIR:
+        return None
+    with _build_cache_lock:
+        if _build_cache is None:
+            _build_cache = BuildCache(COMPILE_CACHE_DIR, COMPILE_CACHE_MAX_SIZE)
+        return _build_cache
+
+
+def build_cache_stats():
+    """ stats() of the process-wide build cache, or None when it is disabled """
+    build_cache = get_build_cache()
+    return build_cache.stats() if build_cache is not None else None
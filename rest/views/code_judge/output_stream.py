@@ -0,0 +1,82 @@
+import hashlib
+from .config import JUDGE_OUTPUT_PREVIEW_SIZE
+
+RETURN_MARKER = b"[!return]:"
+OUTPUT_CHUNK_SIZE = 64 * 1024
+
+class OutputStream:
+    """
+    Reads a user output file chunk by chunk.
+    Everything before the first return marker is what the program printed (stdout),
+    everything after it is the returned answer. Iterating yields the answer in chunks,
+    and only a bounded preview of both parts is kept in memory.
+    """
+    def __init__(self, path, preview_size=JUDGE_OUTPUT_PREVIEW_SIZE, chunk_size=OUTPUT_CHUNK_SIZE):
+        self.path = path
+        self.preview_size = preview_size
+        self.chunk_size = chunk_size
+        self.found_marker = False
+        self._stdout_preview = bytearray()
+        self._answer_preview = bytearray()
+
+    def __iter__(self):
+        keep = len(RETURN_MARKER) - 1  # Tail that may hold the beginning of a marker split across chunks
+        pending = b""
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                if self.found_marker:
+                    yield self._answer_chunk(chunk)
+                    continue
+
+                data = pending + chunk
+                index = data.find(RETURN_MARKER)
+                if index == -1:
+                    split = max(len(data) - keep, 0)
+                    self._keep(self._stdout_preview, data[:split])
+                    pending = data[split:]
+                else:
+                    self._keep(self._stdout_preview, data[:index])
+                    self.found_marker = True
+                    pending = b""
+                    answer = data[index + len(RETURN_MARKER):]
+                    if answer:
+                        yield self._answer_chunk(answer)
+        self._keep(self._stdout_preview, pending)
+
+    @property
+    def stdout(self):
+        return self._stdout_preview.decode("utf-8", errors="backslashreplace")
+
+    @property
+    def answer(self):
+        return self._answer_preview.decode("utf-8", errors="backslashreplace").strip()
+
+    def _answer_chunk(self, chunk):
+        self._keep(self._answer_preview, chunk)
+        return chunk
+
+    def _keep(self, preview, data):
+        if len(preview) < self.preview_size:
+            preview += data[:self.preview_size - len(preview)]
+
+
+class RStripMD5:
+    """ md5 of a byte stream without its trailing whitespace, computed without buffering the stream """
+    def __init__(self):
+        self._md5 = hashlib.md5()
+        self._pending = b""  # Whitespace run that is only hashed if more content follows
+
+    def update(self, chunk):
+        body = chunk.rstrip()
+        if body:
+            self._md5.update(self._pending)
+            self._md5.update(body)
+            self._pending = chunk[len(body):]
+        else:
+            self._pending += chunk
+
+    def hexdigest(self):
+        return self._md5.hexdigest()
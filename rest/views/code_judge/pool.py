@@ -0,0 +1,150 @@
+import os
+import time
+import atexit
+import threading
+import logging
+import psutil
+from multiprocessing import Pool, TimeoutError
+from .config import JUDGE_POOL_SIZE, JUDGE_POOL_MAX_TASKS_PER_CHILD, JUDGE_POOL_HEALTH_CHECK_TIMEOUT, JUDGE_POOL_HEALTH_CHECK_INTERVAL
+
+logger = logging.getLogger('rest')
+
+def _ping():
+    return os.getpid()
+
+class JudgePool:
+    """
+    Long-lived worker pool shared by every Judger in this process.
+    Workers are recycled after `max_tasks_per_child` testcases, and the whole pool
+    is rebuilt when a health check fails or the owning process has been forked.
+    Health checks run in the background at most every `health_check_interval` seconds (see check_health_if_due).
+    """
+    def __init__(self, processes=None, max_tasks_per_child=None, health_check_timeout=5, health_check_interval=60):
+        self.processes = processes or psutil.cpu_count()
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.health_check_timeout = health_check_timeout
+        self.health_check_interval = health_check_interval
+        self._pool = None
+        self._owner_pid = None
+        self._lock = threading.Lock()
+        self._generation = 0           # Bumped on every new pool : late callbacks of a replaced pool are ignored
+        self._pending = 0              # Tasks of the current pool not answered yet
+        self._last_progress = time.monotonic()
+        self._last_health_check = time.monotonic()
+        self._health_check_running = False
+
+    @property
+    def pool(self):
+        with self._lock:
+            # A pool inherited through fork() (gunicorn / celery prefork) is unusable in the child
+            if self._pool is None or self._owner_pid != os.getpid():
+                self._pool = self._create()
+            return self._pool
+
+    def _create(self):
+        logger.info("Starting judge pool with %s worker(s) (pid: %s)", self.processes, os.getpid())
+        self._owner_pid = os.getpid()
+        self._generation += 1
+        self._pending = 0
+        self._last_progress = time.monotonic()
+        return Pool(processes=self.processes, maxtasksperchild=self.max_tasks_per_child)
+
+    def apply_async(self, func, args=(), callback=None, error_callback=None):
+        pool = self.pool
+        with self._lock:
+            generation = self._generation
+            if not self._pending:
+                self._last_progress = time.monotonic()  # An idle pool has not been stalled meanwhile
+            self._pending += 1
+
+        def done(handler):
+            def wrapper(value):
+                with self._lock:
+                    if self._generation == generation:
+                        self._pending -= 1
+                        self._last_progress = time.monotonic()
+                if handler is not None:
+                    handler(value)
+            return wrapper
+
+        try:
+            return pool.apply_async(func, args, callback=done(callback), error_callback=done(error_callback))
+        except ValueError:
+            with self._lock:
+                if self._generation == generation:
+                    self._pending -= 1
+            raise
+
+    def health_check(self):
+        """
+        A busy pool is healthy while its tasks keep completing : none answered for `health_check_timeout`
+        seconds means hung workers. An idle pool has to round-trip a no-op within the same timeout.
+        Either failure rebuilds the pool.
+        """
+        with self._lock:
+            pending, stalled_for = self._pending, time.monotonic() - self._last_progress
+        if pending:
+            if stalled_for <= self.health_check_timeout:
+                return True
+            logger.warning("Judge pool health check failed, recycling pool: %s task(s) stalled for %.0f s", pending, stalled_for)
+            self.recycle()
+            return False
+        try:
+            self.pool.apply_async(_ping).get(timeout=self.health_check_timeout)
+            return True
+        except (TimeoutError, OSError, ValueError) as e:
+            logger.warning("Judge pool health check failed, recycling pool: %r", e)
+            self.recycle()
+            return False
+
+    def check_health_if_due(self):
+        """ Starts a background health check when the last one is `health_check_interval` seconds old """
+        with self._lock:
+            if self._health_check_running or time.monotonic() - self._last_health_check < self.health_check_interval:
+                return
+            self._health_check_running = True
+        threading.Thread(target=self._run_health_check, daemon=True).start()
+
+    def _run_health_check(self):
+        try:
+            self.health_check()
+        except Exception as e:
+            logger.error("Judge pool health check error: %r", e, exc_info=True)
+        finally:
+            with self._lock:
+                self._health_check_running = False
+                self._last_health_check = time.monotonic()
+
+    def recycle(self):
+        """ Swap in a fresh pool; the old one finishes its in-flight testcases before exiting """
+        with self._lock:
+            old_pool = self._pool
+            self._pool = self._create()
+        if old_pool is not None:
+            old_pool.close()
+            threading.Thread(target=old_pool.join, daemon=True).start()
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None and self._owner_pid == os.getpid():
+                self._pool.close()
+                self._pool.join()
+            self._pool = None
+
+
+_judge_pool = None
+_judge_pool_lock = threading.Lock()
+
+def get_judge_pool():
+    global _judge_pool
+    with _judge_pool_lock:
+        if _judge_pool is None:
+            _judge_pool = JudgePool(
+                processes=JUDGE_POOL_SIZE,
+                max_tasks_per_child=JUDGE_POOL_MAX_TASKS_PER_CHILD,
+                health_check_timeout=JUDGE_POOL_HEALTH_CHECK_TIMEOUT,
+                health_check_interval=JUDGE_POOL_HEALTH_CHECK_INTERVAL,
+            )
+            atexit.register(_judge_pool.shutdown)
+    _judge_pool.check_health_if_due()
+    return _judge_pool
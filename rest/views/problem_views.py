@@ -1,26 +1,33 @@
-from django.utils import timezone
 from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.cache import cache
-from django.db.models import F
-from django_redis import get_redis_connection
+from django.http import StreamingHttpResponse
+from django.db import transaction
 from django_ratelimit.decorators import ratelimit
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import ValidationError, NotFound
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
-from ..tasks import do_judge_for_task, create_submission_and_response_for_task
+from ..tasks import do_judge_for_task, create_submission_and_response_for_task, stored_submission_response_data
+from ..judge_events import JudgeEventStream, EventStreamRenderer
 from ..models import *
 from ..serializers import *
 from .zip_extraction import *
 from ..utils import *
-from .code_judge.Judger import SubmissionDriver, Compiler, Judger
-from .code_judge.config import lang_config, RUN_BASE_DIR, TESTCASE_BASE_DIR
+from ..pagination import ProblemCursorPagination
+from .code_judge.Judger import SubmissionDriver, Compiler, Judger, RESULT_SKIPPED
+from .code_judge.build_cache import build_cache_stats
+from .code_judge.testcase_cache import invalidate_testcase_manifest
+from .code_judge.config import lang_config, RUN_BASE_DIR, TESTCASE_BASE_DIR, JUDGE_STOP_ON_FAILURE
 from allauth.socialaccount.models import SocialAccount, SocialToken
+from ..authentications import get_request_token
+from celery import chain
 from celery.result import AsyncResult
+from celery.utils import uuid
 from pathlib import Path
 import os
 import logging
@@ -37,8 +44,11 @@ SUBMISSION_RESULT = {
     3: "MEMORY_LIMIT_EXCEEDED",
     4: "RUNTIME_ERROR",
     5: "SYSTEM_ERROR",
+    6: "SKIPPED",
 }
 
+PROBLEM_FILTER_PARAMS = ('level', 'category')
+
 """
 [다수 문제 데이터 다루기 & 새로운 데이터 추가하기]
 """
@@ -54,74 +64,103 @@ class ProblemListView(APIView):
             auth_header = request.headers.get('Authorization')
             if auth_header and auth_header.startswith('Bearer '):
                 access_token = auth_header.split(' ')[1]
-                logger.debug(f"Access token extracted: {access_token}")
+                logger.debug("Access token extracted: %s", redact_access_token(access_token))
                 
-                try:
-                    social_token = SocialToken.objects.get(token=access_token)
-                    logger.debug(f"SocialToken found for access token: {access_token}")
-                    # Check authenticated user (Access Token Expiration)
-                    if social_token.expires_at and social_token.expires_at < timezone.now():
-                        logger.warning("Access token has expired")
-                        user_id = None
-                    else:
-                        user_id = social_token.account_id
-                except SocialToken.DoesNotExist:
-                    logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
-
-            # Cache key for the problem list, based on user authentication status
-            cache_key = generate_problem_list_cache_key(user_id)
-            cached_data = cache.get(cache_key)
-
-            if cached_data:
+                social_token = get_request_token(request)
+                if social_token is None:
+                    logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
+                # Check authenticated user (Access Token Expiration)
+                elif social_token.is_expired():
+                    logger.warning("Access token has expired")
+                else:
+                    user_id = social_token.account_id
+
+            # Paginated / filtered / sorted list (opt-in) : served page by page from the indexes
+            if ProblemCursorPagination.is_requested(request, PROBLEM_FILTER_PARAMS):
+                return self.get_page(request, user_id)
+
+            # Shared catalog (same for every user) + per-user solve status overlay
+            def build_catalog():
+                # Retrieve the list of problems ordered by the updated_at field
+                problems = Problem.objects.all().order_by('-updated_at').prefetch_related('categories')
+
+                # Serialize the problems (without user : every solve_status is the default one)
+                problem_serializer = ProblemSerializer(problems, many=True, context={'request': request})
+                logger.info("Problem list serialized successfully with %s problem(s)", len(problem_serializer.data))
+                return problem_serializer.data
+
+            # Cached for 10 minutes; concurrent misses are coalesced into a single rebuild
+            catalog, cached = get_or_rebuild_cache(
+                generate_problem_list_cache_key(),
+                build_catalog,
+                timeout=600,
+            )
+            if cached:
                 logger.info("Returning cached problem list")
-                return Response({
-                    'message': f'Problem List Retrieval Success - {len(cached_data)} problem(s) found (cached)',
-                    'data': cached_data
-                }, status=status.HTTP_200_OK)
-
-            # Retrieve the list of problems ordered by the updated_at field
-            problems = Problem.objects.all().order_by('-updated_at')
-            logger.info(f"{problems.count()} problem(s) retrieved")
-
-            if not problems.exists():
-                logger.info("No problems found")
-                return Response({
-                    'message': 'Problem List Retrieval Success - 0 problem(s) found',
-                    'data': []
-                }, status=status.HTTP_200_OK)
-
-            # Serialize the problems
-            problem_serializer = ProblemSerializer(problems, many=True, context={'user_id': user_id, 'request': request})
-            logger.info(f"Problem list serialized successfully with {len(problem_serializer.data)} problem(s)")
 
-            # Cache the serialized data for future requests
-            cache.set(cache_key, problem_serializer.data, timeout=600)  # Cache for 10 minutes
-
-            # Track user_id in Redis for future cache invalidation
-            redis_conn = get_redis_connection("default")
-            if user_id:
-                redis_conn.sadd("cached_users", user_id)  # Add user_id to the Redis set
+            data = overlay_solve_status(catalog, get_cached_solve_status_map(user_id))
 
             # Return the serialized data
             return Response({
-                'message': f'Problem List Retrieval Success - {len(problem_serializer.data)} problem(s) found',
-                'data': problem_serializer.data
+                'message': f'Problem List Retrieval Success - {len(data)} problem(s) found' + (' (cached)' if cached else ''),
+                'data': data
             }, status=status.HTTP_200_OK)
 
         except ValidationError as ve:
-            logger.warning(f"Validation error during problem list serialization: {ve.message_dict}")
+            logger.warning("Validation error during problem list serialization: %s", ve.message_dict)
             return Response({
                 'error': 'Problem List GET Fail',
                 'detail': f'Validation error occurred during serialization: {ve.message_dict}',
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Unexpected error during problem list retrieval: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem list retrieval: %s", e, exc_info=True)
             return Response({
                 'error': 'Problem List GET Fail',
                 'detail': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    def get_page(self, request, user_id):
+        problems = Problem.objects.all().prefetch_related('categories')
+
+        # Filtering : ?level=1,2 & ?category=Math
+        level = request.query_params.get('level')
+        if level:
+            try:
+                problems = problems.filter(level__in=[int(value) for value in level.split(',')])
+            except ValueError:
+                logger.warning("Invalid level filter in problem list request: %s", level)
+                return Response({
+                    'error': 'Problem List GET Fail',
+                    'detail': 'Invalid level: it must be an integer or a comma separated list of integers.'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+        category = request.query_params.get('category')
+        if category:
+            problems = problems.filter(categories__category_name=category)
+
+        # Keyset pagination : ?cursor=...&page_size=...&sort=recent|oldest|newest|level|-level|popular
+        paginator = ProblemCursorPagination()
+        try:
+            page = paginator.paginate_queryset(problems, request, view=self)
+        except (ValidationError, NotFound) as e:
+            logger.warning("Invalid pagination parameters in problem list request: %s", e.detail)
+            return Response({
+                'error': 'Problem List GET Fail',
+                'detail': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        problem_serializer = ProblemSerializer(page, many=True, context={'request': request})
+        data = overlay_solve_status(problem_serializer.data, get_cached_solve_status_map(user_id))
+        logger.info("Problem list page retrieved with %s problem(s)", len(data))
+
+        return Response({
+            'message': f'Problem List Retrieval Success - {len(data)} problem(s) found',
+            'data': data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link()
+        }, status=status.HTTP_200_OK)
+
     def post(self, request):
         try:
             logger.info("New problem addition request initiated")
@@ -131,7 +170,7 @@ class ProblemListView(APIView):
 
             if problem_serializer.is_valid():
                 problem = problem_serializer.save()
-                logger.info(f"New problem created successfully with ID: {problem.id}")
+                logger.info("New problem created successfully with ID: %s", problem.id)
 
                 if problem_meta_data:
                     problem_meta_data['problem_id'] = problem.id
@@ -139,10 +178,10 @@ class ProblemListView(APIView):
 
                     if problem_meta_serializer.is_valid():
                         problem_meta_serializer.save()
-                        logger.info(f"Problem metadata saved successfully for problem ID: {problem.id}")
+                        logger.info("Problem metadata saved successfully for problem ID: %s", problem.id)
                     else:
                         problem.delete()
-                        logger.warning(f"ProblemMeta validation failed, problem ID {problem.id} deleted: {problem_meta_serializer.errors}")
+                        logger.warning("ProblemMeta validation failed, problem ID %s deleted: %s", problem.id, problem_meta_serializer.errors)
                         return Response({
                             'error': 'Problem List POST Fail',
                             'detail': f'ProblemMeta Validation Fail: {problem_meta_serializer.errors}'
@@ -152,27 +191,27 @@ class ProblemListView(APIView):
                 response_data = problem_serializer.data
                 response_data['problem_meta'] = problem_meta_serializer.data
 
-                logger.info(f"Problem addition completed successfully for problem ID: {problem.id}")
+                logger.info("Problem addition completed successfully for problem ID: %s", problem.id)
                 return Response({
                     'message': 'New Problem Addition Success',
                     'data': response_data
                 }, status=status.HTTP_201_CREATED)
 
-            logger.warning(f"Problem validation failed: {problem_serializer.errors}")
+            logger.warning("Problem validation failed: %s", problem_serializer.errors)
             return Response({
                 'error': 'Problem List POST Fail',
                 'detail': problem_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except ValidationError as ve:
-            logger.warning(f"Validation error during problem addition: {ve.message_dict}")
+            logger.warning("Validation error during problem addition: %s", ve.message_dict)
             return Response({
                 'error': 'Problem List POST Fail',
                 'detail': f'Validation error occurred during data processing: {ve.message_dict}',
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
-            logger.error(f"Unexpected error during problem addition: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem addition: %s", e, exc_info=True)
             return Response({
                 'error': 'Problem List POST Fail',
                 'detail': str(e)
@@ -186,55 +225,58 @@ class ProblemDetailView(APIView):
 
     def get(self, request, problem_id):
         try:
-            logger.info(f"Problem detail retrieval request initiated for problem ID: {problem_id}")
+            logger.info("Problem detail retrieval request initiated for problem ID: %s", problem_id)
 
-            # Generate a single cache key for the combined Problem and ProblemMeta data
-            cache_key = generate_problem_cache_key(problem_id)
-            cached_data = cache.get(cache_key)
+            def build_problem_detail():
+                problem = Problem.objects.get(id=problem_id)
+                problem_serializer = ProblemSerializer(problem, context={'request': request})
+                logger.debug("Problem with ID %s retrieved successfully", problem_id)
 
-            if cached_data:
-                logger.info(f"Returning cached data for problem ID {problem_id}")
+                problem_meta = ProblemMeta.objects.get(problem_id=problem_id)
+                problem_meta_serializer = ProblemMetaSerializer(problem_meta)
+                logger.debug("ProblemMeta for problem ID %s retrieved successfully", problem_id)
+
+                # Combine the serialized data
+                response_data = problem_serializer.data
+                response_data['problem_meta'] = problem_meta_serializer.data
+                return response_data
+
+            # A single cache key for the combined Problem and ProblemMeta data (cache for 10 minutes)
+            # Concurrent misses are coalesced into a single rebuild
+            response_data, cached = get_or_rebuild_cache(
+                generate_problem_cache_key(problem_id),
+                build_problem_detail,
+                timeout=600,
+            )
+
+            if cached:
+                logger.info("Returning cached data for problem ID %s", problem_id)
                 return Response({
                     'message': 'Problem Retrieval Success (cached)',
-                    'data': cached_data
+                    'data': response_data
                 }, status=status.HTTP_200_OK)
+            logger.info("Problem detail cached successfully for problem ID %s", problem_id)
 
-            problem = Problem.objects.get(id=problem_id)
-            problem_serializer = ProblemSerializer(problem, context={'request': request})
-            logger.debug(f"Problem with ID {problem_id} retrieved successfully")
-
-            problem_meta = ProblemMeta.objects.get(problem_id=problem_id)
-            problem_meta_serializer = ProblemMetaSerializer(problem_meta)
-            logger.debug(f"ProblemMeta for problem ID {problem_id} retrieved successfully")
-
-            # Combine the serialized data
-            response_data = problem_serializer.data
-            response_data['problem_meta'] = problem_meta_serializer.data
-
-            # Cache the combined data for future requests (cache for 10 minutes)
-            cache.set(cache_key, response_data, timeout=600)
-            logger.info(f"Problem detail cached successfully for problem ID {problem_id}")
-
-            logger.info(f"Problem detail retrieval successful for problem ID: {problem_id}")
+            logger.info("Problem detail retrieval successful for problem ID: %s", problem_id)
             return Response({
                 'message': 'Problem Retrieval Success',
                 'data': response_data
             }, status=status.HTTP_200_OK)
 
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found")
+            logger.warning("Problem with ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Detail GET Fail',
                 'detail': f'Problem with ID {problem_id} is not found'
             }, status=status.HTTP_404_NOT_FOUND)
         except ProblemMeta.DoesNotExist:
-            logger.warning(f"ProblemMeta for problem ID {problem_id} not found")
+            logger.warning("ProblemMeta for problem ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Detail GET Fail',
                 'detail': f'ProblemMeta for problem {problem_id} is not found'
             }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
-            logger.error(f"Unexpected error during problem detail retrieval for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem detail retrieval for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Detail GET Fail',
                 'detail': str(e)
@@ -242,13 +284,13 @@ class ProblemDetailView(APIView):
 
     def put(self, request, problem_id):
         try:
-            logger.info(f"Problem detail update request initiated for problem ID: {problem_id}")
+            logger.info("Problem detail update request initiated for problem ID: %s", problem_id)
 
             try:
                 problem = Problem.objects.get(id=problem_id)
-                logger.debug(f"Problem with ID {problem_id} retrieved successfully for update")
+                logger.debug("Problem with ID %s retrieved successfully for update", problem_id)
             except Problem.DoesNotExist:
-                logger.warning(f"Problem with ID {problem_id} not found for update")
+                logger.warning("Problem with ID %s not found for update", problem_id)
                 return Response({
                     'error': 'Problem Detail PUT Fail',
                     'detail': f'Problem with ID {problem_id} is not found'
@@ -259,7 +301,7 @@ class ProblemDetailView(APIView):
 
             if problem_serializer.is_valid():
                 problem_serializer.save()
-                logger.info(f"Problem with ID {problem_id} updated successfully")
+                logger.info("Problem with ID %s updated successfully", problem_id)
 
                 if problem_meta_data:
                     try:
@@ -268,15 +310,15 @@ class ProblemDetailView(APIView):
                         problem_meta_serializer = ProblemMetaSerializer(problem_meta, data=problem_meta_data)
                         if problem_meta_serializer.is_valid():
                             problem_meta_serializer.save()
-                            logger.info(f"ProblemMeta updated successfully for problem ID: {problem_id}")
+                            logger.info("ProblemMeta updated successfully for problem ID: %s", problem_id)
                         else:
-                            logger.warning(f"ProblemMeta validation failed for problem ID {problem_id}: {problem_meta_serializer.errors}")
+                            logger.warning("ProblemMeta validation failed for problem ID %s: %s", problem_id, problem_meta_serializer.errors)
                             return Response({
                                 'error': 'Problem Detail PUT Fail',
                                 'detail': problem_meta_serializer.errors
                             }, status=status.HTTP_400_BAD_REQUEST)
                     except ProblemMeta.DoesNotExist:
-                        logger.warning(f"ProblemMeta not found for problem ID {problem_id} during update")
+                        logger.warning("ProblemMeta not found for problem ID %s during update", problem_id)
                         return Response({
                             'error': 'Problem Detail PUT Fail',
                             'detail': f'ProblemMeta for problem {problem_id} is not found'
@@ -285,20 +327,20 @@ class ProblemDetailView(APIView):
                 response_data = problem_serializer.data
                 response_data['problem_meta'] = problem_meta_serializer.data if problem_meta_data else {}
 
-                logger.info(f"Problem and ProblemMeta update successful for problem ID: {problem_id}")
+                logger.info("Problem and ProblemMeta update successful for problem ID: %s", problem_id)
                 return Response({
                     'message': 'Problem Update Success',
                     'data': response_data
                 }, status=status.HTTP_200_OK)
             
-            logger.warning(f"Problem validation failed for problem ID {problem_id}: {problem_serializer.errors}")
+            logger.warning("Problem validation failed for problem ID %s: %s", problem_id, problem_serializer.errors)
             return Response({
                 'error': 'Problem Detail PUT Fail',
                 'detail': problem_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
         
         except Exception as e:
-            logger.error(f"Unexpected error during problem update for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem update for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Detail PUT Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -306,13 +348,13 @@ class ProblemDetailView(APIView):
 
     def patch(self, request, problem_id):
         try:
-            logger.info(f"Problem partial update request initiated for problem ID: {problem_id}")
+            logger.info("Problem partial update request initiated for problem ID: %s", problem_id)
 
             try:
                 problem = Problem.objects.get(id=problem_id)
-                logger.debug(f"Problem with ID {problem_id} retrieved successfully for partial update")
+                logger.debug("Problem with ID %s retrieved successfully for partial update", problem_id)
             except Problem.DoesNotExist:
-                logger.warning(f"Problem with ID {problem_id} not found for partial update")
+                logger.warning("Problem with ID %s not found for partial update", problem_id)
                 return Response({
                     'error': 'Problem Detail PATCH Fail',
                     'detail': f'Problem with ID {problem_id} is not found'
@@ -323,7 +365,7 @@ class ProblemDetailView(APIView):
 
             if problem_serializer.is_valid():
                 problem_serializer.save()
-                logger.info(f"Problem with ID {problem_id} partially updated successfully")
+                logger.info("Problem with ID %s partially updated successfully", problem_id)
 
                 if problem_meta_data:
                     try:
@@ -331,15 +373,15 @@ class ProblemDetailView(APIView):
                         problem_meta_serializer = ProblemMetaSerializer(problem_meta, data=problem_meta_data, partial=True)
                         if problem_meta_serializer.is_valid():
                             problem_meta_serializer.save()
-                            logger.info(f"ProblemMeta partially updated successfully for problem ID: {problem_id}")
+                            logger.info("ProblemMeta partially updated successfully for problem ID: %s", problem_id)
                         else:
-                            logger.warning(f"ProblemMeta validation failed for problem ID {problem_id}: {problem_meta_serializer.errors}")
+                            logger.warning("ProblemMeta validation failed for problem ID %s: %s", problem_id, problem_meta_serializer.errors)
                             return Response({
                                 'error': 'ProblemMeta PATCH Fail',
                                 'detail': problem_meta_serializer.errors
                             }, status=status.HTTP_400_BAD_REQUEST)
                     except ProblemMeta.DoesNotExist:
-                        logger.warning(f"ProblemMeta not found for problem ID {problem_id} during partial update")
+                        logger.warning("ProblemMeta not found for problem ID %s during partial update", problem_id)
                         return Response({
                             'error': 'ProblemMeta PATCH Fail',
                             'detail': f'ProblemMeta for problem {problem_id} is not found'
@@ -348,20 +390,20 @@ class ProblemDetailView(APIView):
                 response_data = problem_serializer.data
                 response_data['problem_meta'] = problem_meta_serializer.data if problem_meta_data else {}
 
-                logger.info(f"Problem and ProblemMeta partial update successful for problem ID: {problem_id}")
+                logger.info("Problem and ProblemMeta partial update successful for problem ID: %s", problem_id)
                 return Response({
                     'message': 'Problem Partial Update Success',
                     'data': response_data
                 }, status=status.HTTP_200_OK)
 
-            logger.warning(f"Problem validation failed for problem ID {problem_id}: {problem_serializer.errors}")
+            logger.warning("Problem validation failed for problem ID %s: %s", problem_id, problem_serializer.errors)
             return Response({
                 'error': 'Problem Detail PATCH Fail',
                 'detail': problem_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
         
         except Exception as e:
-            logger.error(f"Unexpected error during problem partial update for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem partial update for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Detail PATCH Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -369,13 +411,13 @@ class ProblemDetailView(APIView):
 
     def delete(self, request, problem_id):
         try:
-            logger.info(f"Problem deletion request initiated for problem ID: {problem_id}")
+            logger.info("Problem deletion request initiated for problem ID: %s", problem_id)
 
             try:
                 problem = Problem.objects.get(id=problem_id)
-                logger.debug(f"Problem with ID {problem_id} retrieved successfully for deletion")
+                logger.debug("Problem with ID %s retrieved successfully for deletion", problem_id)
             except Problem.DoesNotExist:
-                logger.warning(f"Problem with ID {problem_id} not found for deletion")
+                logger.warning("Problem with ID %s not found for deletion", problem_id)
                 return Response({
                     'error': 'Problem Detail DELETE Fail',
                     'detail': f'Problem with ID {problem_id} is not found'
@@ -384,16 +426,16 @@ class ProblemDetailView(APIView):
             try:
                 problem_meta = ProblemMeta.objects.get(problem_id=problem_id)
                 problem_meta.delete()
-                logger.debug(f"ProblemMeta with problem ID {problem_id} deleted successfully")
+                logger.debug("ProblemMeta with problem ID %s deleted successfully", problem_id)
             except ProblemMeta.DoesNotExist:
-                logger.warning(f"ProblemMeta not found for problem ID {problem_id} during deletion")
+                logger.warning("ProblemMeta not found for problem ID %s during deletion", problem_id)
                 return Response({
                     'error': 'Problem Detail DELETE Fail',
                     'detail': f'ProblemMeta for problem {problem_id} is not found'
                 }, status=status.HTTP_404_NOT_FOUND)
 
             problem.delete()
-            logger.info(f"Problem with ID {problem_id} deleted successfully")
+            logger.info("Problem with ID %s deleted successfully", problem_id)
             return Response({
                 'message': 'Problem Detail DELETE Success'
                 },
@@ -401,7 +443,7 @@ class ProblemDetailView(APIView):
             )
 
         except Exception as e:
-            logger.error(f"Unexpected error during problem deletion for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during problem deletion for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Detail DELETE Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -415,7 +457,7 @@ class ProblemLangCodeView(APIView):
 
     def get(self, request, problem_id):
         try:
-            logger.info(f"Problem language code retrieval request initiated for problem ID: {problem_id}")
+            logger.info("Problem language code retrieval request initiated for problem ID: %s", problem_id)
 
             language_id = request.query_params.get('language_id')
             if not language_id:
@@ -427,7 +469,7 @@ class ProblemLangCodeView(APIView):
 
             problem_instance = Language.objects.get(id=problem_id)
             if problem_instance is None:
-                logger.warning(f"Problem matching problem_id {problem_id} does not exist in DB")
+                logger.warning("Problem matching problem_id %s does not exist in DB", problem_id)
                 return Response({
                     'error': 'Problem Language Code GET Fail',
                     'detail': f"Problem matching problem_id {problem_id} does not exist in DB"
@@ -435,7 +477,7 @@ class ProblemLangCodeView(APIView):
 
             language_instance = Language.objects.get(id=language_id)
             if language_instance is None:
-                logger.warning(f"Language matching language_id {language_id} does not exist in DB")
+                logger.warning("Language matching language_id %s does not exist in DB", language_id)
                 return Response({
                     'error': 'Problem Language Code GET Fail',
                     'detail': f"Language matching language_id {language_id} does not exist in DB"
@@ -443,27 +485,27 @@ class ProblemLangCodeView(APIView):
 
             init_code = InitCode.objects.filter(problem_id=problem_id, language_id=language_id).first()
             if not init_code:
-                logger.warning(f"Code template not found for problem ID {problem_id} and language ID {language_id}")
+                logger.warning("Code template not found for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'error': 'Problem Language Code GET Fail',
                     'detail': 'Code template for the problem does not exist in DB'
                 }, status=status.HTTP_404_NOT_FOUND)
 
             init_code_serializer = InitCodeSerializer(init_code)
-            logger.info(f"Problem language code retrieval successful for problem ID {problem_id} and language ID {language_id}")
+            logger.info("Problem language code retrieval successful for problem ID %s and language ID %s", problem_id, language_id)
             return Response({
                 'message': 'Problem Language Code Retrieval Success',
                 'data': init_code_serializer.data
             }, status=status.HTTP_200_OK)
 
         except ValidationError as e:
-            logger.warning(f"Validation error during language code retrieval for problem ID {problem_id}: {str(e)}")
+            logger.warning("Validation error during language code retrieval for problem ID %s: %s", problem_id, e)
             return Response({
                 'error': 'Problem Language Code GET Fail',
                 'detail': f'Invalid data: {str(e)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error during language code retrieval for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during language code retrieval for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Language Code GET Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -471,7 +513,7 @@ class ProblemLangCodeView(APIView):
 
     def post(self, request, problem_id):
         try:
-            logger.info(f"Problem language code addition request initiated for problem ID: {problem_id}")
+            logger.info("Problem language code addition request initiated for problem ID: %s", problem_id)
 
             language_id = request.query_params.get('language_id')
             if not language_id:
@@ -484,9 +526,9 @@ class ProblemLangCodeView(APIView):
             # Validate that the provided language_id exists
             try:
                 language = Language.objects.get(id=language_id)
-                logger.debug(f"Language with ID {language_id} found")
+                logger.debug("Language with ID %s found", language_id)
             except Language.DoesNotExist:
-                logger.warning(f"Language with ID {language_id} not found in POST request")
+                logger.warning("Language with ID %s not found in POST request", language_id)
                 return Response({
                     'error': 'Problem Language Code POST Fail',
                     'detail': f'Language with id {language_id} does not exist'
@@ -498,25 +540,25 @@ class ProblemLangCodeView(APIView):
             init_code_serializer = InitCodeSerializer(data=request.data)
             if init_code_serializer.is_valid():
                 init_code_serializer.save()
-                logger.info(f"Problem language code added successfully for problem ID {problem_id} and language ID {language_id}")
+                logger.info("Problem language code added successfully for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'message': 'New Problem Language Code Addition Success',
                     'data': init_code_serializer.data
                 }, status=status.HTTP_201_CREATED)
             
-            logger.warning(f"Problem language code validation failed for problem ID {problem_id}: {init_code_serializer.errors}")
+            logger.warning("Problem language code validation failed for problem ID %s: %s", problem_id, init_code_serializer.errors)
             return Response({
                 'error': 'Problem Language Code POST Fail',
                 'detail': init_code_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
         except ValidationError as ve:
-            logger.warning(f"Validation error during language code addition for problem ID {problem_id}: {str(ve)}")
+            logger.warning("Validation error during language code addition for problem ID %s: %s", problem_id, ve)
             return Response({
                 'error': 'Problem Language Code POST Fail',
                 'detail': f'Invalid data: {str(ve)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error during language code addition for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during language code addition for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Language Code POST Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -524,7 +566,7 @@ class ProblemLangCodeView(APIView):
 
     def put(self, request, problem_id):
         try:
-            logger.info(f"Problem language code update request initiated for problem ID: {problem_id}")
+            logger.info("Problem language code update request initiated for problem ID: %s", problem_id)
 
             language_id = request.query_params.get('language_id')
             if not language_id:
@@ -537,9 +579,9 @@ class ProblemLangCodeView(APIView):
             # Validate that the provided language_id exists
             try:
                 language = Language.objects.get(id=language_id)
-                logger.debug(f"Language with ID {language_id} found")
+                logger.debug("Language with ID %s found", language_id)
             except Language.DoesNotExist:
-                logger.warning(f"Language with ID {language_id} not found in PUT request")
+                logger.warning("Language with ID %s not found in PUT request", language_id)
                 return Response({
                     'error': 'Problem Language Code PUT Fail',
                     'detail': f'Language with id {language_id} does not exist'
@@ -547,7 +589,7 @@ class ProblemLangCodeView(APIView):
 
             init_code = InitCode.objects.filter(problem_id=problem_id, language_id=language_id).first()
             if not init_code:
-                logger.warning(f"Code template not found for problem ID {problem_id} and language ID {language_id}")
+                logger.warning("Code template not found for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'error': 'Problem Language Code PUT Fail',
                     'detail': 'Code template for the problem does not exist in DB'
@@ -559,26 +601,26 @@ class ProblemLangCodeView(APIView):
             init_code_serializer = InitCodeSerializer(init_code, data=request.data)
             if init_code_serializer.is_valid():
                 init_code_serializer.save()
-                logger.info(f"Problem language code updated successfully for problem ID {problem_id} and language ID {language_id}")
+                logger.info("Problem language code updated successfully for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'message': 'Problem Language Code Update Success',
                     'data': init_code_serializer.data
                 }, status=status.HTTP_200_OK)
             
-            logger.warning(f"Problem language code validation failed for problem ID {problem_id}: {init_code_serializer.errors}")
+            logger.warning("Problem language code validation failed for problem ID %s: %s", problem_id, init_code_serializer.errors)
             return Response({
                 'error': 'Problem Language Code PUT Fail',
                 'detail': init_code_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except ValidationError as ve:
-            logger.warning(f"Validation error during language code update for problem ID {problem_id}: {str(ve)}")
+            logger.warning("Validation error during language code update for problem ID %s: %s", problem_id, ve)
             return Response({
                 'error': 'Problem Language Code PUT Fail',
                 'detail': f'Invalid data: {str(ve)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error during language code update for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during language code update for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Language Code PUT Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -586,7 +628,7 @@ class ProblemLangCodeView(APIView):
 
     def patch(self, request, problem_id):
         try:
-            logger.info(f"Problem language code partial update request initiated for problem ID: {problem_id}")
+            logger.info("Problem language code partial update request initiated for problem ID: %s", problem_id)
 
             language_id = request.query_params.get('language_id')
             if not language_id:
@@ -599,9 +641,9 @@ class ProblemLangCodeView(APIView):
             # Validate that the provided language_id exists
             try:
                 language = Language.objects.get(id=language_id)
-                logger.debug(f"Language with ID {language_id} found")
+                logger.debug("Language with ID %s found", language_id)
             except Language.DoesNotExist:
-                logger.warning(f"Language with ID {language_id} not found in PATCH request")
+                logger.warning("Language with ID %s not found in PATCH request", language_id)
                 return Response({
                     'error': 'Problem Language Code PATCH Fail',
                     'detail': f'Language with id {language_id} does not exist'
@@ -609,7 +651,7 @@ class ProblemLangCodeView(APIView):
 
             init_code = InitCode.objects.filter(problem_id=problem_id, language_id=language_id).first()
             if not init_code:
-                logger.warning(f"Code template not found for problem ID {problem_id} and language ID {language_id}")
+                logger.warning("Code template not found for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'error': 'Problem Language Code PATCH Fail',
                     'detail': 'Code template for the problem does not exist in DB'
@@ -618,26 +660,26 @@ class ProblemLangCodeView(APIView):
             init_code_serializer = InitCodeSerializer(init_code, data=request.data, partial=True)
             if init_code_serializer.is_valid():
                 init_code_serializer.save()
-                logger.info(f"Problem language code partially updated successfully for problem ID {problem_id} and language ID {language_id}")
+                logger.info("Problem language code partially updated successfully for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'message': 'Problem Language Code Partial Update Success',
                     'data': init_code_serializer.data
                 }, status=status.HTTP_200_OK)
             
-            logger.warning(f"Problem language code validation failed for problem ID {problem_id}: {init_code_serializer.errors}")
+            logger.warning("Problem language code validation failed for problem ID %s: %s", problem_id, init_code_serializer.errors)
             return Response({
                 'error': 'Problem Language Code PATCH Fail',
                 'detail': init_code_serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
         except ValidationError as ve:
-            logger.warning(f"Validation error during language code partial update for problem ID {problem_id}: {str(ve)}")
+            logger.warning("Validation error during language code partial update for problem ID %s: %s", problem_id, ve)
             return Response({
                 'error': 'Problem Language Code PATCH Fail',
                 'detail': f'Invalid data: {str(ve)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error during language code partial update for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during language code partial update for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Language Code PATCH Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -645,7 +687,7 @@ class ProblemLangCodeView(APIView):
 
     def delete(self, request, problem_id):
         try:
-            logger.info(f"Problem language code deletion request initiated for problem ID: {problem_id}")
+            logger.info("Problem language code deletion request initiated for problem ID: %s", problem_id)
 
             language_id = request.query_params.get('language_id')
             if not language_id:
@@ -658,9 +700,9 @@ class ProblemLangCodeView(APIView):
             # Validate that the provided language_id exists
             try:
                 language = Language.objects.get(id=language_id)
-                logger.debug(f"Language with ID {language_id} found")
+                logger.debug("Language with ID %s found", language_id)
             except Language.DoesNotExist:
-                logger.warning(f"Language with ID {language_id} not found in DELETE request")
+                logger.warning("Language with ID %s not found in DELETE request", language_id)
                 return Response({
                     'error': 'Problem Language Code DELETE Fail',
                     'detail': f'Language with id {language_id} does not exist'
@@ -668,26 +710,26 @@ class ProblemLangCodeView(APIView):
 
             init_code = InitCode.objects.filter(problem_id=problem_id, language_id=language_id).first()
             if not init_code:
-                logger.warning(f"Code template not found for problem ID {problem_id} and language ID {language_id}")
+                logger.warning("Code template not found for problem ID %s and language ID %s", problem_id, language_id)
                 return Response({
                     'error': 'Problem Language Code DELETE Fail',
                     'detail': 'Code template for the problem does not exist in DB'
                 }, status=status.HTTP_404_NOT_FOUND)
 
             init_code.delete()
-            logger.info(f"Problem language code deleted successfully for problem ID {problem_id} and language ID {language_id}")
+            logger.info("Problem language code deleted successfully for problem ID %s and language ID %s", problem_id, language_id)
             return Response({
                 'message': 'Problem Language Code DELETE Success'
             }, status=status.HTTP_204_NO_CONTENT)
 
         except ValidationError as ve:
-            logger.warning(f"Validation error during language code deletion for problem ID {problem_id}: {str(ve)}")
+            logger.warning("Validation error during language code deletion for problem ID %s: %s", problem_id, ve)
             return Response({
                 'error': 'Problem Language Code DELETE Fail',
                 'detail': f'Invalid data: {str(ve)}'
             }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Unexpected error during language code deletion for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during language code deletion for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Language Code DELETE Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'
@@ -700,7 +742,7 @@ class ProblemLangCodeView(APIView):
 class ProblemTestcaseView(APIView):
     # Save testcase
     def post(self, request, problem_id):
-        logger.info(f"Problem testcase upload initiated for problem ID: {problem_id}")
+        logger.info("Problem testcase upload initiated for problem ID: %s", problem_id)
         
         testcase_type = request.query_params.get('testcase_type')
         if not testcase_type:
@@ -724,7 +766,7 @@ class ProblemTestcaseView(APIView):
             try:
                 # Get the problem name : Definitely unique
                 title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-                logger.debug(f"Problem with ID {problem_id} found, title: {title}")
+                logger.debug("Problem with ID %s found, title: %s", problem_id, title)
 
                 # testcase_dir_name : Generate the directory name for storing test cases
                 testcase_dir_name = title.strip().lower().replace(" ", "_") + testcase_type
@@ -739,45 +781,30 @@ class ProblemTestcaseView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                # Create extraction path
+                # Build the files and info.json aside, then swap them in (see install_testcases)
                 extract_path = Path(TESTCASE_BASE_DIR) / testcase_dir_name
-                if not extract_path.exists():
-                    extract_path.mkdir(parents=True, exist_ok=True)
-                
-                zip_file_path = Path(extract_path) / zip_file.name
-
-                # Save the uploaded zip file
-                with open(zip_file_path, 'wb') as f:
-                    for chunk in zip_file.chunks():
-                        f.write(chunk)
-                
-                logger.debug(f"Zip file saved successfully at {zip_file_path}")
-
-                # 1. extract_zip : Extract the zip file at the extraction path
-                extract_zip(zip_file_path, extract_path)
-                logger.debug(f"Zip file extracted successfully at {extract_path}")
-
-                # 2. collect_file_info : Organize the contents of the zip file
-                data = collect_file_info(extract_path)
-
-                # 3. save_to_json : Save the result of step 2 as info.json
-                info_json_path = extract_path / 'info.json'
-                save_to_json(data, info_json_path)
-                logger.debug(f"File information saved as JSON at {info_json_path}")
-
-                zip_file_path.unlink()  # Remove the zip file
-                logger.info(f"Problem testcase upload and processing successful for problem ID {problem_id}")
+                data = install_testcases(
+                    zip_file,
+                    extract_path,
+                    request.query_params.get('checker', 'exact'),
+                    request.query_params.get('abs_error'),
+                    request.query_params.get('rel_error'),
+                )
+                invalidate_testcase_manifest(extract_path)
+                logger.debug("Zip file extracted and information saved as JSON at %s", extract_path / 'info.json')
+                logger.info("Problem testcase upload and processing successful for problem ID %s", problem_id)
 
                 # Compose the response
                 response_data = {
                     'message': 'Testcase File Save Success',
                     'testcase_name': testcase_dir_name,
                     'extracted_files': data.get('testcase_number', 0),
+                    'checker': data['checker']['type'],
                 }
                 return Response(response_data, status=status.HTTP_201_CREATED)
 
             except Problem.DoesNotExist:
-                logger.warning(f"Problem with ID {problem_id} not found in POST request")
+                logger.warning("Problem with ID %s not found in POST request", problem_id)
                 return Response({
                     'error': 'Problem Testcase POST Fail',
                     'detail': f'Problem with ID {problem_id} not found'},
@@ -790,15 +817,22 @@ class ProblemTestcaseView(APIView):
                     'detail': 'Uploaded file is not a valid zip file'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            except ValueError as value_error:
+                logger.warning("Invalid checker setup in POST request: %s", value_error)
+                return Response({
+                    'error': 'Problem Testcase POST Fail',
+                    'detail': str(value_error)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             except IOError as io_error:
-                logger.error(f"File I/O error occurred during POST request: {str(io_error)}", exc_info=True)
+                logger.error("File I/O error occurred during POST request: %s", io_error, exc_info=True)
                 return Response({
                     'error': 'Problem Testcase POST Fail',
                     'detail': f'File I/O error occurred: {str(io_error)}'},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             except Exception as e:
-                logger.error(f"Unexpected error during POST request for problem ID {problem_id}: {str(e)}", exc_info=True)
+                logger.error("Unexpected error during POST request for problem ID %s: %s", problem_id, e, exc_info=True)
                 return Response({
                     'error': 'Problem Testcase POST Fail',
                     'detail': f'An unexpected error occurred: {str(e)}'},
@@ -814,7 +848,7 @@ class ProblemTestcaseView(APIView):
         
     # Load testcase
     def get(self, request, problem_id):
-        logger.info(f"Problem testcase retrieval initiated for problem ID: {problem_id}")
+        logger.info("Problem testcase retrieval initiated for problem ID: %s", problem_id)
 
         testcase_type = request.query_params.get('testcase_type')
         if not testcase_type or testcase_type not in {'_run', '_submit'}:
@@ -827,13 +861,13 @@ class ProblemTestcaseView(APIView):
         try:
             # Retrieve and process the problem title
             title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found, title: {title}")
+            logger.debug("Problem with ID %s found, title: %s", problem_id, title)
 
             # Directory path based on testcase_type
             directory_path = Path(TESTCASE_BASE_DIR) / (title.strip().lower().replace(" ", "_") + testcase_type)
 
             if not directory_path.exists():
-                logger.warning(f"Testcase directory not found for problem ID {problem_id} and testcase_type {testcase_type}")
+                logger.warning("Testcase directory not found for problem ID %s and testcase_type %s", problem_id, testcase_type)
                 return Response({
                     'error': 'Problem Testcase GET Fail',
                     'detail': 'Directory not found for the given testcase_type'},
@@ -856,7 +890,7 @@ class ProblemTestcaseView(APIView):
                         else:
                             raise FileNotFoundError(f"Output file corresponding to {in_file.name} not found in {sub_directory}")
                 except Exception as e:
-                    logger.error(f"Error reading files in directory {sub_directory}: {str(e)}", exc_info=True)
+                    logger.error("Error reading files in directory %s: %s", sub_directory, e, exc_info=True)
                     raise IOError(f"Error reading files in directory {sub_directory}: {str(e)}")
                 return data, len(data)
 
@@ -868,32 +902,32 @@ class ProblemTestcaseView(APIView):
                 'testcase_name': title + testcase_type,
                 'contents': contents
             }
-            logger.info(f"Testcase retrieval successful for problem ID {problem_id}")
+            logger.info("Testcase retrieval successful for problem ID %s", problem_id)
             return Response(final_response_data, status=status.HTTP_200_OK)
 
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found in GET request")
+            logger.warning("Problem with ID %s not found in GET request", problem_id)
             return Response({
                 'error': 'Problem Testcase GET Fail',
                 'detail': f'Problem with ID {problem_id} not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         except FileNotFoundError as fnf_error:
-            logger.warning(f"File not found error during GET request: {str(fnf_error)}")
+            logger.warning("File not found error during GET request: %s", fnf_error)
             return Response({
                 'error': 'Problem Testcase GET Fail',
                 'detail': str(fnf_error)},
                 status=status.HTTP_404_NOT_FOUND
             )
         except IOError as io_error:
-            logger.error(f"I/O error occurred during GET request: {str(io_error)}", exc_info=True)
+            logger.error("I/O error occurred during GET request: %s", io_error, exc_info=True)
             return Response({
                 'error': 'Problem Testcase GET Fail',
                 'detail': str(io_error)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         except Exception as e:
-            logger.error(f"Unexpected error during GET request for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during GET request for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Testcase GET Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'},
@@ -902,7 +936,7 @@ class ProblemTestcaseView(APIView):
     
     # Update testcase (replace all files)
     def put(self, request, problem_id):
-        logger.info(f"Problem testcase update initiated for problem ID: {problem_id}")
+        logger.info("Problem testcase update initiated for problem ID: %s", problem_id)
 
         testcase_type = request.GET.get('testcase_type')
         if not testcase_type or testcase_type not in {'_run', '_submit'}:
@@ -918,7 +952,7 @@ class ProblemTestcaseView(APIView):
             try:
                 # Retrieve the problem title
                 title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-                logger.debug(f"Problem with ID {problem_id} found, title: {title}")
+                logger.debug("Problem with ID %s found, title: %s", problem_id, title)
 
                 # Generate the directory name based on the testcase_type
                 testcase_dir_name = title.strip().lower().replace(" ", "_") + testcase_type
@@ -933,53 +967,32 @@ class ProblemTestcaseView(APIView):
                         status=status.HTTP_400_BAD_REQUEST
                     )
 
-                # Define the extraction path
+                # Replace the existing files only once the new ones are valid (see install_testcases)
                 extract_path = Path(TESTCASE_BASE_DIR) / testcase_dir_name
-
-                # Remove existing files in the directory before replacing
-                if extract_path.exists():
-                    for file in extract_path.glob("*"):
-                        file.unlink()
-
-                extract_path.mkdir(parents=True, exist_ok=True)
-
-                # Define the full path to save the uploaded zip file
-                zip_file_path = extract_path / zip_file.name
-
-                # Save the uploaded zip file
-                with open(zip_file_path, 'wb') as f:
-                    for chunk in zip_file.chunks():
-                        f.write(chunk)
-                
-                logger.debug(f"Zip file saved successfully at {zip_file_path}")
-
-                # Extract the contents of the zip file
-                extract_zip(zip_file_path, extract_path)
-                logger.debug(f"Zip file extracted successfully at {extract_path}")
-
-                # Collect file information from the extracted contents
-                data = collect_file_info(extract_path)
-
-                # Save the collected information to an info.json file
-                info_json_path = extract_path / 'info.json'
-                save_to_json(data, info_json_path)
-                logger.debug(f"File information saved as JSON at {info_json_path}")
-
-                # Remove the uploaded zip file after extraction
-                zip_file_path.unlink()
-                logger.info(f"Problem testcase update successful for problem ID {problem_id}")
+                data = install_testcases(
+                    zip_file,
+                    extract_path,
+                    request.GET.get('checker', 'exact'),
+                    request.GET.get('abs_error'),
+                    request.GET.get('rel_error'),
+                    replace=True,
+                )
+                invalidate_testcase_manifest(extract_path)
+                logger.debug("Zip file extracted and information saved as JSON at %s", extract_path / 'info.json')
+                logger.info("Problem testcase update successful for problem ID %s", problem_id)
 
                 # Prepare the response data
                 response_data = {
                     'message': 'Testcase File Update Success',
                     'testcase_name': testcase_dir_name,
                     'extracted_files': data.get('testcase_number', 0),
+                    'checker': data['checker']['type'],
                 }
 
                 return Response(response_data, status=status.HTTP_200_OK)
 
             except Problem.DoesNotExist:
-                logger.warning(f"Problem with ID {problem_id} not found in PUT request")
+                logger.warning("Problem with ID %s not found in PUT request", problem_id)
                 return Response({
                     'error': 'Problem Testcase PUT Fail',
                     'detail': f'Problem with ID {problem_id} not found'},
@@ -992,15 +1005,22 @@ class ProblemTestcaseView(APIView):
                     'detail': 'Uploaded file is not a valid zip file'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            except ValueError as value_error:
+                logger.warning("Invalid checker setup in PUT request: %s", value_error)
+                return Response({
+                    'error': 'Problem Testcase PUT Fail',
+                    'detail': str(value_error)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             except IOError as io_error:
-                logger.error(f"File I/O error occurred during PUT request: {str(io_error)}", exc_info=True)
+                logger.error("File I/O error occurred during PUT request: %s", io_error, exc_info=True)
                 return Response({
                     'error': 'Problem Testcase PUT Fail',
                     'detail': f'File I/O error occurred: {str(io_error)}'},
                     status=status.HTTP_500_INTERNAL_SERVER_ERROR
                 )
             except Exception as e:
-                logger.error(f"Unexpected error during PUT request for problem ID {problem_id}: {str(e)}", exc_info=True)
+                logger.error("Unexpected error during PUT request for problem ID %s: %s", problem_id, e, exc_info=True)
                 return Response({
                     'error': 'Problem Testcase PUT Fail',
                     'detail': f'An unexpected error occurred: {str(e)}'},
@@ -1016,7 +1036,7 @@ class ProblemTestcaseView(APIView):
 
     # Delete testcase (remove entire directory)
     def delete(self, request, problem_id):
-        logger.info(f"Problem testcase deletion initiated for problem ID: {problem_id}")
+        logger.info("Problem testcase deletion initiated for problem ID: %s", problem_id)
 
         testcase_type = request.GET.get('testcase_type')
         if not testcase_type or testcase_type not in {'_run', '_submit'}:
@@ -1030,7 +1050,7 @@ class ProblemTestcaseView(APIView):
         try:
             # Retrieve the problem title
             title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found, title: {title}")
+            logger.debug("Problem with ID %s found, title: %s", problem_id, title)
 
             # Generate the directory name based on the testcase_type
             testcase_dir_name = title.strip().lower().replace(" ", "_") + testcase_type
@@ -1039,18 +1059,17 @@ class ProblemTestcaseView(APIView):
             delete_path = Path(TESTCASE_BASE_DIR) / testcase_dir_name
 
             if delete_path.exists() and delete_path.is_dir():
-                for file in delete_path.glob("*"):
-                    file.unlink()  # Remove all files in the directory
-                delete_path.rmdir()  # Remove the directory itself
+                remove_testcases(delete_path)  # The link and every version behind it (see install_testcases)
+                invalidate_testcase_manifest(delete_path)
 
-                logger.info(f"Testcase directory deleted successfully for problem ID {problem_id} and testcase_type {testcase_type}")
+                logger.info("Testcase directory deleted successfully for problem ID %s and testcase_type %s", problem_id, testcase_type)
                 return Response({
                     'message': 'Testcase Directory Delete Success',
                     'testcase_name': testcase_dir_name},
                     status=status.HTTP_204_NO_CONTENT
                 )
             else:
-                logger.warning(f"Testcase directory not found for problem ID {problem_id} and testcase_type {testcase_type}")
+                logger.warning("Testcase directory not found for problem ID %s and testcase_type %s", problem_id, testcase_type)
                 return Response({
                     'error': 'Problem Testcase DELETE Fail',
                     'detail': 'Testcase directory not found'},
@@ -1058,14 +1077,14 @@ class ProblemTestcaseView(APIView):
                 )
 
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found in DELETE request")
+            logger.warning("Problem with ID %s not found in DELETE request", problem_id)
             return Response({
                 'error': 'Problem Testcase DELETE Fail',
                 'detail': f'Problem with ID {problem_id} not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         except Exception as e:
-            logger.error(f"Unexpected error during DELETE request for problem ID {problem_id}: {str(e)}", exc_info=True)
+            logger.error("Unexpected error during DELETE request for problem ID %s: %s", problem_id, e, exc_info=True)
             return Response({
                 'error': 'Problem Testcase DELETE Fail',
                 'detail': f'An unexpected error occurred: {str(e)}'},
@@ -1081,7 +1100,7 @@ class ProblemTestcaseView(APIView):
 @permission_classes([IsAuthenticated])
 def get_problem_submission_list(request, problem_id):
     try:
-        logger.info(f"Problem submission list request initiated for problem ID: {problem_id}")
+        logger.info("Problem submission list request initiated for problem ID: %s", problem_id)
 
         # Check for Authorization header
         auth_header = request.headers.get('Authorization')
@@ -1092,14 +1111,19 @@ def get_problem_submission_list(request, problem_id):
                 "detail": "Invalid Token or No access token provided"
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        access_token = auth_header.split(' ')[1]
-        social_token = SocialToken.objects.get(token=access_token)
+        social_token = get_request_token(request)
+        if social_token is None:
+            logger.warning("SocialToken does not exist for the provided access token")
+            return Response({
+                "error": "Problem Submission List GET Fail",
+                "detail": "Invalid or expired access token"
+            }, status=status.HTTP_401_UNAUTHORIZED)
         user_id = social_token.account_id
-        logger.debug(f"User ID {user_id} retrieved from social token")
+        logger.debug("User ID %s retrieved from social token", user_id)
 
         # Validate that the problem exists
         if not Problem.objects.filter(id=problem_id).exists():
-            logger.warning(f"Problem with ID {problem_id} does not exist")
+            logger.warning("Problem with ID %s does not exist", problem_id)
             return Response({
                 'error': 'Problem Submission List GET Fail',
                 'detail': f'Problem with id {problem_id} does not exist'
@@ -1110,7 +1134,7 @@ def get_problem_submission_list(request, problem_id):
         # Serialize the submissions, excluding submission_detail
         serializer = SubmissionSerializer(submissions, many=True, context={'exclude_submission_detail': True})
         
-        logger.info(f"Problem submission list retrieval successful for problem ID {problem_id}: {len(serializer.data)} submissions found")
+        logger.info("Problem submission list retrieval successful for problem ID %s: %s submissions found", problem_id, len(serializer.data))
         return Response({
             'message': f'Problem Submission List Retrieval Success: {len(serializer.data)} submissions found',
             'data': serializer.data},
@@ -1118,7 +1142,7 @@ def get_problem_submission_list(request, problem_id):
         )
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem submission list retrieval for problem ID {problem_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem submission list retrieval for problem ID %s: %s", problem_id, e, exc_info=True)
         return Response({
             'error': 'Problem Submission List GET Fail',
             'detail': str(e)
@@ -1132,7 +1156,7 @@ def get_problem_submission_list(request, problem_id):
 @permission_classes([IsAuthenticated])
 def get_problem_submission_detail(request, problem_id, submission_id):
     try:
-        logger.info(f"Problem submission detail request initiated for problem ID: {problem_id}, submission ID: {submission_id}")
+        logger.info("Problem submission detail request initiated for problem ID: %s, submission ID: %s", problem_id, submission_id)
 
         # Check for Authorization header
         auth_header = request.headers.get('Authorization')
@@ -1143,14 +1167,19 @@ def get_problem_submission_detail(request, problem_id, submission_id):
                 "detail": "Invalid Token or No access token provided"
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        access_token = auth_header.split(' ')[1]
-        social_token = SocialToken.objects.get(token=access_token)
+        social_token = get_request_token(request)
+        if social_token is None:
+            logger.warning("SocialToken does not exist for the provided access token")
+            return Response({
+                "error": "Problem Submission Detail GET Fail",
+                "detail": "Invalid or expired access token"
+            }, status=status.HTTP_401_UNAUTHORIZED)
         user_id = social_token.account_id
-        logger.debug(f"User ID {user_id} retrieved from social token")
+        logger.debug("User ID %s retrieved from social token", user_id)
 
         # Validate that the problem exists
         if not Problem.objects.filter(id=problem_id).exists():
-            logger.warning(f"Problem with ID {problem_id} does not exist")
+            logger.warning("Problem with ID %s does not exist", problem_id)
             return Response({
                 'error': 'Problem Submission Detail GET Fail',
                 'detail': f'Problem with id {problem_id} does not exist'
@@ -1159,9 +1188,9 @@ def get_problem_submission_detail(request, problem_id, submission_id):
         # Retrieve the specific submission related to the given problem_id and submission_id for the current user
         try:
             submission = Submission.objects.select_related('submission_detail').get(id=submission_id, problem_id=problem_id, user_id=user_id)
-            logger.debug(f"Submission ID {submission_id} found for problem ID {problem_id}")
+            logger.debug("Submission ID %s found for problem ID %s", submission_id, problem_id)
         except Submission.DoesNotExist:
-            logger.warning(f"Submission with ID {submission_id} for problem ID {problem_id} not found")
+            logger.warning("Submission with ID %s for problem ID %s not found", submission_id, problem_id)
             return Response({
                 'error': 'Problem Submission Detail GET Fail',
                 'detail': 'Submission not found for this problem'
@@ -1169,7 +1198,7 @@ def get_problem_submission_detail(request, problem_id, submission_id):
 
         # Serialize the submission including submission_detail
         serializer = SubmissionSerializer(submission)
-        logger.info(f"Problem submission detail retrieval successful for submission ID {submission_id}")
+        logger.info("Problem submission detail retrieval successful for submission ID %s", submission_id)
         return Response({
             'message': 'Problem Submission Detail Retrieval Success',
             'data': serializer.data},
@@ -1177,7 +1206,7 @@ def get_problem_submission_detail(request, problem_id, submission_id):
         )
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem submission detail retrieval for submission ID {submission_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem submission detail retrieval for submission ID %s: %s", submission_id, e, exc_info=True)
         return Response({
             'error': 'Problem Submission Detail GET Fail',
             'detail': str(e)
@@ -1188,8 +1217,8 @@ def get_problem_submission_detail(request, problem_id, submission_id):
 #                 Code Judgement                #
 #################################################
 
-def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, max_real_time, max_memory):
-    logger.info(f"Judgement process initiated for language: {language}, testcase_dir_name: {testcase_dir_name}")
+def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, max_real_time, max_memory, stop_on_failure=False):
+    logger.info("Judgement process initiated for language: %s, testcase_dir_name: %s", language, testcase_dir_name)
 
     language_config = lang_config[language]
 
@@ -1205,7 +1234,7 @@ def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, ma
             main_src_path = os.path.join(submission_dir, language_config["run"]["exe_name"])  # Main file path
             user_src_path = os.path.join(submission_dir, language_config["run"]["solution_name"])  # User solution file path
 
-        logger.debug(f"Main source path: {main_src_path}, User source path: {user_src_path}")
+        logger.debug("Main source path: %s, User source path: %s", main_src_path, user_src_path)
 
         """
         Prepare User Code and Main Execution Code 
@@ -1217,9 +1246,9 @@ def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, ma
                 f.write(user_code)  # User code
                 if language == "js":
                     f.write(r"""module.exports = { solution };""")
-            logger.debug(f"User code and main code written to respective paths")
+            logger.debug("User code and main code written to respective paths")
         except IOError as io_error:
-            logger.error(f"Failed to write code files: {str(io_error)}", exc_info=True)
+            logger.error("Failed to write code files: %s", io_error, exc_info=True)
             raise
 
         """
@@ -1234,17 +1263,17 @@ def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, ma
             else:  # js
                 exe_path = main_src_path
 
-            logger.info(f"Compilation process completed. Executable path: {exe_path}")
+            logger.info("Compilation process completed. Executable path: %s", exe_path)
         except Exception as e:
-            logger.error(f"Compilation failed: {str(e)}", exc_info=True)
+            logger.error("Compilation failed: %s", e, exc_info=True)
             raise
 
         """
         Compile Error + Undefined Behavior (No compile error message even when compile error occurred)
         """
         if compile_error_msg or (language != "java" and not os.path.exists(exe_path)):
-            logger.warning(f"Compilation error or executable not found for language: {language}, error: {compile_error_msg}")
-            return None, compile_error_msg
+            logger.warning("Compilation error or executable not found for language: %s, error: %s", language, compile_error_msg)
+            return None, compile_error_msg, None
 
         """
         Code Judgement Executing Instance
@@ -1258,15 +1287,15 @@ def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, ma
             testcase_dir=testcase_dir,
             submission_dir=submission_dir
         )
-        logger.info(f"Judgement client initialized for execution.")
+        logger.info("Judgement client initialized for execution.")
 
         """
         Real Execution (REAL RUN)
         """
-        results = judge_client.run()
-        logger.info(f"Judgement execution completed with results.")
+        results = judge_client.run(stop_on_failure=stop_on_failure)
+        logger.info("Judgement execution completed with results. Schedule stats: %s, build cache: %s", judge_client.stats, build_cache_stats())
     
-    return results, compile_error_msg
+    return results, compile_error_msg, judge_client.stats
 
 
 """
@@ -1277,12 +1306,12 @@ def do_judge(language, main_code, user_code, testcase_dir_name, max_cpu_time, ma
 def problem_run(request, problem_id):
     """ Preprocessing for Code Judgement Execution """
     try:
-        logger.info(f"Problem run request initiated for problem ID: {problem_id}")
+        logger.info("Problem run request initiated for problem ID: %s", problem_id)
 
         # Validate the incoming request data
         serializer = ProblemRunRequestSerializer(data=request.data)
         if not serializer.is_valid():
-            logger.warning(f"Validation failed for problem run request: {serializer.errors}")
+            logger.warning("Validation failed for problem run request: %s", serializer.errors)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': serializer.errors},
@@ -1292,12 +1321,12 @@ def problem_run(request, problem_id):
         # Extract validated data
         testcase = serializer.validated_data.get('testcase')
         user_code = serializer.validated_data.get('solution')
-        logger.debug(f"Testcase and solution code extracted from the request data.")
+        logger.debug("Testcase and solution code extracted from the request data.")
 
         # Obtain selected language from query parameters
         language_id = request.query_params.get('language_id')
         if not language_id:
-            logger.warning(f"language_id query parameter missing in problem run request")
+            logger.warning("language_id query parameter missing in problem run request")
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'language_id is required as a query parameter'},
@@ -1307,9 +1336,9 @@ def problem_run(request, problem_id):
         try:
             language = Language.objects.get(id=language_id)
             language_type = language.language
-            logger.debug(f"Language ID {language_id} found, language: {language_type}")
+            logger.debug("Language ID %s found, language: %s", language_id, language_type)
         except Language.DoesNotExist:
-            logger.warning(f"Language with ID {language_id} not found")
+            logger.warning("Language with ID %s not found", language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Language type not found'},
@@ -1319,9 +1348,9 @@ def problem_run(request, problem_id):
         # Obtain testcase name using title
         try:
             title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found")
+            logger.debug("Problem with ID %s found", problem_id)
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found")
+            logger.warning("Problem with ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Requested problem does not exist in DB'},
@@ -1330,7 +1359,7 @@ def problem_run(request, problem_id):
         try:
             max_constraint = CodeJudgeMaxConstraint.objects.get(problem_id=problem_id, language_id=language_id)
         except CodeJudgeMaxConstraint.DoesNotExist:
-            logger.warning(f"Maximum Constraints for problem ID {problem_id} or language ID {language_id} not found")
+            logger.warning("Maximum Constraints for problem ID %s or language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Maximum Constraints for requested problem and language does not exist in DB'},
@@ -1342,9 +1371,9 @@ def problem_run(request, problem_id):
         # Retrieve the main code for the problem and language
         try:
             main_code = InitCode.objects.values_list('run_code', flat=True).get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Main code retrieved for problem ID {problem_id} and language ID {language_id}")
+            logger.debug("Main code retrieved for problem ID %s and language ID %s", problem_id, language_id)
         except InitCode.DoesNotExist:
-            logger.warning(f"Main code for problem ID {problem_id} and language ID {language_id} not found")
+            logger.warning("Main code for problem ID %s and language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': '`Main` code for the problem and language is not found'},
@@ -1354,8 +1383,8 @@ def problem_run(request, problem_id):
         """
         Code Judgement Execution
         """
-        logger.info(f"Starting code judgement execution for problem ID {problem_id}")
-        judge_result, compile_error_msg = do_judge(
+        logger.info("Starting code judgement execution for problem ID %s", problem_id)
+        judge_result, compile_error_msg, judge_stats = do_judge(
             language_type,
             main_code,
             user_code,
@@ -1367,7 +1396,7 @@ def problem_run(request, problem_id):
 
         if not judge_result:  # Something wrong..
             if compile_error_msg:
-                logger.warning(f"Compile error during judgement execution: {compile_error_msg}")
+                logger.warning("Compile error during judgement execution: %s", compile_error_msg)
                 return Response({
                     'message': 'COMPILE_ERROR',
                     'err_msg': compile_error_msg
@@ -1392,7 +1421,7 @@ def problem_run(request, problem_id):
             testcase_result = SUBMISSION_RESULT.get(result['result'], "")
             testcase_num = result['testcase']
             if not testcase_result:
-                logger.error(f"Unexpected run result for testcase number {testcase_num}: {testcase_result}")
+                logger.error("Unexpected run result for testcase number %s: %s", testcase_num, testcase_result)
                 return Response({
                     'error': 'Problem Run POST Fail',
                     'detail': f'Unexpected Run result - {testcase_num} testcase result : {testcase_result}'},
@@ -1417,15 +1446,16 @@ def problem_run(request, problem_id):
                 result_info['user_out'] = result['output']
             response_data[testcase_num] = result_info
         
-        logger.info(f"Problem run successful for problem ID {problem_id}")
+        logger.info("Problem run successful for problem ID %s", problem_id)
         return Response({
             'message': 'Problem Run Successful Complete',
-            'data': response_data},
+            'data': response_data,
+            'judge_stats': judge_stats},
             status=status.HTTP_200_OK
         )
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem run for problem ID {problem_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem run for problem ID %s: %s", problem_id, e, exc_info=True)
         return Response({
             'error': 'Problem Run POST Fail',
             'detail': str(e)
@@ -1438,12 +1468,12 @@ def problem_run(request, problem_id):
 def problem_run_for_task(request, problem_id):
     """ Preprocessing for Code Judgement Execution """
     try:
-        logger.info(f"Problem run request initiated for problem ID: {problem_id}")
+        logger.info("Problem run request initiated for problem ID: %s", problem_id)
 
         # Validate the incoming request data
         serializer = ProblemRunRequestSerializer(data=request.data)
         if not serializer.is_valid():
-            logger.warning(f"Validation failed for problem run request: {serializer.errors}")
+            logger.warning("Validation failed for problem run request: %s", serializer.errors)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': serializer.errors
@@ -1452,12 +1482,12 @@ def problem_run_for_task(request, problem_id):
         # Extract validated data
         testcase = serializer.validated_data.get('testcase')
         user_code = serializer.validated_data.get('solution')
-        logger.debug(f"Testcase and solution code extracted from the request data.")
+        logger.debug("Testcase and solution code extracted from the request data.")
 
         # Obtain selected language from query parameters
         language_id = request.query_params.get('language_id')
         if not language_id:
-            logger.warning(f"language_id query parameter missing in problem run request")
+            logger.warning("language_id query parameter missing in problem run request")
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'language_id is required as a query parameter'
@@ -1466,9 +1496,9 @@ def problem_run_for_task(request, problem_id):
         try:
             language = Language.objects.get(id=language_id)
             language_type = language.language
-            logger.debug(f"Language ID {language_id} found, language: {language_type}")
+            logger.debug("Language ID %s found, language: %s", language_id, language_type)
         except Language.DoesNotExist:
-            logger.warning(f"Language with ID {language_id} not found")
+            logger.warning("Language with ID %s not found", language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Language type not found'
@@ -1477,9 +1507,9 @@ def problem_run_for_task(request, problem_id):
         # Obtain testcase name using title
         try:
             title = Problem.objects.values_list('title', flat=True).get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found")
+            logger.debug("Problem with ID %s found", problem_id)
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found")
+            logger.warning("Problem with ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Requested problem does not exist in DB'
@@ -1488,7 +1518,7 @@ def problem_run_for_task(request, problem_id):
         try:
             max_constraint = CodeJudgeMaxConstraint.objects.get(problem_id=problem_id, language_id=language_id)
         except CodeJudgeMaxConstraint.DoesNotExist:
-            logger.warning(f"Maximum Constraints for problem ID {problem_id} or language ID {language_id} not found")
+            logger.warning("Maximum Constraints for problem ID %s or language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': 'Maximum Constraints for requested problem and language does not exist in DB'
@@ -1499,9 +1529,9 @@ def problem_run_for_task(request, problem_id):
         # Retrieve the main code for the problem and language
         try:
             main_code = InitCode.objects.values_list('run_code', flat=True).get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Main code retrieved for problem ID {problem_id} and language ID {language_id}")
+            logger.debug("Main code retrieved for problem ID %s and language ID %s", problem_id, language_id)
         except InitCode.DoesNotExist:
-            logger.warning(f"Main code for problem ID {problem_id} and language ID {language_id} not found")
+            logger.warning("Main code for problem ID %s and language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': '`Main` code for the problem and language is not found'
@@ -1510,7 +1540,7 @@ def problem_run_for_task(request, problem_id):
         """
         Code Judgement Execution
         """
-        logger.info(f"Starting code judgement execution for problem ID {problem_id}")
+        logger.info("Starting code judgement execution for problem ID %s", problem_id)
 
         # Call do_judge function asynchronously
         try:
@@ -1524,7 +1554,7 @@ def problem_run_for_task(request, problem_id):
                 max_constraint.max_memory
             )
         except Exception as e:
-            logger.error(f"Failed to start do_judge_for_task: {str(e)}", exc_info=True)
+            logger.error("Failed to start do_judge_for_task: %s", e, exc_info=True)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': f'Failed to initiate the judgment task: {str(e)}'
@@ -1541,9 +1571,9 @@ def problem_run_for_task(request, problem_id):
 
         # Fetch the result of the do_judge task (this may block if not ready)
         try:
-            judge_result, compile_error_msg = judge_task.get(timeout=10)  # Timeout for getting the result
+            judge_result, compile_error_msg, judge_stats = judge_task.get(timeout=10)  # Timeout for getting the result
         except Exception as e:
-            logger.error(f"Failed to get judgment task result: {str(e)}", exc_info=True)
+            logger.error("Failed to get judgment task result: %s", e, exc_info=True)
             return Response({
                 'error': 'Problem Run POST Fail',
                 'detail': f'Failed to get judgment task result : {str(e)}'
@@ -1552,7 +1582,7 @@ def problem_run_for_task(request, problem_id):
         # If there was a compile error
         if not judge_result:  # Something wrong..
             if compile_error_msg:
-                logger.warning(f"Compile error during judgement execution: {compile_error_msg}")
+                logger.warning("Compile error during judgement execution: %s", compile_error_msg)
                 return Response({
                     'run_result': 'COMPILE_ERROR',
                     'err_msg': compile_error_msg
@@ -1576,7 +1606,7 @@ def problem_run_for_task(request, problem_id):
             testcase_result = SUBMISSION_RESULT.get(result['result'], "")
             testcase_num = result['testcase']
             if not testcase_result:
-                logger.error(f"Unexpected run result for testcase number {testcase_num}: {testcase_result}")
+                logger.error("Unexpected run result for testcase number %s: %s", testcase_num, testcase_result)
                 return Response({
                     'error': 'Problem Run POST Fail',
                     'detail': f'Unexpected Run result - {testcase_num} testcase result : {testcase_result}'
@@ -1600,14 +1630,15 @@ def problem_run_for_task(request, problem_id):
                 result_info['user_out'] = result['output']
             response_data[testcase_num] = result_info
 
-        logger.info(f"Problem run successful for problem ID {problem_id}")
+        logger.info("Problem run successful for problem ID %s", problem_id)
         return Response({
             'message': 'Problem Code Run Successful Complete',
-            'data': response_data
+            'data': response_data,
+            'judge_stats': judge_stats
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem run for problem ID {problem_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem run for problem ID %s: %s", problem_id, e, exc_info=True)
         return Response({
             'error': 'Problem Run POST Fail',
             'detail': str(e)
@@ -1620,32 +1651,18 @@ def problem_run_for_task(request, problem_id):
 
 def create_submission_and_response(**kwargs):
     try:
-        logger.info(f"Creating submission record for user: {kwargs.get('user')} and problem: {kwargs.get('problem')}")
+        logger.info("Creating submission record for user: %s and problem: %s", kwargs.get('user'), kwargs.get('problem'))
 
         # Parameters
         judge_result = kwargs.get('judge_result')
         compile_error_msg = kwargs.get('compile_error_msg')
+        judge_stats = kwargs.get('judge_stats')
         user = kwargs.get('user')
         problem = kwargs.get('problem')
         language = kwargs.get('language')
         user_code = kwargs.get('user_code')
         
-        """
-        Create Submission Record
-        """
-        submission = Submission.objects.create(
-            user_id=user,
-            problem_id=problem,
-            language_id=language,
-            submitted_code=user_code
-        )
-        submission_id = submission.id
-        logger.debug(f"Submission record created with ID: {submission_id}")
-        
-        testcase_ids = []
-        submission_results = []
-        run_times = []
-        memories = []
+        testcase_rows = []                  # (testcase_id, result, run_time, memory) per testcase
         submission_detail_response = []     # Response Data
         passed_num = 0                      # Solved Problem Number
         total_num = len(judge_result)      # Total Problem Number
@@ -1653,6 +1670,7 @@ def create_submission_and_response(**kwargs):
         problem_is_solved = True
         avg_run_time = 0
         avg_memory = 0
+        judged_num = 0                      # Testcases actually judged (not SKIPPED)
 
         """
         Organize Submission & SubmissionDetail
@@ -1663,7 +1681,7 @@ def create_submission_and_response(**kwargs):
             testcase_result = SUBMISSION_RESULT.get(result['result'], "")
             testcase_id = result['testcase']
             if not testcase_result:
-                logger.error(f"[Organize Submission] Unexpected Submission result - {testcase_id} testcase result : {testcase_result}")
+                logger.error("[Organize Submission] Unexpected Submission result - %s testcase result : %s", testcase_id, testcase_result)
                 raise ValueError(f'[Organize Submission] Unexpected Submission result - {testcase_id} testcase result : {testcase_result}')
 
             submission_detail = {
@@ -1677,6 +1695,13 @@ def create_submission_and_response(**kwargs):
                 }
             }
 
+            # Skipped testcases (stop on failure) are reported but not judged
+            if result['result'] == RESULT_SKIPPED:
+                testcase_rows.append((testcase_id, testcase_result, result['cpu_time'], result['memory']))
+                submission_detail_response.append(submission_detail)
+                continue
+
+            judged_num += 1
             avg_run_time += result['cpu_time']
             avg_memory += result['memory']
 
@@ -1689,76 +1714,48 @@ def create_submission_and_response(**kwargs):
             if final_result < result['result']:
                 final_result = result['result']
 
-            # DB -> Append values to the lists
-            testcase_ids.append(testcase_id)
-            submission_results.append(testcase_result)
-            run_times.append(str(result['cpu_time']))
-            memories.append(str(result['memory']))
+            # DB -> One row per testcase
+            testcase_rows.append((testcase_id, testcase_result, result['cpu_time'], result['memory']))
 
             submission_detail_response.append(submission_detail)
 
         """
         Post-processing
         """
-        if len(judge_result):
-            avg_run_time //= len(judge_result)
-            avg_memory //= len(judge_result)
+        if judged_num:
+            avg_run_time //= judged_num
+            avg_memory //= judged_num
         else:
             avg_run_time = 0
             avg_memory = 0
 
-        testcase_ids = ','.join(testcase_ids)
-        submission_results = ','.join(submission_results)
-        run_times = ','.join(run_times)
-        memories = ','.join(memories)
+        submission_result = SUBMISSION_RESULT.get(final_result, "")
+        if not submission_result:
+            logger.error("[Create Submission Record] Unexpected Submission result -> %s", final_result)
+            raise ValueError(f'[Create Submission Record] Unexpected Submission result -> {final_result}')
 
         """
-        Create SubmissionDetail Record
+        Create Submission & SubmissionDetail Records
+        The submission is inserted complete, and every row of it is written in one transaction
         """
-        SubmissionDetail.objects.create(
-            submission_id=submission,
-            testcase_id=testcase_ids,
-            submission_result=submission_results,
-            run_time=run_times,
-            memory=memories
-        )
-        logger.debug(f"SubmissionDetail record created for submission ID: {submission_id}")
+        with transaction.atomic():
+            submission = Submission.objects.create(
+                user_id=user,
+                problem_id=problem,
+                language_id=language,
+                submitted_code=user_code,
+                final_result=submission_result,
+                passed_num=passed_num,
+                total_num=total_num,
+                avg_run_time=avg_run_time,
+                avg_memory=avg_memory
+            )
+            submission_id = submission.id
+            submission_detail_record = SubmissionDetail.objects.create(submission_id=submission)
+            submission_detail_record.add_testcase_results(testcase_rows)
 
-        """
-        Update Submission Record
-        """
-        submission.passed_num = passed_num
-        submission.total_num = total_num
-        submission_result = SUBMISSION_RESULT.get(final_result, "")
-        submission.avg_run_time = avg_run_time
-        submission.avg_memory = avg_memory
-
-        if submission_result:
-            submission.final_result = submission_result
-        else:
-            logger.error(f"[Update Submission Record] Unexpected Submission result -> {final_result}")
-            raise ValueError(f'[Update Submission Record] Unexpected Submission result -> {final_result}')
-        
-        submission.save()
-        logger.info(f"Submission record updated with final results for submission ID: {submission_id}")
-        
-        submissions_a = Submission.objects.filter(problem_id=problem, user_id=user).order_by('-submitted_at')
-        serializer = SubmissionSerializer(submissions_a, many=True, context={'exclude_submission_detail': True})
-        
-        if len(serializer.data) <= 1:
-            problem.attempt_number = F('attempt_number') + 1
-        
-        # Problem Solved
-        if final_result == -2:
-            solved_num = 0
-            for i in serializer.data:
-                if i['final_result'] == "SOLVED":
-                    solved_num += 1
-            if solved_num == 1:
-                problem.solve_number = F('solve_number') + 1
-
-        problem.save()
-        logger.info(f"Problem record updated for problem ID: {problem.id}")
+            UserSolveStatus.record_judged_submission(user, problem, final_result == -2)
+        logger.info("Submission record created with final results, ID: %s", submission_id)
 
         """
         Compose response data with the code judgement execution result
@@ -1773,13 +1770,14 @@ def create_submission_and_response(**kwargs):
             'avg_memory': avg_memory,
             'submission_detail': submission_detail_response,
             'submitted_at': submission.submitted_at,
+            'judge_stats': judge_stats,
         }
 
-        logger.info(f"Submission response data composed successfully for submission ID: {submission_id}")
+        logger.info("Submission response data composed successfully for submission ID: %s", submission_id)
         return response_data
 
     except Exception as e:
-        logger.error(f"Submission creation failed: {str(e)}", exc_info=True)
+        logger.error("Submission creation failed: %s", e, exc_info=True)
         raise ValueError(f"Submission creation failed: {str(e)}")
 
 
@@ -1796,29 +1794,34 @@ def problem_submit(request, problem_id):
     Preprocessing for Code Judgement Execution
     """
     try:
-        logger.info(f"Problem submit request initiated for problem ID: {problem_id}")
+        logger.info("Problem submit request initiated for problem ID: %s", problem_id)
 
         # Check for Authorization header
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
-            logger.warning(f"Invalid access token or No access token provided in problem submit request")
+            logger.warning("Invalid access token or No access token provided in problem submit request")
             return Response({
                 "error": "Problem Submit POST Fail",
                 "detail": "Invalid access token or No access token provided"
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        access_token = auth_header.split(' ')[1]
-        social_token = SocialToken.objects.get(token=access_token)
+        social_token = get_request_token(request)
+        if social_token is None:
+            logger.warning("SocialToken does not exist for the provided access token")
+            return Response({
+                "error": "Problem Submit POST Fail",
+                "detail": "Invalid or expired access token"
+            }, status=status.HTTP_401_UNAUTHORIZED)
         user_id = social_token.account_id
 
         # Verify that the user exists
         user = get_object_or_404(User, pk=user_id)
-        logger.debug(f"User ID {user_id} verified")
+        logger.debug("User ID %s verified", user_id)
 
         # Validate the incoming request data
         serializer = ProblemSubmitSerializer(data=request.data)
         if not serializer.is_valid():
-            logger.warning(f"Validation failed for problem submit request: {serializer.errors}")
+            logger.warning("Validation failed for problem submit request: %s", serializer.errors)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': serializer.errors},
@@ -1827,12 +1830,12 @@ def problem_submit(request, problem_id):
 
         # Extract validated data
         user_code = serializer.validated_data.get('solution')
-        logger.debug(f"User solution code extracted")
+        logger.debug("User solution code extracted")
 
         # Obtain selected language from query parameters
         language_id = request.query_params.get('language_id')
         if not language_id:
-            logger.warning(f"Query parameter 'language_id' missing in problem submit request")
+            logger.warning("Query parameter 'language_id' missing in problem submit request")
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Query parameter "language_id" is required'},
@@ -1846,7 +1849,7 @@ def problem_submit(request, problem_id):
         # Check if the result is already cached
         cached_data = cache.get(cache_key)
         if cached_data:
-            logger.info(f"Returning cached result for user ID: {user_id}, problem ID: {problem_id}, language ID: {language_id}")
+            logger.info("Returning cached result for user ID: %s, problem ID: %s, language ID: %s", user_id, problem_id, language_id)
             return Response({
                 'message': 'Problem Code Submit Successful Complete - Duplicate Submission',
                 'data': cached_data  # Cached submission result
@@ -1855,9 +1858,9 @@ def problem_submit(request, problem_id):
         try:
             language = Language.objects.get(id=language_id)
             language_type = language.language
-            logger.debug(f"Language ID {language_id} found, language: {language_type}")
+            logger.debug("Language ID %s found, language: %s", language_id, language_type)
         except Language.DoesNotExist:
-            logger.warning(f"Language with ID {language_id} not found")
+            logger.warning("Language with ID %s not found", language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Language type not found'},
@@ -1867,9 +1870,9 @@ def problem_submit(request, problem_id):
         # Obtain the problem title to create the testcase directory name
         try:
             problem = Problem.objects.get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found")
+            logger.debug("Problem with ID %s found", problem_id)
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found")
+            logger.warning("Problem with ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Requested problem does not exist in DB'},
@@ -1878,9 +1881,9 @@ def problem_submit(request, problem_id):
             
         try:
             max_constraint = CodeJudgeMaxConstraint.objects.get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Max Constraint with Problem ID {problem_id} and Language ID {language_id} found")
+            logger.debug("Max Constraint with Problem ID %s and Language ID %s found", problem_id, language_id)
         except CodeJudgeMaxConstraint.DoesNotExist:
-            logger.warning(f"Maximum Constraints for problem ID {problem_id} or language ID {language_id} not found")
+            logger.warning("Maximum Constraints for problem ID %s or language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Maximum Constraints for requested problem and language does not exist in DB'},
@@ -1892,9 +1895,9 @@ def problem_submit(request, problem_id):
         # Retrieve the main code for the problem and language
         try:
             main_code = InitCode.objects.values_list('run_code', flat=True).get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Main code retrieved for problem ID {problem_id} and language ID {language_id}")
+            logger.debug("Main code retrieved for problem ID %s and language ID %s", problem_id, language_id)
         except InitCode.DoesNotExist:
-            logger.warning(f"Main code for problem ID {problem_id} and language ID {language_id} not found")
+            logger.warning("Main code for problem ID %s and language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': '`Main` code for the problem and language is not found'},
@@ -1904,20 +1907,21 @@ def problem_submit(request, problem_id):
         """
         Code Judgement Execution
         """
-        logger.info(f"Starting code judgement execution for problem ID {problem_id}")
-        judge_result, compile_error_msg = do_judge(
+        logger.info("Starting code judgement execution for problem ID %s", problem_id)
+        judge_result, compile_error_msg, judge_stats = do_judge(
             language_type,
             main_code,
             user_code,
             testcase_dir_name,
             max_constraint.max_cpu_time,
             max_constraint.max_real_time,
-            max_constraint.max_memory
+            max_constraint.max_memory,
+            stop_on_failure=JUDGE_STOP_ON_FAILURE
         )
         
         if not judge_result:  # Something wrong..
             if compile_error_msg:
-                logger.warning(f"Compile error during judgement execution: {compile_error_msg}")
+                logger.warning("Compile error during judgement execution: %s", compile_error_msg)
                 return Response({
                     'run_result': 'COMPILE_ERROR',
                     'err_msg': compile_error_msg
@@ -1936,14 +1940,15 @@ def problem_submit(request, problem_id):
             response_data = create_submission_and_response(
                 judge_result=judge_result, 
                 compile_error_msg=compile_error_msg, 
+                judge_stats=judge_stats,
                 user=user, 
                 problem=problem, 
                 language=language, 
                 user_code=user_code
             )
-            logger.info(f"Submission and response creation successful for problem ID {problem_id}")
+            logger.info("Submission and response creation successful for problem ID %s", problem_id)
         except ValueError as e:
-            logger.warning(f"Submission creation failed: {str(e)}")
+            logger.warning("Submission creation failed: %s", e)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': str(e)},
@@ -1960,7 +1965,7 @@ def problem_submit(request, problem_id):
         )
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem submit for problem ID {problem_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem submit for problem ID %s: %s", problem_id, e, exc_info=True)
         return Response({
             'error': 'Problem Submit POST Fail',
             'detail': str(e)
@@ -1979,29 +1984,34 @@ def problem_submit_for_task(request, problem_id):
     Preprocessing for Code Judgement Execution
     """
     try:
-        logger.info(f"Problem submit request initiated for problem ID: {problem_id}")
+        logger.info("Problem submit request initiated for problem ID: %s", problem_id)
 
         # Check for Authorization header
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
-            logger.warning(f"Invalid access token or No access token provided in problem submit request")
+            logger.warning("Invalid access token or No access token provided in problem submit request")
             return Response({
                 "error": "Problem Submit POST Fail",
                 "detail": "Invalid access token or No access token provided"
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        access_token = auth_header.split(' ')[1]
-        social_token = SocialToken.objects.get(token=access_token)
+        social_token = get_request_token(request)
+        if social_token is None:
+            logger.warning("SocialToken does not exist for the provided access token")
+            return Response({
+                "error": "Problem Submit POST Fail",
+                "detail": "Invalid or expired access token"
+            }, status=status.HTTP_401_UNAUTHORIZED)
         user_id = social_token.account_id
 
         # Verify that the user exists
         user = get_object_or_404(User, pk=user_id)
-        logger.debug(f"User ID {user_id} verified")
+        logger.debug("User ID %s verified", user_id)
 
         # Validate the incoming request data
         serializer = ProblemSubmitSerializer(data=request.data)
         if not serializer.is_valid():
-            logger.warning(f"Validation failed for problem submit request: {serializer.errors}")
+            logger.warning("Validation failed for problem submit request: %s", serializer.errors)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': serializer.errors
@@ -2009,12 +2019,12 @@ def problem_submit_for_task(request, problem_id):
 
         # Extract validated data
         user_code = serializer.validated_data.get('solution')
-        logger.debug(f"User solution code extracted")
+        logger.debug("User solution code extracted")
 
         # Obtain selected language from query parameters
         language_id = request.query_params.get('language_id')
         if not language_id:
-            logger.warning(f"Query parameter 'language_id' missing in problem submit request")
+            logger.warning("Query parameter 'language_id' missing in problem submit request")
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Query parameter "language_id" is required'
@@ -2023,9 +2033,9 @@ def problem_submit_for_task(request, problem_id):
         try:
             language = Language.objects.get(id=language_id)
             language_type = language.language
-            logger.debug(f"Language ID {language_id} found, language: {language_type}")
+            logger.debug("Language ID %s found, language: %s", language_id, language_type)
         except Language.DoesNotExist:
-            logger.warning(f"Language with ID {language_id} not found")
+            logger.warning("Language with ID %s not found", language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Language type not found'
@@ -2034,9 +2044,9 @@ def problem_submit_for_task(request, problem_id):
         # Obtain the problem title to create the testcase directory name
         try:
             problem = Problem.objects.get(pk=problem_id)
-            logger.debug(f"Problem with ID {problem_id} found")
+            logger.debug("Problem with ID %s found", problem_id)
         except Problem.DoesNotExist:
-            logger.warning(f"Problem with ID {problem_id} not found")
+            logger.warning("Problem with ID %s not found", problem_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Requested problem does not exist in DB'
@@ -2044,9 +2054,9 @@ def problem_submit_for_task(request, problem_id):
 
         try:
             max_constraint = CodeJudgeMaxConstraint.objects.get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Max Constraint with Problem ID {problem_id} and Language ID {language_id} found")
+            logger.debug("Max Constraint with Problem ID %s and Language ID %s found", problem_id, language_id)
         except CodeJudgeMaxConstraint.DoesNotExist:
-            logger.warning(f"Maximum Constraints for problem ID {problem_id} or language ID {language_id} not found")
+            logger.warning("Maximum Constraints for problem ID %s or language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': 'Maximum Constraints for requested problem and language does not exist in DB'
@@ -2057,9 +2067,9 @@ def problem_submit_for_task(request, problem_id):
         # Retrieve the main code for the problem and language
         try:
             main_code = InitCode.objects.values_list('run_code', flat=True).get(problem_id=problem_id, language_id=language_id)
-            logger.debug(f"Main code retrieved for problem ID {problem_id} and language ID {language_id}")
+            logger.debug("Main code retrieved for problem ID %s and language ID %s", problem_id, language_id)
         except InitCode.DoesNotExist:
-            logger.warning(f"Main code for problem ID {problem_id} and language ID {language_id} not found")
+            logger.warning("Main code for problem ID %s and language ID %s not found", problem_id, language_id)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': '`Main` code for the problem and language is not found'
@@ -2068,91 +2078,48 @@ def problem_submit_for_task(request, problem_id):
         """
         Code Judgement Execution
         """
-        # Call do_judge function asynchronously
+        # Judge, then persist the submission in the worker (do_judge_for_task -> create_submission_and_response_for_task)
+        # The judge task id is generated up front : it is the id the client polls / subscribes to
         try:
-            logger.info(f"Starting code judgement execution for problem ID {problem_id}")
-            judge_task = do_judge_for_task.delay(
-                language_type,
-                main_code,
-                user_code,
-                testcase_dir_name,
-                max_constraint.max_cpu_time,
-                max_constraint.max_real_time,
-                max_constraint.max_memory
-            )
+            logger.info("Starting code judgement execution for problem ID %s", problem_id)
+            judge_task_id = uuid()
+            chain(
+                do_judge_for_task.s(
+                    language_type,
+                    main_code,
+                    user_code,
+                    testcase_dir_name,
+                    max_constraint.max_cpu_time,
+                    max_constraint.max_real_time,
+                    max_constraint.max_memory,
+                    stop_on_failure=JUDGE_STOP_ON_FAILURE,
+                    publish_summary=False,  # Sent by create_submission_and_response_for_task once the submission is stored
+                ).set(task_id=judge_task_id),
+                create_submission_and_response_for_task.s(
+                    user_id=user.id,
+                    problem_id=problem.id,
+                    language_id=language.id,
+                    user_code=user_code,
+                    task_id=judge_task_id
+                ),
+            ).apply_async()
         except Exception as e:
-            logger.error(f"Failed to start do_judge_for_task: {str(e)}", exc_info=True)
+            logger.error("Failed to start do_judge_for_task: %s", e, exc_info=True)
             return Response({
                 'error': 'Problem Submit POST Fail',
                 'detail': f'Failed to initiate the judgment task: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-        # Check if the task completed successfully before calling .get()
-        if not judge_task.ready():
-            logger.debug(f"Submit Judgment task for problem ID {problem_id} is still in progress")
-            return Response({
-                'message': 'Submit Judgment task in progress',
-                'submit_type': 'submit',
-                'task_id': judge_task.id,
-                'data': {
-                    'user_id': user.id,
-                    'problem_id': problem.id,
-                    'language_id': language_id,
-                    'user_code': user_code
-                },
-                'status': 'PENDING'
-            }, status=status.HTTP_202_ACCEPTED)
-
-        # Fetch the result of the do_judge task (this may block if not ready)
-        try:
-            judge_result, compile_error_msg = judge_task.get(timeout=10)  # Timeout for getting the result
-        except Exception as e:
-            logger.error(f"Failed to get judgment task result: {str(e)}", exc_info=True)
-            return Response({
-                'error': 'Problem Submit POST Fail',
-                'detail': f'Failed to get judgment task result : {str(e)}'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        # If there was a compile error
-        if not judge_result:
-            if compile_error_msg:
-                logger.warning(f"Compile error during judgement execution: {compile_error_msg}")
-                return Response({
-                    'run_result': 'COMPILE_ERROR',
-                    'err_msg': compile_error_msg
-                }, status=status.HTTP_200_OK)
-            logger.error("COMPILE_ERROR - Undefined Behavior: No compiler error message despite the error occurrence")
-            return Response({
-                'error': 'Problem Submit POST Fail',
-                'detail': 'COMPILE_ERROR - Undefined Behavior: No compiler error message despite the error occurrence'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-        try:
-            response_data = create_submission_and_response(
-                judge_result=judge_result, 
-                compile_error_msg=compile_error_msg, 
-                user=user, 
-                problem=problem, 
-                language=language, 
-                user_code=user_code
-            )
-            logger.info(f"Submission and response creation successful for problem ID {problem_id}")
-        except ValueError as e:
-            logger.warning(f"Submission creation failed: {str(e)}")
-            return Response({
-                'error': 'Problem Submit POST Fail',
-                'detail': str(e)},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        logger.info(f"Code Submit Successful for problem ID {problem_id}")
+        logger.debug("Submit Judgment task %s for problem ID %s dispatched", judge_task_id, problem_id)
         return Response({
-            'message': 'Problem Code Submit Successful Complete',
-            'data': submission_response_data
-        }, status=status.HTTP_200_OK)
+            'message': 'Submit Judgment task in progress',
+            'submit_type': 'submit',
+            'task_id': judge_task_id,
+            'status': 'PENDING'
+        }, status=status.HTTP_202_ACCEPTED)
 
     except Exception as e:
-        logger.error(f"Unexpected error during problem submit for problem ID {problem_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during problem submit for problem ID %s: %s", problem_id, e, exc_info=True)
         return Response({
             'error': 'Problem Submit POST Fail',
             'detail': str(e)
@@ -2180,14 +2147,54 @@ def code_judge_task_status(request, task_id):
                 'detail': 'Submit type is required'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        logger.info(f"Fetching task status for task ID: {task_id}, submit_type: {submit_type}")
+        logger.info("Fetching task status for task ID: %s, submit_type: %s", task_id, submit_type)
+
+        # Submit : the submission is persisted by the chained task, which stores an immutable result record
+        if submit_type == 'submit':
+            record = cache.get(generate_judge_result_cache_key(task_id))
+            if record is None:
+                task_result = AsyncResult(task_id)
+                if task_result.state == 'FAILURE':
+                    logger.error("Task ID %s failed with error: %s", task_id, task_result.info)
+                    record = {'status': 'FAILURE', 'detail': str(task_result.info)}
+                elif task_result.state == 'SUCCESS':
+                    # Judged : either still being persisted, or the record expired from the cache
+                    submission = Submission.objects.filter(task_id=task_id).first()
+                    if submission is not None:
+                        record = {'status': 'SUCCESS', 'data': stored_submission_response_data(submission)}
+
+            if record is None:
+                logger.debug("Task ID %s is still pending", task_id)
+                return Response({
+                    'message': f'Problem {submit_type.capitalize()} task in progress or Invalid task id',
+                    'task_id': task_id,
+                    'status': 'PENDING'
+                }, status=status.HTTP_202_ACCEPTED)
+
+            if record['status'] == 'FAILURE':
+                return Response({
+                    'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
+                    'task_id': task_id,
+                    'status': 'FAILURE',
+                    'detail': record['detail']
+                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            if record['data'].get('run_result') == 'COMPILE_ERROR':
+                logger.warning("Compile error during judgement execution for task ID %s", task_id)
+                return Response(record['data'], status=status.HTTP_200_OK)
+
+            logger.info("Submission result served for task ID %s", task_id)
+            return Response({
+                'message': 'Problem Code Submit Successful Complete',
+                'data': record['data']
+            }, status=status.HTTP_200_OK)
 
         # Fetch the task result using the Celery task ID
         task_result = AsyncResult(task_id)
 
         # Check if the task is still pending
         if task_result.state == 'PENDING':
-            logger.debug(f"Task ID {task_id} is still pending")
+            logger.debug("Task ID %s is still pending", task_id)
             return Response({
                 'message': f'Problem {submit_type.capitalize()} task in progress or Invalid task id',
                 'task_id': task_id,
@@ -2196,7 +2203,7 @@ def code_judge_task_status(request, task_id):
 
         # Check if the task failed
         elif task_result.state == 'FAILURE':
-            logger.error(f"Task ID {task_id} failed with error: {str(task_result.info)}")
+            logger.error("Task ID %s failed with error: %s", task_id, task_result.info)
             return Response({
                 'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
                 'task_id': task_id,
@@ -2207,10 +2214,10 @@ def code_judge_task_status(request, task_id):
         # If the task is successful, return the result
         elif task_result.state == 'SUCCESS':
             try:
-                judge_result, compile_error_msg = task_result.result
-                logger.debug(f"Task ID {task_id} completed successfully")
+                judge_result, compile_error_msg, judge_stats = task_result.result
+                logger.debug("Task ID %s completed successfully", task_id)
             except ValueError as e:
-                logger.error(f"Error retrieving task result for task ID {task_id}: {str(e)}")
+                logger.error("Error retrieving task result for task ID %s: %s", task_id, e)
                 return Response({
                     'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
                     'detail': f"Error retrieving task result: {str(e)}"
@@ -2218,17 +2225,17 @@ def code_judge_task_status(request, task_id):
 
             # Handle the response based on the submit_type
             if submit_type == 'run':
-                logger.info(f"Handling 'run' type for task ID {task_id}")
+                logger.info("Handling 'run' type for task ID %s", task_id)
                 # If there was a compile error
                 if not judge_result:  # Something went wrong
                     if compile_error_msg:
-                        logger.warning(f"Compile error during judgment execution for task ID {task_id}: {compile_error_msg}")
+                        logger.warning("Compile error during judgment execution for task ID %s: %s", task_id, compile_error_msg)
                         return Response({
                             'run_result': 'COMPILE_ERROR',
                             'err_msg': compile_error_msg
                         }, status=status.HTTP_200_OK)
 
-                    logger.error(f"COMPILE_ERROR with no message for task ID {task_id}")
+                    logger.error("COMPILE_ERROR with no message for task ID %s", task_id)
                     return Response({
                         'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
                         'detail': 'COMPILE_ERROR - Undefined Behavior: No compiler error message despite the error occurrence'
@@ -2248,7 +2255,7 @@ def code_judge_task_status(request, task_id):
                     testcase_result = SUBMISSION_RESULT.get(result['result'], "")
                     testcase_num = result['testcase']
                     if not testcase_result:
-                        logger.error(f"Unexpected run result for testcase number {testcase_num}: {testcase_result}")
+                        logger.error("Unexpected run result for testcase number %s: %s", testcase_num, testcase_result)
                         return Response({
                             'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
                             'detail': f'Unexpected Run result - {testcase_num} testcase result : {testcase_result}'},
@@ -2273,93 +2280,16 @@ def code_judge_task_status(request, task_id):
                         result_info['user_out'] = result['output']
                     response_data[testcase_num] = result_info
 
-                logger.info(f"Problem run successful for task ID {task_id}")
+                logger.info("Problem run successful for task ID %s", task_id)
                 return Response({
                     'message': 'Problem Code Run Successful Complete',
-                    'data': response_data
+                    'data': response_data,
+                    'judge_stats': judge_stats
                 }, status=status.HTTP_200_OK)
 
-            elif submit_type == 'submit':
-                logger.info(f"Handling 'submit' type for task ID {task_id}")
-                data = request.data.get('data', None)
-
-                if not judge_result:  # Something wrong
-                    if compile_error_msg:
-                        logger.warning(f"Compile error during judgement execution for task ID {task_id}: {compile_error_msg}")
-                        return Response({
-                            'run_result': 'COMPILE_ERROR',
-                            'err_msg': compile_error_msg
-                        }, status=status.HTTP_200_OK)
-
-                    logger.error(f"COMPILE_ERROR - Undefined Behavior: No message for task ID {task_id}")
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': 'COMPILE_ERROR - Undefined Behavior: No compiler error message despite the error occurrence'
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-                if data is None:
-                    logger.error(f"Data required for submission response is missing for task ID {task_id}")
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': 'Data required for submission response does not exist'
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
-                try:
-                    user_id = data.get('user_id', None)
-                    problem_id = data.get('problem_id', None)
-                    language_id = data.get('language_id', None)
-                    user_code = data.get('user_code', None)
-
-                    user = User.objects.get(id=user_id)
-                    problem = Problem.objects.get(id=problem_id)
-                    language = Language.objects.get(id=language_id)
-
-                    response_data = create_submission_and_response(
-                        judge_result=judge_result,
-                        compile_error_msg=compile_error_msg,
-                        user=user,
-                        problem=problem,
-                        language=language,
-                        user_code=user_code
-                    )
-                    logger.info(f"Submission and response creation successful for problem ID {problem_id}")
-
-                    return Response({
-                        'message': 'Problem Code Submit Successful Complete',
-                        'data': response_data  # Your custom result
-                    }, status=status.HTTP_200_OK)
-
-                except User.DoesNotExist:
-                    logger.error(f"User with ID {user_id} not found")
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': f"User with ID {user_id} not found"
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                except Problem.DoesNotExist:
-                    logger.error(f"Problem with ID {problem_id} not found")
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': f"Problem with ID {problem_id} not found"
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                except Language.DoesNotExist:
-                    logger.error(f"Language with ID {language_id} not found")
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': f"Language with ID {language_id} not found"
-                    }, status=status.HTTP_404_NOT_FOUND)
-
-                except Exception as e:
-                    logger.error(f"Unexpected error for task ID {task_id}: {str(e)}", exc_info=True)
-                    return Response({
-                        'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
-                        'detail': str(e)
-                    }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
     # Handle any other exceptions
     except Exception as e:
-        logger.error(f"Unexpected error during task status handling for task ID {task_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during task status handling for task ID %s: %s", task_id, e, exc_info=True)
         return Response({
             'error': f'Judge Task Status POST Fail - {submit_type.capitalize()}',
             'detail': f'{submit_type.capitalize()} Task Status Handling Error : {str(e)}',
@@ -2369,4 +2299,35 @@ def code_judge_task_status(request, task_id):
         'message': f'{submit_type.capitalize()} task is in state {task_result.state}',
         'task_id': task_id,
         'status': task_result.state
-    }, status=status.HTTP_200_OK)
\ No newline at end of file
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def code_judge_task_events(request, task_id):
+    """
+    Server-Sent Events push channel of a judge task (replaces polling code_judge_task_status).
+    One 'testcase' event is sent per verdict as soon as it is known, then a final 'summary' event.
+    """
+    # Resume point of a reconnecting client : anything but a non-negative event id starts from the beginning
+    try:
+        last_seq = max(0, int(request.headers.get('Last-Event-ID', 0)))
+    except ValueError:
+        last_seq = 0
+
+    # Every stream pins a worker thread : past the per-process cap, the client polls code_judge_task_status instead
+    events = JudgeEventStream.open(task_id, last_seq)
+    if events is None:
+        logger.warning("Judge event stream refused for task ID: %s (too many open streams)", task_id)
+        response = Response({
+            'error': 'Judge Task Events GET Fail',
+            'detail': 'Too many open event streams, poll the task status instead.'
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response['Retry-After'] = '5'
+        return response
+
+    logger.info("Judge event stream opened for task ID: %s (Last-Event-ID: %s)", task_id, last_seq)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Let nginx flush every event instead of buffering the stream
+    return response
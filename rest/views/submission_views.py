@@ -1,18 +1,26 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError, NotFound
 from ..models import Problem, Language, InitCode, Submission, SubmissionDetail
 from ..serializers import *
+from ..pagination import SubmissionCursorPagination
 import logging
 
 logger = logging.getLogger('rest')
 
+SUBMISSION_FILTER_PARAMS = ('user_id', 'problem_id', 'final_result')
+
 # submission-crud
 class SubmissionBasicView(APIView):
     def get(self, request):
         try:
             logger.info("Submission list retrieval request initiated")
 
+            # Paginated / filtered / sorted list (opt-in) : served page by page from the -submitted_at index
+            if SubmissionCursorPagination.is_requested(request, SUBMISSION_FILTER_PARAMS):
+                return self.get_page(request)
+
             # Retrieve all submissions, ordered by the submitted_at timestamp
             submissions = Submission.objects.all().order_by('-submitted_at')
             submission_serializer = SubmissionSerializer(submissions, many=True, context={'exclude_submission_detail': True})
@@ -30,6 +38,47 @@ class SubmissionBasicView(APIView):
                 'detail': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_page(self, request):
+        submissions = Submission.objects.all()
+
+        # Filtering : ?user_id=1 & ?problem_id=2 & ?final_result=SOLVED
+        for param in ('user_id', 'problem_id'):
+            value = request.query_params.get(param)
+            if value:
+                if not value.isdigit():
+                    logger.warning(f"Invalid {param} filter in submission list request: {value}")
+                    return Response({
+                        'error': 'Submission List GET Fail',
+                        'detail': f'Invalid {param}: it must be an integer.'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                submissions = submissions.filter(**{param: int(value)})
+
+        final_result = request.query_params.get('final_result')
+        if final_result:
+            submissions = submissions.filter(final_result=final_result)
+
+        # Keyset pagination : ?cursor=...&page_size=...&sort=recent|oldest
+        paginator = SubmissionCursorPagination()
+        try:
+            page = paginator.paginate_queryset(submissions, request, view=self)
+        except (ValidationError, NotFound) as e:
+            logger.warning(f"Invalid pagination parameters in submission list request: {e.detail}")
+            return Response({
+                'error': 'Submission List GET Fail',
+                'detail': e.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        submission_serializer = SubmissionSerializer(page, many=True, context={'exclude_submission_detail': True})
+        logger.info(f"Submission list page retrieved with {len(submission_serializer.data)} submission(s)")
+
+        return Response({
+            'message': f'Submission List Retrieval Success : {len(submission_serializer.data)} submission(s) found',
+            'data': submission_serializer.data,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link()},
+            status=status.HTTP_200_OK
+        )
+
     def post(self, request):
         try:
             logger.info("New submission creation request initiated")
@@ -132,7 +181,7 @@ class SubmissionDetailView(APIView):
                     'detail': 'Submission not found'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-            submission_detail = SubmissionDetail.objects.get(submission_id=submission_id)
+            submission_detail = SubmissionDetail.objects.prefetch_related('testcase_results').get(submission_id=submission_id)
             if submission_detail is None:
                 logger.warning(f"SubmissionDetail not found for submission ID {submission_id}")
                 return Response({
@@ -11,6 +11,8 @@ from django.http import Http404
 from ..models import *
 from ..serializers import *
 from allauth.socialaccount.models import SocialAccount, SocialToken
+from ..authentications import get_request_token
+from ..utils import redact_access_token
 import logging 
 
 # Get the logger instance for the 'rest' application
@@ -42,13 +44,11 @@ class UserProfileView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
             access_token = auth_header.split(' ')[1]
-            logger.debug(f"Access token extracted: {access_token}")
+            logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
-            try:
-                social_token = SocialToken.objects.get(token=access_token)
-                logger.debug(f"SocialToken found for access token: {access_token}")
-            except SocialToken.DoesNotExist:
-                logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
+            social_token = get_request_token(request)
+            if social_token is None:
+                logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
                 return Response({
                     "error": "User Profile GET Fail",
                     "detail": "Invalid or expired access token"
@@ -97,13 +97,11 @@ class UserProfileView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
             access_token = auth_header.split(' ')[1]
-            logger.debug(f"Access token extracted: {access_token}")
+            logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
-            try:
-                social_token = SocialToken.objects.get(token=access_token)
-                logger.debug(f"SocialToken found for access token: {access_token}")
-            except SocialToken.DoesNotExist:
-                logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
+            social_token = get_request_token(request)
+            if social_token is None:
+                logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
                 return Response({
                     "error": "User Profile Update Fail",
                     "detail": "Invalid or expired access token"
@@ -156,13 +154,11 @@ class UserProfileView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
             access_token = auth_header.split(' ')[1]
-            logger.debug(f"Access token extracted: {access_token}")
+            logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
-            try:
-                social_token = SocialToken.objects.get(token=access_token)
-                logger.debug(f"SocialToken found for access token: {access_token}")
-            except SocialToken.DoesNotExist:
-                logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
+            social_token = get_request_token(request)
+            if social_token is None:
+                logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
                 return Response({
                     "error": "User Profile Partial Update Fail",
                     "detail": "Invalid or expired access token"
@@ -216,13 +212,11 @@ class UserSubmissionView(APIView):
                 }, status=status.HTTP_401_UNAUTHORIZED)
 
             access_token = auth_header.split(' ')[1]
-            logger.debug(f"Access token extracted: {access_token}")
+            logger.debug("Access token extracted: %s", redact_access_token(access_token))
 
-            try:
-                social_token = SocialToken.objects.get(token=access_token)
-                logger.debug(f"SocialToken found for access token: {access_token}")
-            except SocialToken.DoesNotExist:
-                logger.warning(f"SocialToken does not exist for the provided access token: {access_token}")
+            social_token = get_request_token(request)
+            if social_token is None:
+                logger.warning("SocialToken does not exist for the provided access token: %s", redact_access_token(access_token))
                 return Response({
                     "error": "User Submission GET Fail",
                     "detail": "Invalid or expired access token"
@@ -1,8 +1,17 @@
 import os
+import uuid
+import shutil
 import hashlib
 import json
 import zipfile
 
+CHECKER_TYPES = ("exact", "token", "float", "special")
+# Checker programs accepted in a testcase zip for the special judge, with the command running them
+CHECKER_PROGRAMS = {
+    "checker.py": "/usr/bin/python3 {checker_path} {input_path} {user_output_path} {answer_path}",
+    "checker": "{checker_path} {input_path} {user_output_path} {answer_path}",
+}
+
 def extract_zip(zip_path, extract_to):
     """Extract a zip file to the specified directory and validate file pairs."""
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
@@ -35,6 +44,12 @@ def extract_zip(zip_path, extract_to):
         for file_name in valid_files:
             zip_ref.extract(file_name, extract_to)
 
+        # Special judge program, if any
+        for file_name in CHECKER_PROGRAMS:
+            if file_name in all_files:
+                zip_ref.extract(file_name, extract_to)
+                os.chmod(os.path.join(extract_to, file_name), 0o755)
+
 def calculate_md5(file_path, strip=False):
     """Calculate the MD5 checksum of a file, with an option to strip whitespace."""
     with open(file_path, 'rb') as f:
@@ -100,11 +115,100 @@ def collect_file_info(folder_path):
         "testcases": files_info
     }
 
+def collect_checker_info(folder_path, checker_type="exact", abs_error=None, rel_error=None):
+    """Builds the checker entry of info.json. Raises ValueError for an unusable checker setup."""
+    if checker_type not in CHECKER_TYPES:
+        raise ValueError(f"Invalid checker: it must be one of {', '.join(CHECKER_TYPES)}.")
+    checker = {"type": checker_type}
+
+    if checker_type == "float":
+        try:
+            checker["abs_error"] = float(abs_error) if abs_error is not None else 1e-6
+            checker["rel_error"] = float(rel_error) if rel_error is not None else 1e-6
+        except ValueError:
+            raise ValueError("Invalid checker: abs_error and rel_error must be numbers.")
+    elif checker_type == "special":
+        for checker_name, command in CHECKER_PROGRAMS.items():
+            if os.path.exists(os.path.join(folder_path, checker_name)):
+                checker["checker_name"] = checker_name
+                checker["command"] = command
+                break
+        else:
+            raise ValueError(f"Invalid checker: the special judge requires one of {', '.join(CHECKER_PROGRAMS)} in the zip file.")
+
+    return checker
+
 def save_to_json(data, output_file):
     """Save the collected file information to a JSON file."""
     with open(output_file, 'w') as json_file:
         json.dump(data, json_file, indent=4)
 
+def install_testcases(zip_file, extract_path, checker_type="exact", abs_error=None, rel_error=None, replace=False):
+    """
+    Builds a new version of a testcase directory (files + info.json) from an uploaded zip next to
+    `extract_path`, and only swaps it in once everything is valid : a bad zip or checker setup leaves the
+    current testcases untouched. With `replace`, the files already in `extract_path` are dropped,
+    otherwise the zip is added on top of them. Returns the info.json data.
+    """
+    version_path = extract_path.parent / f".{extract_path.name}.v-{uuid.uuid4().hex}"
+    try:
+        if extract_path.exists() and not replace:
+            shutil.copytree(extract_path, version_path)
+        else:
+            version_path.mkdir(parents=True)
+
+        zip_file_path = version_path / zip_file.name
+        with open(zip_file_path, 'wb') as f:
+            for chunk in zip_file.chunks():
+                f.write(chunk)
+        extract_zip(zip_file_path, version_path)
+        zip_file_path.unlink()
+
+        data = collect_file_info(version_path)
+        data['checker'] = collect_checker_info(version_path, checker_type, abs_error, rel_error)
+        save_to_json(data, version_path / 'info.json')
+    except BaseException:
+        shutil.rmtree(version_path, ignore_errors=True)
+        raise
+
+    swap_testcases(extract_path, version_path)
+    return data
+
+def swap_testcases(extract_path, version_path):
+    """
+    `extract_path` is a symlink to the current version directory. A new link renamed over it (os.replace)
+    switches every reader to `version_path` at once : there is no moment without a testcase directory.
+    The replaced version stays on disk for the judges still reading it, until the next install.
+    """
+    link_path = extract_path.parent / f".{extract_path.name}.link-{uuid.uuid4().hex}"
+    os.symlink(version_path.name, link_path)
+    if extract_path.exists() and not extract_path.is_symlink():
+        # Plain directory of an older install : moved under a version name, the only non-atomic swap
+        os.rename(extract_path, extract_path.parent / f".{extract_path.name}.v-{uuid.uuid4().hex}")
+    os.replace(link_path, extract_path)
+    remove_unused_versions(extract_path, keep=1)
+
+def remove_unused_versions(extract_path, keep=0):
+    """ Removes the version directories of `extract_path` but its current one and the `keep` latest replaced ones """
+    current = os.path.basename(os.readlink(extract_path)) if extract_path.is_symlink() else None
+    prefix = f".{extract_path.name}.v-"
+    versions = sorted(
+        (entry for entry in os.scandir(extract_path.parent)
+         if entry.name.startswith(prefix) and entry.name != current and entry.is_dir(follow_symlinks=False)),
+        key=lambda entry: entry.stat(follow_symlinks=False).st_mtime_ns,
+        reverse=True,
+    )
+    for entry in versions[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+def remove_testcases(extract_path):
+    """ Removes a testcase directory : the link (or plain directory of an older install) and every version of it """
+    if extract_path.is_symlink():
+        extract_path.unlink()
+    else:
+        shutil.rmtree(extract_path)
+    remove_unused_versions(extract_path)
+
 """
 # Example usage
 zip_path = 'test.zip'  # Replace with your zip file path